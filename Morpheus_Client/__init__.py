@@ -8,11 +8,11 @@ from typing import Any
 __all__ = ["start_server", "Client", "app", "orchestrator", "tts_engine", "inference"]
 
 
-def start_server(host: str = "0.0.0.0", port: int = 5005) -> None:
+def start_server(host: str = "0.0.0.0", port: int = 5005, workers: int | None = None) -> None:
     """Launch the unified API and admin server via uvicorn."""
     from .server import start_server as _start
 
-    _start(host=host, port=port)
+    _start(host=host, port=port, workers=workers)
 
 
 def __getattr__(name: str) -> Any:  # pragma: no cover - simple loader
@@ -0,0 +1,351 @@
+"""Offline batch synthesis jobs.
+
+A batch is a JSONL manifest with one utterance per line::
+
+    {"id": "intro", "text": "Hello there.", "voice": "leo", "params": {"pace": "slow"}}
+
+:class:`BatchManager` stores each submitted manifest in its own job
+directory and synthesizes it in the background.  Every utterance is split
+into sentences and the sentences of all pending utterances are spread over
+``concurrency`` workers, so a job keeps all synthesis capacity busy even
+when it holds a single long text.  Finished utterances are stitched and
+written as complete WAV files (with real RIFF sizes) named after their id.
+
+A job directory records everything needed to continue: after a restart
+:meth:`BatchManager.resume` picks up jobs that did not complete (including
+``partial`` and ``failed`` ones) and only synthesizes utterances without a
+WAV file.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import tempfile
+import time
+import uuid
+import wave
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from text_sources.segmenter import split_sentences
+
+from .cache.phrases import is_sentence_start
+from .orchestrator.adapter import AudioChunk
+from .orchestrator.stitcher import stitch_chunks
+
+# Per-item params understood by the server; generation parameters are global
+ITEM_PARAMS = frozenset({"adapter", "timbre", "prosody", "accent", "emotion_priors", "pace"})
+
+_ITEM_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9._-]{0,127}")
+
+
+class ManifestError(ValueError):
+    """Raised for malformed batch manifests."""
+
+
+@dataclass
+class BatchItem:
+    id: str
+    text: str
+    voice: str | None = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def parse_manifest(data: str) -> List[BatchItem]:
+    """Parse and validate a JSONL manifest."""
+
+    items: List[BatchItem] = []
+    seen = set()
+    for number, line in enumerate(data.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as exc:
+            raise ManifestError(f"line {number}: invalid JSON ({exc})") from None
+        if not isinstance(raw, dict):
+            raise ManifestError(f"line {number}: expected an object")
+        item_id, text = str(raw.get("id", "")), raw.get("text")
+        if not _ITEM_ID.fullmatch(item_id):
+            raise ManifestError(f"line {number}: id must match {_ITEM_ID.pattern}")
+        if item_id in seen:
+            raise ManifestError(f"line {number}: duplicate id {item_id!r}")
+        if not isinstance(text, str) or not text.strip():
+            raise ManifestError(f"line {number}: missing text")
+        params = raw.get("params") or {}
+        if not isinstance(params, dict):
+            raise ManifestError(f"line {number}: params must be an object")
+        unknown = sorted(set(params) - ITEM_PARAMS)
+        if unknown:
+            raise ManifestError(f"line {number}: unsupported params {unknown}")
+        seen.add(item_id)
+        items.append(BatchItem(item_id, text, raw.get("voice") or None, params))
+    if not items:
+        raise ManifestError("manifest is empty")
+    return items
+
+
+def write_text(path: Path, text: str) -> None:
+    """Atomically replace ``path`` with ``text`` via a temporary file."""
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def write_wav(path: Path, pcm: bytes, sample_rate: int) -> None:
+    """Atomically write mono 16-bit ``pcm`` as a finalized WAV file."""
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle, wave.open(handle, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+class BatchJob:
+    """State of one batch job, backed by its directory."""
+
+    def __init__(self, job_id: str, directory: Path, items: List[BatchItem], created: float) -> None:
+        self.id = job_id
+        self.directory = directory
+        self.items = items
+        self.created = created
+        self.state = "queued"
+        self.errors: Dict[str, str] = {}
+        self.audio_seconds = 0.0
+        self._started: float | None = None
+        self._finished: float | None = None
+        self._chars_done = 0
+
+    def wav_path(self, item_id: str) -> Path:
+        return self.directory / f"{item_id}.wav"
+
+    @property
+    def done(self) -> List[str]:
+        return [item.id for item in self.items if self.wav_path(item.id).exists()]
+
+    def _save(self) -> None:
+        meta = {"id": self.id, "created": self.created, "state": self.state, "errors": self.errors}
+        write_text(self.directory / "job.json", json.dumps(meta))
+
+    def status(self) -> Dict[str, Any]:
+        """Progress, throughput (audio seconds per second) and ETA."""
+
+        done = set(self.done)
+        total = len(self.items)
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self._finished or time.monotonic()) - self._started
+        remaining_chars = sum(
+            len(item.text) for item in self.items if item.id not in done and item.id not in self.errors
+        )
+        eta = None
+        if self.state not in ("queued", "running"):
+            eta = 0.0
+        elif self._chars_done and elapsed:
+            eta = remaining_chars / (self._chars_done / elapsed)
+        return {
+            "id": self.id,
+            "state": self.state,
+            "total": total,
+            "done": len(done),
+            "failed": len(self.errors),
+            "progress": len(done) / total,
+            "audio_seconds": self.audio_seconds,
+            "elapsed_seconds": elapsed,
+            "throughput": self.audio_seconds / elapsed if elapsed else 0.0,
+            "eta_seconds": eta,
+            "errors": dict(self.errors),
+        }
+
+
+class BatchManager:
+    """Create, run and resume batch jobs under ``directory``.
+
+    Parameters
+    ----------
+    directory:
+        Root for job directories (``manifest.jsonl``, ``job.json`` and one
+        WAV per finished item).
+    synthesize:
+        ``synthesize(text, item)`` returning an async iterator of PCM bytes
+        for one sentence of ``item``.
+    concurrency:
+        Number of sentences synthesized at once, or a callable returning it
+        when a job starts (e.g. the scheduler capacity).
+    sample_rate:
+        Sampling rate of the PCM and of the written WAV files.
+    crossfade_ms:
+        Crossfade applied where two sentences of an item meet.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        synthesize: Callable[[str, BatchItem], AsyncIterator[bytes]],
+        *,
+        concurrency: int | Callable[[], int] = 1,
+        sample_rate: int = 24000,
+        crossfade_ms: float = 15.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.synthesize = synthesize
+        self.concurrency = concurrency
+        self.sample_rate = sample_rate
+        self.crossfade_ms = crossfade_ms
+        self._jobs: Dict[str, BatchJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, items: List[BatchItem]) -> BatchJob:
+        """Persist a new job and start it in the background."""
+
+        job_id = uuid.uuid4().hex[:12]
+        directory = self.directory / job_id
+        directory.mkdir(parents=True)
+        manifest = "".join(json.dumps(asdict(item)) + "\n" for item in items)
+        write_text(directory / "manifest.jsonl", manifest)
+        job = BatchJob(job_id, directory, items, time.time())
+        job._save()
+        self._start(job)
+        return job
+
+    def _load(self, directory: Path) -> BatchJob | None:
+        try:
+            meta = json.loads((directory / "job.json").read_text())
+            items = parse_manifest((directory / "manifest.jsonl").read_text())
+        except (OSError, ValueError):
+            return None
+        job = BatchJob(meta["id"], directory, items, meta.get("created", 0.0))
+        job.state = meta.get("state", "queued")
+        job.errors = meta.get("errors", {})
+        return job
+
+    def get(self, job_id: str) -> BatchJob | None:
+        """Return a running or previously stored job."""
+
+        if job_id in self._jobs:
+            return self._jobs[job_id]
+        if not _ITEM_ID.fullmatch(job_id):
+            return None
+        job = self._load(self.directory / job_id)
+        if job is not None:
+            self._jobs[job_id] = job
+        return job
+
+    def resume(self) -> List[str]:
+        """Restart every stored job that had not completed.
+
+        Jobs that ended ``partial`` or ``failed`` are restarted too: their
+        failed items are synthesized again, finished WAV files are kept.
+        """
+
+        resumed = []
+        if not self.directory.is_dir():
+            return resumed
+        for directory in sorted(self.directory.iterdir()):
+            job = self.get(directory.name)
+            if job is not None and job.state != "completed" and job.id not in self._tasks:
+                job.errors.clear()
+                self._start(job)
+                resumed.append(job.id)
+        return resumed
+
+    def _start(self, job: BatchJob) -> None:
+        self._jobs[job.id] = job
+        task = asyncio.get_running_loop().create_task(self._run(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+
+    async def close(self) -> None:
+        """Stop running jobs; they continue on the next :meth:`resume`."""
+
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: BatchJob) -> None:
+        done = set(job.done)
+        units: asyncio.Queue = asyncio.Queue()
+        parts: Dict[str, List[bytes | None]] = {}
+        for item in job.items:
+            if item.id in done:
+                continue
+            sentences = split_sentences(item.text, min_chars=20) or [item.text]
+            parts[item.id] = [None] * len(sentences)
+            for index, sentence in enumerate(sentences):
+                units.put_nowait((item, index, sentence))
+
+        async def worker() -> None:
+            while not units.empty():
+                item, index, sentence = units.get_nowait()
+                if item.id in job.errors:
+                    continue
+                try:
+                    stream = self.synthesize(sentence, item)
+                    try:
+                        pcm = b"".join([chunk async for chunk in stream])
+                    finally:
+                        await stream.aclose()
+                    slots = parts[item.id]
+                    slots[index] = pcm
+                    job._chars_done += len(sentence)
+                    if all(part is not None for part in slots):
+                        await self._finish(job, item, slots)
+                except Exception as exc:  # one bad item must not stop the job
+                    job.errors[item.id] = f"{type(exc).__name__}: {exc}"
+                    parts.pop(item.id, None)
+
+        concurrency = self.concurrency() if callable(self.concurrency) else self.concurrency
+        job.state = "running"
+        job._started = time.monotonic()
+        job._save()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        if not job.errors:
+            job.state = "completed"
+        else:
+            job.state = "partial" if job.done else "failed"
+        job._finished = time.monotonic()
+        job._save()
+
+    async def _finish(self, job: BatchJob, item: BatchItem, sentences: List[bytes]) -> None:
+        async def chunks() -> AsyncIterator[AudioChunk]:
+            for index, pcm in enumerate(sentences):
+                duration_ms = len(pcm) / 2 / self.sample_rate * 1000.0
+                yield AudioChunk(pcm=pcm, duration_ms=duration_ms, markers={"sentence": index})
+
+        stitched = stitch_chunks(
+            chunks(), sample_rate=self.sample_rate, overlap_ms=self.crossfade_ms, seam=is_sentence_start
+        )
+        pcm = b"".join([chunk.pcm async for chunk in stitched])
+        await asyncio.to_thread(write_wav, job.wav_path(item.id), pcm, self.sample_rate)
+        job.audio_seconds += len(pcm) / 2 / self.sample_rate
+
+
+__all__ = [
+    "BatchItem",
+    "BatchJob",
+    "BatchManager",
+    "ITEM_PARAMS",
+    "ManifestError",
+    "parse_manifest",
+    "write_wav",
+]
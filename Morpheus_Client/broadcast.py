@@ -0,0 +1,181 @@
+"""Synthesize-once fan-out of live audio to many listeners.
+
+Text-source driven speech is synthesized once and published to a
+:class:`BroadcastHub`.  The hub keeps the most recent chunks in a ring of
+fixed size; every :class:`Subscription` reads the ring through its own
+cursor.  Chunks are stored and handed out as the same ``bytes`` objects, so
+each additional listener costs a cursor and a wake-up rather than a copy or
+a synthesis.
+
+Publishing never waits for listeners.  A subscriber that falls more than the
+ring size behind is either skipped ahead to the live edge (``lag="skip"``,
+the default; the missed audio is counted) or dropped (``lag="drop"``).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import wave
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+LAG_POLICIES = ("skip", "drop")
+
+
+class SubscriberDropped(Exception):
+    """Raised to a ``lag="drop"`` subscriber that fell behind the ring."""
+
+
+class Subscription:
+    """One listener's cursor into a :class:`BroadcastHub`.
+
+    Iterate it to receive PCM chunks published after it subscribed; the
+    iteration ends when the hub closes or the subscription is closed.
+    """
+
+    def __init__(self, hub: "BroadcastHub", lag: str) -> None:
+        self.hub = hub
+        self.lag = lag
+        self.cursor = hub.seq
+        self.skipped = 0
+        self.closed = False
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                pcm = self.hub._read(self)
+                if pcm is None:
+                    if self.closed or self.hub.closed:
+                        return
+                    await self.hub._wait()
+                    continue
+                yield pcm
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.hub._unsubscribe(self)
+
+
+class BroadcastHub:
+    """Ring of shared PCM chunks read by many independent subscribers.
+
+    Parameters
+    ----------
+    capacity:
+        Number of chunks kept for subscribers that are behind.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.capacity = max(1, capacity)
+        self._ring: List[bytes | None] = [None] * self.capacity
+        self.seq = 0  # sequence number of the next published chunk
+        self.closed = False
+        self._subscribers: set[Subscription] = set()
+        self._published: asyncio.Future | None = None
+        self._counters: Dict[str, int] = {
+            "chunks": 0,
+            "bytes": 0,
+            "subscribed": 0,
+            "skipped_chunks": 0,
+            "dropped": 0,
+        }
+
+    def subscribe(self, lag: str = "skip") -> Subscription:
+        """Return a subscription starting at the live edge."""
+
+        if lag not in LAG_POLICIES:
+            raise ValueError(f"lag must be one of {LAG_POLICIES}")
+        subscription = Subscription(self, lag)
+        self._subscribers.add(subscription)
+        self._counters["subscribed"] += 1
+        return subscription
+
+    def publish(self, pcm: bytes) -> None:
+        """Append ``pcm`` to the ring and wake subscribers; never blocks."""
+
+        if not pcm:
+            return
+        self._ring[self.seq % self.capacity] = pcm
+        self.seq += 1
+        self._counters["chunks"] += 1
+        self._counters["bytes"] += len(pcm)
+        self._wake()
+
+    def close(self) -> None:
+        """End every subscription once it has read what is buffered."""
+
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        # One shared future per publish instead of one per subscriber
+        if self._published is not None and not self._published.done():
+            self._published.set_result(None)
+        self._published = None
+
+    async def _wait(self) -> None:
+        if self._published is None:
+            self._published = asyncio.get_running_loop().create_future()
+        await asyncio.shield(self._published)
+
+    def _read(self, subscription: Subscription) -> bytes | None:
+        if subscription.closed:
+            return None
+        behind = self.seq - subscription.cursor
+        if behind > self.capacity:
+            if subscription.lag == "drop":
+                self._counters["dropped"] += 1
+                subscription.close()
+                raise SubscriberDropped(f"fell {behind} chunks behind")
+            # Resume at the live edge; older audio would arrive too late
+            skipped = behind - 1
+            subscription.cursor = self.seq - 1
+            subscription.skipped += skipped
+            self._counters["skipped_chunks"] += skipped
+        if subscription.cursor >= self.seq:
+            return None
+        pcm = self._ring[subscription.cursor % self.capacity]
+        subscription.cursor += 1
+        return pcm
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Publish counters, subscriber count and the slowest cursor lag."""
+
+        lags = [self.seq - s.cursor for s in self._subscribers]
+        return {
+            **self._counters,
+            "capacity": self.capacity,
+            "subscribers": len(self._subscribers),
+            "max_lag_chunks": max(lags, default=0),
+        }
+
+
+async def record(subscription: Subscription, path: str | os.PathLike, sample_rate: int) -> None:
+    """File sink: append the subscription's audio to a WAV file at ``path``.
+
+    The header is finalized when the subscription ends.
+    """
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    wav = await asyncio.to_thread(wave.open, str(path), "wb")
+    try:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        async for pcm in subscription:
+            await asyncio.to_thread(wav.writeframesraw, pcm)
+    finally:
+        await asyncio.to_thread(wav.close)
+
+
+__all__ = ["BroadcastHub", "LAG_POLICIES", "SubscriberDropped", "Subscription", "record"]
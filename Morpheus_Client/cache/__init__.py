@@ -0,0 +1,18 @@
+"""Caches for synthesized audio."""
+from .codes import pack_codes, unpack_codes
+from .phrases import compose_phrases, is_sentence_start
+from .tiers import DiskTier, MemoryTier, worker_directory
+from .utterance import UtteranceCache, normalize_text, utterance_key
+
+__all__ = [
+    "DiskTier",
+    "MemoryTier",
+    "UtteranceCache",
+    "compose_phrases",
+    "is_sentence_start",
+    "normalize_text",
+    "pack_codes",
+    "unpack_codes",
+    "utterance_key",
+    "worker_directory",
+]
@@ -0,0 +1,39 @@
+"""Compact storage format for SNAC code streams.
+
+Orpheus emits seven SNAC codes per ~85 ms frame, each below 4097.  Stored
+as little-endian ``uint16`` they take about 165 bytes per second of audio
+against 48 KB for 24 kHz/16-bit PCM, so a code cache holds roughly 300
+times more speech in the same budget.  A hit skips the LLM and re-runs only
+SNAC decoding (:func:`Morpheus_Client.tts_engine.speechpipe.decode_codes`).
+
+Layout: the 4-byte magic ``SNC1`` followed by the codes.
+"""
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+MAGIC = b"SNC1"
+MAX_CODE = 4096
+FRAME_CODES = 7
+
+
+def pack_codes(codes: Sequence[int]) -> bytes:
+    """Serialize a validated code stream."""
+
+    array = np.asarray(codes, dtype=np.int64)
+    if array.size and (array.min() < 0 or array.max() > MAX_CODE):
+        raise ValueError("SNAC codes must lie in [0, 4096]")
+    return MAGIC + array.astype("<u2").tobytes()
+
+
+def unpack_codes(data: bytes) -> List[int]:
+    """Inverse of :func:`pack_codes`."""
+
+    if data[: len(MAGIC)] != MAGIC or (len(data) - len(MAGIC)) % 2:
+        raise ValueError("not a packed SNAC code stream")
+    return np.frombuffer(data, dtype="<u2", offset=len(MAGIC)).astype(int).tolist()
+
+
+__all__ = ["FRAME_CODES", "MAGIC", "pack_codes", "unpack_codes"]
@@ -0,0 +1,169 @@
+"""Sentence-granular composition of cached and freshly synthesized audio.
+
+Long prompts often share most of their sentences and differ in one (a
+name, an amount).  :func:`compose_phrases` serves every sentence already in
+the :class:`~Morpheus_Client.cache.utterance.UtteranceCache` and synthesizes
+only the missing ones.  A producer task starts on the first missing sentence
+immediately and works through the rest in order, so live sentences are
+generated ahead of the playback position while cached ones are being sent.
+With ``parallel`` producers several missing sentences are generated at once.
+Look-ahead is bounded: a sentence is only started ``lookahead`` sentences
+ahead of the one being emitted, and each sentence buffers at most
+``queue_chunks`` chunks, so memory does not grow with the prompt length.
+Cached sentences are likewise read only when they are emitted; one evicted
+in the meantime is synthesized in place.
+
+The first chunk of every sentence carries a ``{"sentence": index}`` marker;
+pass :func:`is_sentence_start` as the ``seam`` predicate of
+:func:`~Morpheus_Client.orchestrator.stitcher.stitch_chunks` to crossfade
+only at sentence boundaries.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from contextlib import suppress
+from typing import AsyncIterator, Callable, List, Sequence
+
+from ..orchestrator.adapter import AudioChunk
+from .utterance import UtteranceCache
+
+_DONE = object()
+_INTERRUPTED = object()
+
+
+def is_sentence_start(chunk: AudioChunk) -> bool:
+    """Return ``True`` for chunks tagged by :func:`compose_phrases`."""
+
+    return isinstance(chunk.markers, dict) and "sentence" in chunk.markers
+
+
+async def compose_phrases(
+    sentences: Sequence[str],
+    keys: Sequence[str],
+    cache: UtteranceCache,
+    synthesize: Callable[[str], AsyncIterator[AudioChunk]],
+    *,
+    sample_rate: int,
+    parallel: int = 1,
+    lookahead: int | None = None,
+    queue_chunks: int = 16,
+) -> AsyncIterator[AudioChunk]:
+    """Yield audio for ``sentences`` in order, synthesizing only cache misses.
+
+    Parameters
+    ----------
+    sentences, keys:
+        Sentences to speak and their cache keys.
+    cache:
+        Cache consulted for each sentence and populated with every sentence
+        synthesized to completion.
+    synthesize:
+        ``synthesize(sentence)`` returning adapter chunks; the stream counts
+        as complete only if it ends with an ``eos`` chunk.
+    sample_rate:
+        PCM sampling rate used to compute durations of cached sentences.
+    parallel:
+        Number of missing sentences synthesized concurrently; audio is
+        still emitted in sentence order.
+    lookahead:
+        How many sentences past the one being emitted may be started;
+        ``parallel`` by default.
+    queue_chunks:
+        Chunks a producer may buffer for its sentence before it waits.
+
+    The stream ends with an empty ``eos`` chunk once every sentence was
+    delivered.  If a live sentence is interrupted (barge-in) the stream
+    stops without ``eos`` as soon as the interruption is observed.
+    """
+
+    cached = [key in cache for key in keys]
+    cache.misses += cached.count(False)  # membership checks are not counted
+    queues = {
+        i: asyncio.Queue(maxsize=queue_chunks) for i, hit in enumerate(cached) if not hit
+    }
+    interrupted = asyncio.Event()
+    lookahead = parallel if lookahead is None else lookahead
+    position = 0  # sentence being emitted
+    progress = asyncio.Condition()
+
+    pending = iter(queues.items())
+
+    async def produce() -> None:
+        # Producers share ``pending``, so each takes the next missing sentence
+        for i, queue in pending:
+            async with progress:
+                await progress.wait_for(
+                    lambda: i - position <= lookahead or interrupted.is_set()
+                )
+            if interrupted.is_set():
+                return
+            parts: List[bytes] = []
+            complete = False
+            try:
+                async for chunk in synthesize(sentences[i]):
+                    complete = chunk.eos
+                    if chunk.pcm:
+                        parts.append(chunk.pcm)
+                        await queue.put(dataclasses.replace(chunk, eos=False))
+            except Exception as exc:
+                interrupted.set()
+                await queue.put(exc)
+                return
+            if not complete:
+                interrupted.set()
+                await queue.put(_INTERRUPTED)
+                return
+            await queue.put(_DONE)
+            await cache.store(keys[i], b"".join(parts))
+
+    producers = [asyncio.create_task(produce()) for _ in range(min(parallel, len(queues)))]
+    try:
+        for i, hit in enumerate(cached):
+            async with progress:
+                position = i
+                progress.notify_all()
+            marker = {"sentence": i}
+            if hit:
+                if interrupted.is_set():
+                    return
+                data = await cache.get(keys[i])
+                if data is not None:
+                    duration_ms = len(data) / 2 / sample_rate * 1000.0
+                    yield AudioChunk(pcm=data, duration_ms=duration_ms, markers=marker)
+                    continue
+                # Evicted since the membership check: synthesize it in place
+                parts: List[bytes] = []
+                complete = False
+                async for chunk in synthesize(sentences[i]):
+                    complete = chunk.eos
+                    if chunk.pcm:
+                        parts.append(chunk.pcm)
+                        if marker is not None:
+                            chunk = dataclasses.replace(chunk, markers=marker)
+                            marker = None
+                        yield dataclasses.replace(chunk, eos=False)
+                if not complete:
+                    interrupted.set()
+                    return
+                await cache.store(keys[i], b"".join(parts))
+                continue
+            while (item := await queues[i].get()) is not _DONE:
+                if isinstance(item, Exception):
+                    raise item
+                if item is _INTERRUPTED or interrupted.is_set():
+                    return
+                if marker is not None:
+                    item = dataclasses.replace(item, markers=marker)
+                    marker = None
+                yield item
+        yield AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+    finally:
+        for producer in producers:
+            producer.cancel()
+        for producer in producers:
+            with suppress(asyncio.CancelledError):
+                await producer
+
+
+__all__ = ["compose_phrases", "is_sentence_start"]
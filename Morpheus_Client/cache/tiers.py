@@ -0,0 +1,233 @@
+"""Byte-bounded storage tiers for synthesized audio.
+
+:class:`MemoryTier` is an in-process LRU bounded by total payload bytes.
+:class:`DiskTier` keeps one file per entry plus a JSON index recording
+sizes and last access times; entries are read back through :mod:`mmap` so
+hits stream from the page cache without loading whole files into Python
+memory.  Both tiers evict least recently used entries once their byte
+budget is exceeded and count hits, misses and evictions.  Access times
+recorded by disk hits are written back to the index at most every
+:attr:`DiskTier.INDEX_INTERVAL_S` seconds (and on :meth:`DiskTier.flush`),
+so eviction after a restart still follows recent use.
+
+A disk tier's index lives in its process, so processes must not share a
+directory; :func:`worker_directory` gives each worker of a multi-process
+server a subdirectory of its own.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+from typing import IO, Dict, List, Optional
+
+# Lock files of claimed worker directories, held until the process exits
+_worker_locks: List[IO[str]] = []
+
+
+def worker_directory(root: str | os.PathLike, slots: int) -> Optional[Path]:
+    """Claim the first free ``root/worker-<n>`` (``n < slots``) for this process.
+
+    The claim is an exclusive :func:`fcntl.flock` on the directory's lock
+    file, released when the process exits, so a restarted worker takes over
+    a directory (and its cached entries) left by an earlier one.  Returns
+    ``None`` when all ``slots`` directories are claimed.
+    """
+
+    for n in range(slots):
+        path = Path(root) / f"worker-{n}"
+        path.mkdir(parents=True, exist_ok=True)
+        lock = open(path / ".lock", "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            continue
+        _worker_locks.append(lock)
+        return path
+    return None
+
+
+class MemoryTier:
+    """LRU mapping of key to ``bytes`` bounded by ``max_bytes``."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old)
+        self._entries[key] = data
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskTier:
+    """Directory of ``<key><suffix>`` files with an LRU index.
+
+    Writes go through a temporary file and :func:`os.replace`; the index is
+    rewritten the same way so a crash never leaves a half-written entry
+    visible.  Methods are thread-safe and block on file I/O, so callers on
+    an event loop run them in a worker thread.
+    """
+
+    INDEX = "index.json"
+    # Minimum seconds between index writes caused only by hits
+    INDEX_INTERVAL_S = 5.0
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int, suffix: str = ".pcm") -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, float]] = self._load_index()
+        self.bytes = sum(int(e["size"]) for e in self._index.values())
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def _load_index(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(self.directory / self.INDEX, "r", encoding="utf-8") as fh:
+                index = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return {k: v for k, v in index.items() if self._path(k).exists()}
+
+    def _save_index(self) -> None:
+        fd, tmp = tempfile.mkstemp(prefix=".index-", dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(self._index, fh)
+        os.replace(tmp, self.directory / self.INDEX)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def open(self, key: str) -> Optional[mmap.mmap]:
+        """Return a read-only map of the entry or ``None`` on a miss."""
+
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or not entry["size"]:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "rb") as fh:
+                    mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+            entry["atime"] = time.time()
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= self.INDEX_INTERVAL_S:
+                with suppress(OSError):
+                    self._save_index()
+            self.hits += 1
+            return mapped
+
+    def flush(self) -> None:
+        """Write access times recorded since the last index write."""
+
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store ``data`` under ``key``, evicting old entries as needed."""
+
+        if not data or len(data) > self.max_bytes:
+            return
+        fd, tmp = tempfile.mkstemp(prefix=".entry-", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(tmp)
+            raise
+        with self._lock:
+            old = self._index.get(key)
+            if old is not None:
+                self.bytes -= int(old["size"])
+            self._index[key] = {"size": len(data), "atime": time.time()}
+            self.bytes += len(data)
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        if self.bytes <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1]["atime"]):
+            if self.bytes <= self.max_bytes:
+                break
+            with suppress(OSError):
+                self._path(key).unlink()
+            del self._index[key]
+            self.bytes -= int(entry["size"])
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._index),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+__all__ = ["MemoryTier", "DiskTier", "worker_directory"]
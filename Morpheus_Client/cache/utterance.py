@@ -0,0 +1,205 @@
+"""Content-addressed cache of synthesized utterances.
+
+Repeated prompts – greetings, IVR menus, notification templates – are
+synthesized once and then replayed.  Entries are addressed by a digest of
+everything that influences the audio (see :func:`utterance_key`) and live
+in two tiers: a byte-bounded in-memory LRU in front of an optional disk
+tier of PCM files that are memory-mapped on read.  Disk reads run in a
+worker thread so a cold page cache never stalls the event loop.  Only complete
+utterances are stored; streams cut short by a barge-in or a disconnect
+never populate the cache.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import unicodedata
+from typing import Any, AsyncIterator, Dict, Optional
+
+from .tiers import DiskTier, MemoryTier, worker_directory
+
+STREAM_CHUNK_BYTES = 32 * 1024
+
+
+def normalize_text(text: str) -> str:
+    """Return ``text`` in NFC form with runs of whitespace collapsed."""
+
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def utterance_key(
+    text: str,
+    *,
+    voice: str,
+    adapter: str,
+    temperature: float,
+    top_p: float,
+    max_tokens: int,
+    seed: int | None = None,
+) -> str:
+    """Return the hex digest addressing one synthesized utterance."""
+
+    material = json.dumps(
+        [normalize_text(text), voice, adapter, float(temperature), float(top_p), int(max_tokens), seed],
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class UtteranceCache:
+    """Two-tier PCM cache keyed by :func:`utterance_key`.
+
+    Parameters
+    ----------
+    memory_bytes:
+        Budget of the in-memory tier.  ``0`` disables it.
+    directory:
+        Directory of the disk tier.  ``None`` disables it.
+    disk_bytes:
+        Budget of the disk tier.
+    suffix:
+        File suffix of disk entries; the cache stores opaque bytes, so the
+        same class also holds packed SNAC codes (``.snac``).
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int = 64 * 1024 * 1024,
+        directory: str | os.PathLike | None = None,
+        disk_bytes: int = 1024 * 1024 * 1024,
+        *,
+        suffix: str = ".pcm",
+    ) -> None:
+        self.memory = MemoryTier(memory_bytes)
+        self.disk = DiskTier(directory, disk_bytes, suffix) if directory else None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @classmethod
+    def from_env(cls, *, suffix: str = ".pcm", subdir: str = "") -> "UtteranceCache":
+        """Build a cache from the ``ORPHEUS_CACHE_*`` environment variables.
+
+        ``subdir`` places the disk tier below ``ORPHEUS_CACHE_DIR`` so caches
+        of different representations keep separate indexes.  With
+        ``ORPHEUS_HTTP_WORKERS`` above one each worker uses a directory of
+        its own (see :func:`worker_directory`) and an equal share of
+        ``ORPHEUS_CACHE_DISK_MB``; a worker finding none free runs without
+        a disk tier.
+        """
+
+        mib = 1024 * 1024
+        directory = os.environ.get("ORPHEUS_CACHE_DIR") or None
+        if directory and subdir:
+            directory = os.path.join(directory, subdir)
+        disk_bytes = int(float(os.environ.get("ORPHEUS_CACHE_DISK_MB", "1024")) * mib)
+        workers = int(os.environ.get("ORPHEUS_HTTP_WORKERS") or "1")
+        if directory and workers > 1:
+            directory = worker_directory(directory, workers)
+            disk_bytes //= workers
+        return cls(
+            memory_bytes=int(float(os.environ.get("ORPHEUS_CACHE_MEMORY_MB", "64")) * mib),
+            directory=directory,
+            disk_bytes=disk_bytes,
+            suffix=suffix,
+        )
+
+    def __contains__(self, key: str) -> bool:
+        """Whether ``key`` is cached, without reading it or counting a lookup."""
+
+        return key in self.memory or (self.disk is not None and key in self.disk)
+
+    async def lookup(
+        self, key: str, chunk_bytes: int = STREAM_CHUNK_BYTES
+    ) -> Optional[AsyncIterator[bytes]]:
+        """Return an iterator replaying ``key`` or ``None`` on a miss."""
+
+        data = self.memory.get(key)
+        if data is not None:
+            self.hits += 1
+            return _replay_bytes(data, chunk_bytes)
+        mapped = None
+        if self.disk is not None:
+            mapped = await asyncio.to_thread(self.disk.open, key)
+        if mapped is not None:
+            self.hits += 1
+            return _replay_mmap(mapped, chunk_bytes)
+        self.misses += 1
+        return None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the whole entry for ``key`` as bytes, or ``None``.
+
+        Disk hits are copied into the memory tier.
+        """
+
+        data = self.memory.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        data = await asyncio.to_thread(self._read_disk, key) if self.disk is not None else None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.memory.put(key, data)
+        return data
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        mapped = self.disk.open(key)
+        if mapped is None:
+            return None
+        with mapped:
+            return mapped[:]
+
+    async def store(self, key: str, data: bytes) -> None:
+        """Add a complete utterance to both tiers."""
+
+        if not data:
+            return
+        self.stores += 1
+        self.memory.put(key, data)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.put, key, data)
+
+    async def flush(self) -> None:
+        """Persist disk-tier access times, e.g. before shutdown."""
+
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.flush)
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate counters plus per-tier statistics."""
+
+        lookups = self.hits + self.misses
+        body: Dict[str, Any] = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.memory.evictions + (self.disk.evictions if self.disk else 0),
+            "memory": self.memory.stats(),
+        }
+        if self.disk is not None:
+            body["disk"] = self.disk.stats()
+        return body
+
+
+async def _replay_bytes(data: bytes, chunk_bytes: int) -> AsyncIterator[bytes]:
+    view = memoryview(data)
+    for offset in range(0, len(data), chunk_bytes):
+        yield bytes(view[offset : offset + chunk_bytes])
+
+
+async def _replay_mmap(mapped, chunk_bytes: int) -> AsyncIterator[bytes]:
+    # Slicing a map may fault pages in from disk; keep that off the loop
+    try:
+        for offset in range(0, len(mapped), chunk_bytes):
+            yield await asyncio.to_thread(mapped.__getitem__, slice(offset, offset + chunk_bytes))
+    finally:
+        mapped.close()
+
+
+__all__ = ["UtteranceCache", "normalize_text", "utterance_key"]
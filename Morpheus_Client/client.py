@@ -1,12 +1,15 @@
 """Minimal client for interacting with a running Morpheus TTS server."""
 from __future__ import annotations
 
-from typing import AsyncGenerator
+import asyncio
+import json
+import uuid
+from typing import AsyncGenerator, AsyncIterable
 from urllib.parse import quote
 
 import httpx
 import websockets
-from websockets.exceptions import ConnectionClosedOK
+from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
 
 from .tts_engine import DEFAULT_VOICE
 
@@ -28,14 +31,82 @@ class Client:
                 async for chunk in resp.aiter_bytes():
                     yield chunk
 
-    async def stream_ws(self, text: str, voice: str = DEFAULT_VOICE) -> AsyncGenerator[bytes, None]:
-        """Stream WAV bytes from the WebSocket endpoint."""
-        ws_url = self.base_url.replace("http", "ws") + f"/ws/tts?prompt={quote(text)}&voice={quote(voice)}"
+    async def stream_ws(
+        self,
+        text: str,
+        voice: str = DEFAULT_VOICE,
+        *,
+        reconnects: int = 3,
+        backoff_s: float = 0.5,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream WAV bytes from the WebSocket endpoint.
+
+        The stream is opened under a fresh session id.  If the connection
+        drops before the server closes it, the client reconnects up to
+        ``reconnects`` times in a row and resumes at the byte offset it has
+        received, so the server does not synthesize anything twice.
+        """
+        session = uuid.uuid4().hex
+        ws_url = (
+            self.base_url.replace("http", "ws")
+            + f"/ws/tts?prompt={quote(text)}&voice={quote(voice)}&session={session}"
+        )
+        offset: int | None = None
+        failures = 0
+        while True:
+            url = ws_url if offset is None else f"{ws_url}&offset={offset}"
+            try:
+                async with websockets.connect(url) as ws:
+                    offset = offset or 0
+                    while True:
+                        try:
+                            data = await ws.recv()
+                        except ConnectionClosedOK:
+                            return
+                        if isinstance(data, bytes):
+                            offset += len(data)
+                            failures = 0
+                        yield data
+            except ConnectionClosedError as exc:
+                # Policy (1008), server error (1011) and overload (1013) closes are final
+                if exc.rcvd is not None and exc.rcvd.code in (1008, 1011, 1013):
+                    raise
+                failures += 1
+                if failures > reconnects:
+                    raise
+            except OSError:
+                failures += 1
+                if offset is None or failures > reconnects:
+                    raise
+            await asyncio.sleep(backoff_s * failures)
+
+
+    async def stream_session(
+        self, deltas: AsyncIterable[str], voice: str = DEFAULT_VOICE
+    ) -> AsyncGenerator[bytes, None]:
+        """Send text deltas over a ``/ws/tts`` session and yield WAV bytes.
+
+        Audio for each sentence arrives while later deltas are still being
+        sent, so speech can start before ``deltas`` is exhausted.
+        """
+        ws_url = self.base_url.replace("http", "ws") + f"/ws/tts?voice={quote(voice)}"
         async with websockets.connect(ws_url) as ws:
-            while True:
-                try:
-                    data = await ws.recv()
-                except ConnectionClosedOK:
-                    break
-                yield data
 
+            async def send() -> None:
+                async for delta in deltas:
+                    await ws.send(json.dumps({"type": "text", "text": delta}))
+                await ws.send(json.dumps({"type": "end"}))
+
+            sender = asyncio.create_task(send())
+            try:
+                while True:
+                    try:
+                        data = await ws.recv()
+                    except ConnectionClosedOK:
+                        break
+                    if isinstance(data, bytes):
+                        yield data
+                    elif json.loads(data).get("type") == "end":
+                        break
+            finally:
+                sender.cancel()
@@ -0,0 +1,274 @@
+"""Multi-worker serving: session ownership and barge-in routing.
+
+Under ``uvicorn --workers N`` every worker process has its own event loop,
+orchestrators and sessions, and a request lands on whichever worker accepts
+the connection.  Configuration is shared through
+:class:`~Morpheus_Client.config.SharedConfig`; this module covers the
+sessions.  A :class:`SessionRegistry` in a SQLite file under the cluster
+directory records which worker owns each session and where that worker
+listens, and each :class:`Cluster` member serves a loopback socket on which
+other workers deliver barge-ins for its sessions.
+
+The routing protocol is one JSON line per connection:
+``{"op": "barge_in", "session": <id or null>}`` answered by
+``{"ok": <bool>}``.  A ``null`` session interrupts whatever the worker is
+currently speaking.
+
+SQLite calls block (up to ``busy_timeout`` while another worker writes), so
+:class:`Cluster` never makes them on the event loop: lookups run in a
+thread and claims and releases are queued to a writer task that applies
+them in order.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# How long a routed barge-in may take before the owner counts as unreachable
+ROUTE_TIMEOUT_S = 1.0
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # pragma: no cover - pid reused by another user
+        return True
+    return True
+
+
+class SessionRegistry:
+    """Shared table of workers and the sessions they own.
+
+    Writes are single statements in WAL mode, so claiming or releasing a
+    session costs well under a millisecond and does not block readers.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS workers ("
+            "id TEXT PRIMARY KEY, address TEXT NOT NULL, pid INTEGER NOT NULL, started REAL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, worker TEXT NOT NULL, started REAL)"
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def register(self, worker: str, address: str, pid: int) -> None:
+        """Add ``worker`` and forget workers whose process has exited."""
+
+        for other, other_pid in self._execute("SELECT id, pid FROM workers"):
+            if other != worker and not _alive(other_pid):
+                self.unregister(other)
+        self._execute(
+            "INSERT OR REPLACE INTO workers (id, address, pid, started) VALUES (?, ?, ?, ?)",
+            (worker, address, pid, time.time()),
+        )
+
+    def unregister(self, worker: str) -> None:
+        self._execute("DELETE FROM sessions WHERE worker = ?", (worker,))
+        self._execute("DELETE FROM workers WHERE id = ?", (worker,))
+
+    def claim(self, session: str, worker: str) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO sessions (id, worker, started) VALUES (?, ?, ?)",
+            (session, worker, time.time()),
+        )
+
+    def release(self, session: str, worker: str) -> None:
+        self._execute("DELETE FROM sessions WHERE id = ? AND worker = ?", (session, worker))
+
+    def owner(self, session: str) -> tuple[str, str] | None:
+        """Return ``(worker, address)`` owning ``session`` if any."""
+
+        rows = self._execute(
+            "SELECT workers.id, workers.address FROM sessions "
+            "JOIN workers ON workers.id = sessions.worker WHERE sessions.id = ?",
+            (session,),
+        )
+        return rows[0] if rows else None
+
+    def workers(self) -> Dict[str, str]:
+        """Return ``worker -> address`` for all registered workers."""
+
+        return dict(self._execute("SELECT id, address FROM workers"))
+
+    def sessions(self) -> int:
+        return self._execute("SELECT COUNT(*) FROM sessions")[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class Cluster:
+    """This worker's membership in a multi-worker deployment.
+
+    :meth:`claim` and :meth:`release` return at once; :meth:`flush` waits
+    until they reached the registry.  :attr:`metrics` reports membership as
+    of the last :meth:`refresh`.
+
+    Parameters
+    ----------
+    directory:
+        Directory shared by all workers; holds ``sessions.sqlite3``.
+    interrupt:
+        ``interrupt(session)`` barges in on a session of this worker (or on
+        whatever it is speaking when ``session`` is ``None``) and returns
+        whether anything was interrupted.
+    worker_id:
+        Identifier of this worker, the process id by default.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        interrupt: Callable[[str | None], bool],
+        *,
+        worker_id: str | None = None,
+    ) -> None:
+        self.registry = SessionRegistry(Path(directory) / "sessions.sqlite3")
+        self.interrupt = interrupt
+        self.worker_id = worker_id or str(os.getpid())
+        self.address: str | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._writes: asyncio.Queue = asyncio.Queue()
+        self._writer: asyncio.Task | None = None
+        self._membership: Dict[str, int] = {"workers": 0, "sessions": 0}
+        self._counters: Dict[str, int] = {
+            "local": 0,
+            "routed": 0,
+            "received": 0,
+            "unreachable": 0,
+            "registry_errors": 0,
+        }
+
+    async def start(self) -> None:
+        """Listen on a loopback port and register this worker."""
+
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        self.address = f"{host}:{port}"
+        await asyncio.to_thread(self.registry.register, self.worker_id, self.address, os.getpid())
+        self._writer = asyncio.create_task(self._write())
+
+    async def stop(self) -> None:
+        if self._writer is not None:
+            self._writes.put_nowait(None)
+            await self._writer
+            self._writer = None
+        await asyncio.to_thread(self.registry.unregister, self.worker_id)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.registry.close()
+
+    async def _write(self) -> None:
+        while (write := await self._writes.get()) is not None:
+            try:
+                await asyncio.to_thread(*write)
+            except sqlite3.Error:
+                self._counters["registry_errors"] += 1
+            finally:
+                self._writes.task_done()
+        self._writes.task_done()
+
+    def claim(self, session: str) -> None:
+        self._writes.put_nowait((self.registry.claim, session, self.worker_id))
+
+    def release(self, session: str) -> None:
+        self._writes.put_nowait((self.registry.release, session, self.worker_id))
+
+    async def flush(self) -> None:
+        """Wait until queued claims and releases are in the registry."""
+
+        await self._writes.join()
+
+    async def refresh(self) -> None:
+        """Re-read the worker and session counts shown in :attr:`metrics`."""
+
+        workers = await asyncio.to_thread(self.registry.workers)
+        sessions = await asyncio.to_thread(self.registry.sessions)
+        self._membership = {"workers": len(workers), "sessions": sessions}
+
+    async def barge_in(self, session: str | None = None) -> bool:
+        """Interrupt ``session`` wherever it runs.
+
+        Without a session every worker interrupts what it is speaking.
+        Returns whether any worker interrupted something.
+        """
+
+        if session is not None:
+            if self.interrupt(session):
+                self._counters["local"] += 1
+                return True
+            owner = await asyncio.to_thread(self.registry.owner, session)
+            if owner is None or owner[0] == self.worker_id:
+                return False
+            return await self._route(owner[1], session)
+        interrupted = self.interrupt(None)
+        workers = await asyncio.to_thread(self.registry.workers)
+        others = [a for w, a in workers.items() if w != self.worker_id]
+        results = await asyncio.gather(*(self._route(address, None) for address in others))
+        return interrupted or any(results)
+
+    async def _route(self, address: str, session: str | None) -> bool:
+        host, port = address.rsplit(":", 1)
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, int(port)), ROUTE_TIMEOUT_S
+            )
+            try:
+                writer.write(json.dumps({"op": "barge_in", "session": session}).encode() + b"\n")
+                await writer.drain()
+                reply = json.loads(await asyncio.wait_for(reader.readline(), ROUTE_TIMEOUT_S))
+            finally:
+                writer.close()
+        except (OSError, ValueError, asyncio.TimeoutError):
+            self._counters["unreachable"] += 1
+            return False
+        self._counters["routed"] += 1
+        return bool(reply.get("ok"))
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            message = json.loads(await reader.readline())
+            ok = message.get("op") == "barge_in" and self.interrupt(message.get("session"))
+            self._counters["received"] += 1
+            writer.write(json.dumps({"ok": bool(ok)}).encode() + b"\n")
+            await writer.drain()
+        except (OSError, ValueError, AttributeError):
+            pass
+        finally:
+            writer.close()
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Worker identity, membership and barge-in routing counters."""
+
+        return {
+            **self._counters,
+            **self._membership,
+            "worker": self.worker_id,
+            "address": self.address,
+        }
+
+
+__all__ = ["Cluster", "ROUTE_TIMEOUT_S", "SessionRegistry"]
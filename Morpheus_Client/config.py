@@ -2,8 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
-from typing import Dict
+import sqlite3
+import stat
+import tempfile
+import threading
+from contextlib import suppress
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
 
 
 def ensure_env_file_exists() -> None:
@@ -91,12 +101,311 @@ def save_config(data: Dict[str, str]) -> None:
     # Prepare lines once so both targets receive identical content
     lines = [f"{key}={value}\n" for key, value in data.items()]
 
-    with open(".env", "w") as fh:
-        fh.writelines(lines)
+    _atomic_write(".env", lines)
 
     # Mirror config to ~/.morpheus/config
     home_cfg_dir = os.path.expanduser("~/.morpheus")
     os.makedirs(home_cfg_dir, exist_ok=True)
-    with open(os.path.join(home_cfg_dir, "config"), "w") as fh:
-        fh.writelines(lines)
+    _atomic_write(os.path.join(home_cfg_dir, "config"), lines)
+
+
+def _atomic_write(path: str, lines: list[str]) -> None:
+    """Write ``lines`` to ``path`` via a temporary file and ``os.replace``.
+
+    Readers either see the previous file or the complete new one, never a
+    truncated config.
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(prefix=".config-", dir=directory)
+    try:
+        # ``mkstemp`` creates 0600; keep the mode of the file we replace
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "w") as fh:
+            fh.writelines(lines)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable, versioned view of the service configuration.
+
+    Sessions capture the snapshot that is current when they start and keep
+    using it until they finish, so later updates never change the adapter,
+    voice or generation parameters of an in-flight stream.
+
+    Attributes
+    ----------
+    version:
+        Monotonic counter incremented on every update.
+    values:
+        Persistable ``KEY -> str`` settings as written to ``.env``.
+    adapter:
+        Name of the synthesis adapter new sessions should use.
+    voice:
+        Backend agnostic voice description (``VoiceSchema``) or ``None`` for
+        the engine default.
+    """
+
+    version: int
+    values: Mapping[str, str] = field(default_factory=dict)
+    adapter: str = "llama_cpp"
+    voice: Any = None
+
+    @property
+    def generation(self) -> Dict[str, float | int]:
+        """``temperature``, ``top_p`` and ``max_tokens`` set in :attr:`values`.
+
+        Keys that are missing or do not parse are left out so callers can
+        fall back to the engine defaults.
+        """
+
+        params: Dict[str, float | int] = {}
+        for name, key, kind in _GENERATION_KEYS:
+            with suppress(KeyError, ValueError, TypeError):
+                params[name] = kind(self.values[key])
+        return params
+
+
+_GENERATION_KEYS = (
+    ("temperature", "ORPHEUS_TEMPERATURE", float),
+    ("top_p", "ORPHEUS_TOP_P", float),
+    ("max_tokens", "ORPHEUS_MAX_TOKENS", int),
+)
+
+
+class SharedConfig:
+    """Versioned configuration record shared by worker processes.
+
+    The record lives in a SQLite database so every worker started by
+    ``uvicorn --workers`` reads the same adapter, voice and settings.
+    ``PRAGMA data_version`` changes whenever another connection commits,
+    which makes :meth:`changed` a cheap check instead of a full re-read.
+    Updates run read-modify-write inside one ``BEGIN IMMEDIATE``
+    transaction, so concurrent updates from different workers are
+    serialized rather than lost.  Every method blocks while another worker
+    writes (up to ``busy_timeout``); :class:`ConfigStore` calls them from
+    worker threads only.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        # WAL commits without fsync; readers never block the writer
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS config ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), "
+            "version INTEGER NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._data_version: int | None = None
+
+    def changed(self) -> bool:
+        """Return ``True`` once after another process committed an update."""
+
+        with self._lock:
+            (version,) = self._db.execute("PRAGMA data_version").fetchone()
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+
+    def seed(self, payload: Dict[str, Any]) -> None:
+        """Store ``payload`` as version 0 unless a record already exists."""
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO config (id, version, payload) VALUES (1, 0, ?)",
+                (json.dumps(payload),),
+            )
+
+    def load(self) -> tuple[int, Dict[str, Any]]:
+        """Return the current ``(version, payload)``."""
+
+        with self._lock:
+            version, payload = self._db.execute(
+                "SELECT version, payload FROM config WHERE id = 1"
+            ).fetchone()
+        return version, json.loads(payload)
+
+    def update(
+        self, change: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> tuple[int, Dict[str, Any]]:
+        """Apply ``change`` to the stored payload and bump the version."""
+
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                version, payload = self._db.execute(
+                    "SELECT version, payload FROM config WHERE id = 1"
+                ).fetchone()
+                payload = change(json.loads(payload))
+                version += 1
+                self._db.execute(
+                    "UPDATE config SET version = ?, payload = ? WHERE id = 1",
+                    (version, json.dumps(payload)),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return version, payload
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ConfigStore:
+    """Hold the current :class:`ConfigSnapshot` and persist it off-loop.
+
+    Updates build a new snapshot and swap the reference, which is atomic for
+    readers on the event loop.  Persistence runs in a worker thread and
+    coalesces: if several updates land while a write is in progress only the
+    newest snapshot is written afterwards.
+
+    With a :class:`SharedConfig` the snapshot is mirrored through it: the
+    first worker seeds the record, :meth:`publish` writes updates there and
+    :meth:`watch` picks up the others' updates in the background, so reading
+    :attr:`current` never touches SQLite.  ``voice_type`` rebuilds the voice
+    from its JSON form.
+    """
+
+    def __init__(
+        self,
+        values: Mapping[str, str] | None = None,
+        *,
+        adapter: str = "llama_cpp",
+        voice: Any = None,
+        shared: SharedConfig | None = None,
+        voice_type: Callable[..., Any] | None = None,
+    ) -> None:
+        initial = dict(get_current_config() if values is None else values)
+        self._current = ConfigSnapshot(
+            version=0,
+            values=MappingProxyType(initial),
+            adapter=adapter,
+            voice=voice,
+        )
+        self._persisted_version = 0
+        self._persist_lock = asyncio.Lock()
+        self._shared = shared
+        self._voice_type = voice_type
+        if shared is not None:
+            shared.seed(self._payload(self._current))
+            shared.changed()
+            self._refresh()
+
+    @property
+    def current(self) -> ConfigSnapshot:
+        """Return the snapshot new sessions should use."""
+
+        return self._current
+
+    def _payload(self, snapshot: ConfigSnapshot) -> Dict[str, Any]:
+        voice = snapshot.voice
+        if hasattr(voice, "model_dump"):
+            voice = voice.model_dump()
+        return {"values": dict(snapshot.values), "adapter": snapshot.adapter, "voice": voice}
+
+    def _snapshot(self, version: int, payload: Dict[str, Any]) -> ConfigSnapshot:
+        voice = payload.get("voice")
+        if isinstance(voice, dict) and self._voice_type is not None:
+            voice = self._voice_type(**voice)
+        return ConfigSnapshot(
+            version=version,
+            values=MappingProxyType(dict(payload["values"])),
+            adapter=payload["adapter"],
+            voice=voice,
+        )
+
+    def _refresh(self) -> None:
+        self._current = self._snapshot(*self._shared.load())
+
+    def _adopt(self, version: int, payload: Dict[str, Any]) -> ConfigSnapshot:
+        # A slower thread must not bring back an older version
+        if version > self._current.version:
+            self._current = self._snapshot(version, payload)
+        return self._current
+
+    def _change(self, values: Mapping[str, str] | None, fields: Dict[str, Any]):
+        def change(payload: Dict[str, Any]) -> Dict[str, Any]:
+            new = self._payload(replace(self._snapshot(0, payload), **fields))
+            new["values"].update(values or {})
+            return new
+
+        return change
+
+    async def refresh(self) -> ConfigSnapshot:
+        """Adopt another worker's update, reading SQLite in a thread."""
+
+        if self._shared is not None and await asyncio.to_thread(self._shared.changed):
+            self._adopt(*await asyncio.to_thread(self._shared.load))
+        return self._current
+
+    async def watch(self, interval_s: float) -> None:
+        """Call :meth:`refresh` every ``interval_s`` until cancelled."""
+
+        while True:
+            await self.refresh()
+            await asyncio.sleep(interval_s)
+
+    async def publish(
+        self, values: Mapping[str, str] | None = None, **fields: Any
+    ) -> ConfigSnapshot:
+        """Like :meth:`update`, but write the shared record from a thread."""
+
+        if self._shared is None:
+            return self.update(values, **fields)
+        updated = await asyncio.to_thread(self._shared.update, self._change(values, fields))
+        return self._adopt(*updated)
+
+    def update(
+        self, values: Mapping[str, str] | None = None, **fields: Any
+    ) -> ConfigSnapshot:
+        """Publish a new snapshot merging ``values`` and snapshot ``fields``.
+
+        With a :class:`SharedConfig` this blocks on SQLite; on the event
+        loop use :meth:`publish`.
+        """
+
+        if self._shared is not None:
+            return self._adopt(*self._shared.update(self._change(values, fields)))
+
+        prev = self._current
+        merged = dict(prev.values)
+        if values:
+            merged.update(values)
+        snapshot = replace(
+            prev,
+            version=prev.version + 1,
+            values=MappingProxyType(merged),
+            **fields,
+        )
+        self._current = snapshot
+        return snapshot
+
+    async def persist(self) -> None:
+        """Write the newest snapshot to disk unless it is already saved."""
+
+        async with self._persist_lock:
+            snapshot = self._current
+            if snapshot.version <= self._persisted_version:
+                return
+            await asyncio.to_thread(save_config, dict(snapshot.values))
+            self._persisted_version = snapshot.version
 
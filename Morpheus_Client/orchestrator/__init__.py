@@ -2,8 +2,11 @@
 from .adapter import AudioChunk, TTSAdapter
 from .buffer import PlaybackBuffer
 from .chunk_ladder import ChunkLadder
+from .chunk_queue import PCMQueue
 from .core import Orchestrator
+from .lookahead import LookaheadPipeline
 from .ring_buffer import RingBuffer
+from .scheduler import SynthesisScheduler
 from .stitcher import stitch_chunks
 
 __all__ = [
@@ -11,7 +14,10 @@ __all__ = [
     "TTSAdapter",
     "PlaybackBuffer",
     "ChunkLadder",
+    "PCMQueue",
     "RingBuffer",
     "Orchestrator",
+    "LookaheadPipeline",
+    "SynthesisScheduler",
     "stitch_chunks",
 ]
@@ -0,0 +1,275 @@
+"""Admission control from the projected real-time factor.
+
+Accepting every request on a saturated host makes all streams fall behind
+playback at once.  :class:`AdmissionController` estimates synthesis
+capacity in audio seconds per wall second from measured generation rates,
+predicts the audio length of a request from its text, and decides whether
+the request can still be played without stalls.  A request gets an equal
+share of the capacity, but at most one slot's rate unless it is generated
+in parallel batches:
+
+* **accept** – with its share of the capacity the request's audio finishes
+  no later than its deadline plus ``slack_s`` behind real-time playback: a
+  client that starts playback that late never stalls (an idle server
+  always accepts);
+* **queue** – not now, but an admitted stream is expected to finish within
+  ``max_queue_s``; the request waits for it (first-come first-served);
+* **reject** – otherwise, with the expected wait as ``retry_after``.
+
+Until a generation rate was measured every request is accepted.  A stream
+whose text arrives piecemeal re-applies for every piece with its ticket
+(:meth:`AdmissionController.admit`).
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import suppress
+from typing import Any, Deque, Dict, List
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; carries ``retry_after``."""
+
+    def __init__(self, retry_after: float, decision: Dict[str, Any]) -> None:
+        super().__init__(f"overloaded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+        self.decision = decision
+
+
+class Ticket:
+    """An admitted stream; :meth:`release` it when the stream ends."""
+
+    def __init__(self, controller: "AdmissionController", cost_s: float, share: float) -> None:
+        self.controller = controller
+        self.cost_s = cost_s
+        self.started = time.monotonic()
+        # Expected time to finish generation at the share it was admitted with
+        self.expected_s = cost_s / share if share > 0 else math.inf
+        self._released = False
+
+    def remaining_s(self, now: float) -> float:
+        return max(0.0, self.expected_s - (now - self.started))
+
+    def _extend(self, cost_s: float, share: float) -> None:
+        now = time.monotonic()
+        remaining = self.remaining_s(now)
+        self.cost_s += cost_s
+        self.started = now
+        self.expected_s = remaining + (cost_s / share if share > 0 else math.inf)
+
+    def release(self) -> None:
+        """Free the stream's share; safe to call more than once."""
+
+        if not self._released:
+            self._released = True
+            self.controller._release(self)
+
+
+class AdmissionController:
+    """Accept, queue or reject streams by projected real-time factor.
+
+    Parameters
+    ----------
+    slots:
+        Number of generations that run in parallel (model instances).
+    slack_s:
+        How far generation may end behind playback on top of the request's
+        deadline; covers the client's prebuffer.
+    max_queue_s:
+        Longest expected wait for which a request is queued instead of
+        rejected.
+    smoothing:
+        Weight of the newest sample in the moving averages.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        *,
+        slack_s: float = 0.5,
+        max_queue_s: float = 2.0,
+        smoothing: float = 0.2,
+    ) -> None:
+        self.slots = max(1, slots)
+        self.slack_s = slack_s
+        self.max_queue_s = max_queue_s
+        self.smoothing = smoothing
+        self.rate: float | None = None  # audio seconds per second, one slot
+        self.seconds_per_char = 1.0 / 15.0
+        self._active: List[Ticket] = []
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._counters: Dict[str, int] = {"accepted": 0, "queued": 0, "rejected": 0}
+        self._last: Dict[str, Any] | None = None
+
+    @property
+    def capacity(self) -> float | None:
+        """Estimated audio seconds generated per second across all slots."""
+
+        return None if self.rate is None else self.rate * self.slots
+
+    def _smooth(self, old: float | None, new: float) -> float:
+        return new if old is None else old + self.smoothing * (new - old)
+
+    def observe(self, audio_s: float, busy_s: float, chars: int = 0) -> None:
+        """Record one finished generation.
+
+        ``busy_s`` is the time the adapter spent generating, excluding time
+        the consumer took and time spent waiting for a model, so neither
+        slow clients nor a queue in front of the models lower the estimate.
+        """
+
+        if audio_s <= 0 or busy_s <= 0:
+            return
+        self.rate = self._smooth(self.rate, audio_s / busy_s)
+        if chars > 0:
+            self.seconds_per_char = self._smooth(self.seconds_per_char, audio_s / chars)
+
+    def predict(self, text: str) -> float:
+        """Predicted audio seconds for ``text``."""
+
+        return len(text) * self.seconds_per_char
+
+    def _others(self, ticket: Ticket | None) -> List[Ticket]:
+        return [t for t in self._active if t is not ticket]
+
+    def _wait_s(self, now: float, ticket: Ticket | None = None) -> float:
+        return min((t.remaining_s(now) for t in self._others(ticket)), default=0.0)
+
+    def decide(
+        self,
+        text: str,
+        deadline_s: float = 0.0,
+        ticket: Ticket | None = None,
+        *,
+        batched: bool = False,
+    ) -> Dict[str, Any]:
+        """Return the decision for ``text`` under the current load.
+
+        ``deadline_s`` is how long the client accepts to wait for audio to
+        start; generation may trail playback by that much plus ``slack_s``.
+        With ``ticket`` the text continues that admitted stream, which is
+        judged as if it had just arrived.  Only a ``batched`` request, one
+        generated on several slots at once, may use more than one slot's
+        rate.
+        """
+
+        now = time.monotonic()
+        others = self._others(ticket)
+        cost = self.predict(text)
+        capacity = self.capacity
+        share = math.inf if capacity is None else capacity / (len(others) + 1)
+        if not batched and self.rate is not None:
+            share = min(share, self.rate)
+        rtf = 0.0 if share == math.inf else 1.0 / share
+        lag = cost * rtf - cost
+        decision: Dict[str, Any] = {
+            "cost_s": cost,
+            "projected_rtf": rtf,
+            "lag_s": max(0.0, lag),
+            "deadline_s": deadline_s,
+            "wait_s": 0.0,
+        }
+        if not others or lag <= deadline_s + self.slack_s:
+            decision["action"] = "accept"
+        else:
+            decision["wait_s"] = self._wait_s(now, ticket)
+            decision["action"] = "queue" if decision["wait_s"] <= self.max_queue_s else "reject"
+        decision["share"] = share
+        return decision
+
+    def _admit(self, decision: Dict[str, Any], ticket: Ticket | None) -> Ticket:
+        if ticket is not None:
+            ticket._extend(decision["cost_s"], decision["share"])
+            return ticket
+        ticket = Ticket(self, decision["cost_s"], decision["share"])
+        self._active.append(ticket)
+        return ticket
+
+    def _record(self, decision: Dict[str, Any], action: str) -> Dict[str, Any]:
+        self._counters[action] += 1
+        self._last = {k: v for k, v in decision.items() if k != "share"}
+        self._last["action"] = action
+        return self._last
+
+    async def admit(
+        self,
+        text: str,
+        deadline_s: float = 0.0,
+        ticket: Ticket | None = None,
+        *,
+        batched: bool = False,
+    ) -> Ticket:
+        """Admit a stream for ``text`` or raise :class:`Overloaded`.
+
+        With ``ticket`` (still active), ``text`` is the next part of that
+        stream, e.g. the next sentence of an uploading body: it is decided
+        as if the stream had just arrived, and on acceptance its cost is
+        added to ``ticket``, which is returned.  ``batched`` is passed to
+        :meth:`decide`.
+        """
+
+        decision = self.decide(text, deadline_s, ticket, batched=batched)
+        if decision["action"] == "accept" and not self._waiters:
+            self._record(decision, "accepted")
+            return self._admit(decision, ticket)
+        if decision["action"] == "reject":
+            raise Overloaded(max(1.0, decision["wait_s"]), self._record(decision, "rejected"))
+
+        self._record(decision, "queued")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        deadline = time.monotonic() + self.max_queue_s
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if self._waiters[0] is waiter:
+                    decision = self.decide(text, deadline_s, ticket, batched=batched)
+                    if decision["action"] == "accept":
+                        return self._admit(decision, ticket)
+                if remaining <= 0:
+                    retry_after = max(1.0, self._wait_s(time.monotonic(), ticket))
+                    raise Overloaded(retry_after, self._record(decision, "rejected"))
+                # Woken when an admitted stream ends or the queue head leaves
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(asyncio.shield(waiter), remaining)
+                waiter = self._renew(waiter)
+        finally:
+            self._waiters.remove(waiter)
+            self._wake()
+
+    def _renew(self, waiter: asyncio.Future) -> asyncio.Future:
+        if not waiter.done():
+            return waiter
+        fresh = asyncio.get_running_loop().create_future()
+        self._waiters[self._waiters.index(waiter)] = fresh
+        return fresh
+
+    def _wake(self) -> None:
+        if self._waiters and not self._waiters[0].done():
+            self._waiters[0].set_result(None)
+
+    def _release(self, ticket: Ticket) -> None:
+        if ticket in self._active:
+            self._active.remove(ticket)
+        self._wake()
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Estimator state, load and decision counters."""
+
+        return {
+            **self._counters,
+            "capacity": self.capacity,
+            "rate_per_slot": self.rate,
+            "seconds_per_char": self.seconds_per_char,
+            "slots": self.slots,
+            "active": len(self._active),
+            "waiting": len(self._waiters),
+            "last_decision": self._last,
+        }
+
+
+__all__ = ["AdmissionController", "Overloaded", "Ticket"]
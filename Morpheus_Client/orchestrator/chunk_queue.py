@@ -0,0 +1,77 @@
+"""FIFO of PCM segments for adapters that re-slice generator output.
+
+Backends produce audio in segments of whatever size suits them while the
+orchestrator pulls ``chunk_size`` bytes at a time.  Buffering in a
+``bytearray`` copies every segment in, slices a second copy out and
+deletes the consumed prefix, which periodically moves the backlog, so the
+cost grows with how far generation runs ahead.
+:class:`PCMQueue` keeps the segments as they arrived, as memoryviews in a
+deque, with a read offset into the first one.  A pull that takes a whole
+segment returns the original object and a partial one copies only the
+bytes it returns; the backlog itself is never moved.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, List
+
+
+class PCMQueue:
+    """Byte FIFO over a deque of memoryviews with an offset cursor."""
+
+    def __init__(self) -> None:
+        self._segments: Deque[memoryview] = deque()
+        self._offset = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, data: bytes) -> None:
+        """Queue ``data`` without copying it."""
+
+        if data:
+            view = memoryview(data).cast("B")
+            self._segments.append(view)
+            self._size += len(view)
+
+    def take(self, n: int) -> bytes:
+        """Remove and return up to ``n`` bytes from the front."""
+
+        n = min(n, self._size)
+        if n <= 0:
+            return b""
+        head = self._segments[0]
+        start = self._offset
+        end = start + n
+        if end <= len(head):
+            self._size -= n
+            if end == len(head):
+                self._segments.popleft()
+                self._offset = 0
+                if start == 0 and isinstance(head.obj, bytes):
+                    return head.obj
+            else:
+                self._offset = end
+            return head[start:end].tobytes()
+        views: List[memoryview] = []
+        self._size -= n
+        while n:
+            head = self._segments[0]
+            end = min(len(head), self._offset + n)
+            views.append(head[self._offset : end])
+            n -= end - self._offset
+            if end == len(head):
+                self._segments.popleft()
+                self._offset = 0
+            else:
+                self._offset = end
+        return b"".join(views)
+
+    def clear(self) -> None:
+        self._segments.clear()
+        self._offset = 0
+        self._size = 0
+
+
+__all__ = ["PCMQueue"]
@@ -34,23 +34,39 @@ class Orchestrator:
         ladder: ChunkLadder | None = None,
         comfort_band: Tuple[float, float] = (50.0, 250.0),
         ring: RingBuffer | None = None,
+        on_record: Callable[[dict], None] | None = None,
     ) -> None:
         self.adapter = adapter
         self.buffer = buffer
         self.ladder = ladder or ChunkLadder()
         self.comfort_band = comfort_band
         self.ring = ring
+        self.on_record = on_record
         self._barge_in = asyncio.Event()
+        self._barge_in_at: float | None = None
+        self._stale_pull: asyncio.Future | None = None
+        self._cleanup: asyncio.Task | None = None
         self.timeline: list[dict] = []
         self.transcripts: list[dict] = []
 
     def _record(self, stage: str, start: float, result: str) -> None:
-        """Append a timing event to the in-memory timeline."""
+        """Append a timing event to the in-memory timeline.
+
+        The event is also passed to ``on_record`` when one was given.
+        """
         duration_ms = (time.perf_counter() - start) * 1000.0
-        self.timeline.append({"stage": stage, "duration_ms": duration_ms, "result": result})
+        event = {"stage": stage, "duration_ms": duration_ms, "result": result}
+        self.timeline.append(event)
+        if self.on_record is not None:
+            self.on_record(event)
 
     def signal_barge_in(self) -> None:
-        """Notify the orchestrator that the current utterance was interrupted."""
+        """Notify the orchestrator that the current utterance was interrupted.
+
+        A pending adapter pull is cancelled right away rather than awaited.
+        """
+        if not self._barge_in.is_set():
+            self._barge_in_at = time.perf_counter()
         self._barge_in.set()
 
     def log_transcript(self, text: str) -> None:
@@ -71,11 +87,51 @@ class Orchestrator:
         with open(transcript_path, "w", encoding="utf-8") as fh:
             json.dump(self.transcripts, fh, indent=2)
 
+    async def _pull(self, window: int, barge_in: asyncio.Future) -> AudioChunk | None:
+        """Pull ``window`` from the adapter unless a barge-in comes first.
+
+        Returns ``None`` on barge-in; a pull still in flight is cancelled but
+        not awaited, since unwinding it may wait for a model step.  It is
+        left in ``_stale_pull`` for the background reset to collect.
+        """
+        pull = asyncio.ensure_future(self.adapter.pull(window))
+        try:
+            await asyncio.wait({pull, barge_in}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            pull.cancel()
+            await asyncio.gather(pull, return_exceptions=True)
+            raise
+        if barge_in.done():
+            pull.cancel()
+            self._stale_pull = pull
+            return None
+        return pull.result()
+
+    async def _reset_after_barge_in(self, pull: asyncio.Future | None) -> None:
+        """Let a cancelled pull unwind, then reset the adapter."""
+        start = time.perf_counter()
+        if pull is not None:
+            await asyncio.gather(pull, return_exceptions=True)
+        await self.adapter.reset()
+        self._record("barge_in_reset", start, "ok")
+
+    async def settle(self) -> None:
+        """Wait until the adapter reset that follows a barge-in has finished."""
+        cleanup, self._cleanup = self._cleanup, None
+        if cleanup is not None:
+            await cleanup
+
     async def stream(
         self, on_event: Callable[[dict], None] | None = None
     ) -> AsyncGenerator[AudioChunk, None]:
         """Yield audio chunks until EOS or a barge-in occurs.
 
+        If the consumer closes the stream early, or the task is cancelled
+        while a pull is pending, the adapter is reset so generation stops.
+        On barge-in the stream returns as soon as playback is silenced; the
+        adapter is reset in the background (see :meth:`settle`) and a new
+        stream waits for that reset before pulling again.
+
         Parameters
         ----------
         on_event: Callable[[dict], None] | None, optional
@@ -85,41 +141,62 @@ class Orchestrator:
             ``token_window`` and ``render_ms`` along with the base64-encoded
             PCM data.
         """
+        await self.settle()
+        self._stale_pull = None
         chunk_id = 0
-        while not self._barge_in.is_set():
-            adapter_name = getattr(self.adapter, "name", self.adapter.__class__.__name__)
-            window = self.ladder.current
-            start = time.perf_counter()
-            chunk = await self.adapter.pull(window)
-            render_ms = (time.perf_counter() - start) * 1000.0
-            self._record("adapter_pull", start, "eos" if chunk.eos else "ok")
-
-            log_entry = {
-                "chunk_id": chunk_id,
-                "adapter": adapter_name,
-                "token_window": window,
-                "render_ms": render_ms,
-                "pcm": base64.b64encode(chunk.pcm).decode("ascii"),
-            }
-            logger.info(json.dumps(log_entry))
-            if on_event is not None:
-                on_event(log_entry)
-
-            if self.ring is not None:
-                self.ring.write(chunk.pcm)
-            else:
-                self.buffer.add(chunk.duration_ms)
-
-            yield chunk
-            if chunk.eos:
-                break
-            self.ladder.adapt(self.buffer.depth_ms, self.comfort_band)
-            chunk_id += 1
+        ended = False
+        barge_in = asyncio.ensure_future(self._barge_in.wait())
+        try:
+            while not self._barge_in.is_set():
+                adapter_name = getattr(self.adapter, "name", self.adapter.__class__.__name__)
+                window = self.ladder.current
+                start = time.perf_counter()
+                chunk = await self._pull(window, barge_in)
+                if chunk is None:
+                    self._record("adapter_pull", start, "interrupted")
+                    break
+                render_ms = (time.perf_counter() - start) * 1000.0
+                self._record("adapter_pull", start, "eos" if chunk.eos else "ok")
+
+                log_entry = {
+                    "chunk_id": chunk_id,
+                    "adapter": adapter_name,
+                    "token_window": window,
+                    "render_ms": render_ms,
+                    "pcm": base64.b64encode(chunk.pcm).decode("ascii"),
+                }
+                logger.info(json.dumps(log_entry))
+                if on_event is not None:
+                    on_event(log_entry)
+
+                if self.ring is not None:
+                    self.ring.write(chunk.pcm)
+                else:
+                    self.buffer.add(chunk.duration_ms)
+
+                # A consumer that stops right after EOS has not abandoned us
+                ended = chunk.eos
+                yield chunk
+                if chunk.eos:
+                    break
+                self.ladder.adapt(self.buffer.depth_ms, self.comfort_band)
+                chunk_id += 1
+            ended = True
+        finally:
+            barge_in.cancel()
+            if not ended:
+                # The consumer closed or cancelled the stream: stop generation
+                start = time.perf_counter()
+                await self.adapter.reset()
+                self._record("cancel_reset", start, "ok")
         if self._barge_in.is_set():
-            start = time.perf_counter()
-            await self.adapter.reset()
+            # Drop queued audio first so playback falls silent, then reset
             self.buffer.reset()
             if self.ring is not None:
                 self.ring.reset()
+            if self._barge_in_at is not None:
+                self._record("barge_in_silence", self._barge_in_at, "ok")
             self._barge_in.clear()
-            self._record("barge_in_reset", start, "ok")
+            self._barge_in_at = None
+            pull, self._stale_pull = self._stale_pull, None
+            self._cleanup = asyncio.ensure_future(self._reset_after_barge_in(pull))
@@ -0,0 +1,137 @@
+"""Bounded look-ahead synthesis for queued text messages.
+
+Without look-ahead every message is synthesized only after the previous
+one was fully emitted, so model prompt processing for message N+1 never
+overlaps streaming of message N.  :class:`LookaheadPipeline` reads up to
+``depth`` messages ahead of the one being emitted and starts their
+synthesis immediately.  Audio is still emitted strictly in message order;
+look-ahead output is buffered until its turn.  :meth:`barge_in` cancels the
+message being emitted and all look-ahead work.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import suppress
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict
+
+_DONE = object()
+
+
+class _Job:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task: asyncio.Task | None = None
+
+
+class LookaheadPipeline:
+    """Synthesize upcoming messages while the current one is emitted.
+
+    Parameters
+    ----------
+    synthesize:
+        ``synthesize(text)`` returning an async iterator of PCM bytes.
+    depth:
+        Number of messages synthesized ahead of the one being emitted.
+        ``0`` restores strictly sequential synthesis.
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str], AsyncIterator[bytes]],
+        *,
+        depth: int = 1,
+    ) -> None:
+        self.synthesize = synthesize
+        self.depth = max(0, depth)
+        self._jobs: Deque[_Job] = deque()
+        self._slots = asyncio.Semaphore(self.depth + 1)
+        self._counters: Dict[str, int] = {
+            "messages": 0,
+            "emitted": 0,
+            "barge_ins": 0,
+            "cancelled": 0,
+        }
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """Message counters plus the number of messages in flight."""
+
+        return {**self._counters, "depth": self.depth, "in_flight": len(self._jobs)}
+
+    async def _produce(self, job: _Job) -> None:
+        stream = self.synthesize(job.text)
+        try:
+            async for pcm in stream:
+                job.queue.put_nowait(pcm)
+        finally:
+            await stream.aclose()
+            job.queue.put_nowait(_DONE)
+
+    async def _read(self, texts: AsyncIterable[str], ready: asyncio.Queue) -> None:
+        try:
+            async for text in texts:
+                await self._slots.acquire()
+                job = _Job(text)
+                job.task = asyncio.create_task(self._produce(job))
+                self._jobs.append(job)
+                self._counters["messages"] += 1
+                ready.put_nowait(job)
+        finally:
+            ready.put_nowait(_DONE)
+
+    async def _emit(self, job: _Job, sink: Callable[[bytes], Awaitable[None]] | None) -> None:
+        try:
+            while (pcm := await job.queue.get()) is not _DONE:
+                if sink is not None:
+                    await sink(pcm)
+        finally:
+            with suppress(ValueError):
+                self._jobs.remove(job)
+            self._slots.release()
+        task = job.task
+        if task is not None and task.done() and not task.cancelled() and task.exception():
+            raise task.exception()
+        self._counters["emitted"] += 1
+
+    def barge_in(self) -> None:
+        """Drop the current message and cancel all look-ahead synthesis."""
+
+        self._counters["barge_ins"] += 1
+        for job in self._jobs:
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+                self._counters["cancelled"] += 1
+            # Drop buffered audio; the job ends at the sentinel
+            while not job.queue.empty():
+                job.queue.get_nowait()
+            job.queue.put_nowait(_DONE)
+
+    async def run(
+        self,
+        texts: AsyncIterable[str],
+        sink: Callable[[bytes], Awaitable[None]] | None = None,
+    ) -> None:
+        """Synthesize every message from ``texts`` and emit audio in order.
+
+        ``sink`` receives each PCM chunk; without one the audio is drained.
+        """
+
+        ready: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read(texts, ready))
+        try:
+            while (job := await ready.get()) is not _DONE:
+                await self._emit(job, sink)
+            await reader
+        finally:
+            reader.cancel()
+            tasks = [job.task for job in self._jobs if job.task is not None]
+            for task in tasks:
+                task.cancel()
+            with suppress(asyncio.CancelledError):
+                await reader
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = ["LookaheadPipeline"]
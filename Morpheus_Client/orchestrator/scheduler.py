@@ -0,0 +1,173 @@
+"""Priority and deadline-aware admission of synthesis work.
+
+Without a scheduler every request creates its adapter immediately, so a
+long bulk job competes on equal terms with a live conversation for the
+model instances.  :class:`SynthesisScheduler` hands out a fixed number of
+slots (normally the number of model instances).  Waiting work is ordered by
+priority class – ``interactive`` (WebSocket conversations), ``streaming``
+(REST and text sources), ``batch`` – and earliest deadline first within a
+class.
+
+Work is admitted per sentence: a :class:`ScheduledJob` acquires a slot for
+each sentence it synthesizes and releases it afterwards, so a long job is
+preempted at the next sentence boundary whenever more urgent work is
+waiting.  A job keeps its original deadline when it re-queues, so older
+jobs of a class go first.  Queue wait per class is reported through
+:attr:`SynthesisScheduler.metrics`.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Mapping, Tuple
+
+PRIORITY_CLASSES: Tuple[str, ...] = ("interactive", "streaming", "batch")
+
+# Time-to-first-audio targets used when a request states no deadline
+DEFAULT_DEADLINES_MS: Dict[str, float] = {
+    "interactive": 300.0,
+    "streaming": 1000.0,
+    "batch": 60000.0,
+}
+
+
+class ScheduledJob:
+    """One request's claim on scheduler capacity.
+
+    ``deadline`` is an absolute :func:`time.monotonic` timestamp by which the
+    first slot should have been granted.
+    """
+
+    def __init__(self, scheduler: "SynthesisScheduler", priority: str, deadline: float) -> None:
+        self.scheduler = scheduler
+        self.priority = priority
+        self.deadline = deadline
+        self.grants = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for the enclosed block (normally one sentence)."""
+
+        await self.scheduler._acquire(self)
+        try:
+            yield
+        finally:
+            self.scheduler._release()
+
+
+class SynthesisScheduler:
+    """Dispatch synthesis work onto ``capacity`` slots by priority and deadline.
+
+    Parameters
+    ----------
+    capacity:
+        Number of concurrently admitted sentences.
+    deadlines_ms:
+        Default relative deadline per priority class.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        *,
+        deadlines_ms: Mapping[str, float] = DEFAULT_DEADLINES_MS,
+    ) -> None:
+        self.capacity = max(1, capacity)
+        self.deadlines_ms = dict(deadlines_ms)
+        self._in_use = 0
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._stats: Dict[str, Dict[str, float]] = {
+            name: {
+                "jobs": 0,
+                "dispatched": 0,
+                "wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+                "deadline_misses": 0,
+                "preemptions": 0,
+            }
+            for name in PRIORITY_CLASSES
+        }
+
+    def job(self, priority: str = "streaming", deadline_ms: float | None = None) -> ScheduledJob:
+        """Register a request of class ``priority`` due in ``deadline_ms``."""
+
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"unknown priority class {priority!r}")
+        if deadline_ms is None:
+            deadline_ms = self.deadlines_ms[priority]
+        self._stats[priority]["jobs"] += 1
+        return ScheduledJob(self, priority, time.monotonic() + deadline_ms / 1000.0)
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Per-class dispatch and queue-wait statistics plus occupancy."""
+
+        waiting = {name: 0 for name in PRIORITY_CLASSES}
+        for *_, future, job, _ in self._queue:
+            if not future.done():
+                waiting[job.priority] += 1
+        classes = {}
+        for name, stats in self._stats.items():
+            dispatched = stats["dispatched"]
+            classes[name] = {
+                **stats,
+                "waiting": waiting[name],
+                "mean_wait_ms": stats["wait_seconds"] / dispatched * 1000.0 if dispatched else 0.0,
+            }
+        return {"capacity": self.capacity, "in_use": self._in_use, "classes": classes}
+
+    def _waiting(self) -> bool:
+        while self._queue and self._queue[0][3].done():
+            heapq.heappop(self._queue)
+        return bool(self._queue)
+
+    def _grant(self, job: ScheduledJob, enqueued: float, *, queued: bool) -> None:
+        now = time.monotonic()
+        waited = now - enqueued
+        stats = self._stats[job.priority]
+        self._in_use += 1
+        stats["dispatched"] += 1
+        stats["wait_seconds"] += waited
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+        if job.grants == 0 and now > job.deadline:
+            stats["deadline_misses"] += 1
+        elif job.grants and queued:  # overtaken at a sentence boundary
+            stats["preemptions"] += 1
+        job.grants += 1
+
+    async def _acquire(self, job: ScheduledJob) -> None:
+        enqueued = time.monotonic()
+        if self._in_use < self.capacity and not self._waiting():
+            self._grant(job, enqueued, queued=False)
+            return
+        future = asyncio.get_running_loop().create_future()
+        rank = PRIORITY_CLASSES.index(job.priority)
+        entry = (rank, job.deadline, next(self._seq), future, job, enqueued)
+        heapq.heappush(self._queue, entry)
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled():
+                self._release()  # granted just as we were cancelled
+            else:
+                future.cancel()
+            raise
+
+    def _release(self) -> None:
+        self._in_use -= 1
+        while self._in_use < self.capacity and self._waiting():
+            *_, future, job, enqueued = heapq.heappop(self._queue)
+            self._grant(job, enqueued, queued=True)
+            future.set_result(None)
+
+
+__all__ = [
+    "DEFAULT_DEADLINES_MS",
+    "PRIORITY_CLASSES",
+    "ScheduledJob",
+    "SynthesisScheduler",
+]
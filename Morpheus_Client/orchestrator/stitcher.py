@@ -1,7 +1,7 @@
 """Overlap-add stitcher for adapter chunks."""
 from __future__ import annotations
 
-from typing import AsyncIterator, AsyncGenerator
+from typing import AsyncIterator, AsyncGenerator, Callable
 import numpy as np
 
 from .adapter import AudioChunk
@@ -13,6 +13,8 @@ async def stitch_chunks(
     sample_rate: int,
     overlap_ms: float = 0.0,
     emit_markers: bool = False,
+    seam: Callable[[AudioChunk], bool] | None = None,
+    drop_partial: bool = False,
 ) -> AsyncGenerator[AudioChunk, None]:
     """Join ``chunks`` using overlap-add with optional marker propagation.
 
@@ -30,6 +32,15 @@ async def stitch_chunks(
     emit_markers:
         When ``True`` any marker payload on input chunks is forwarded to the
         output.  Otherwise markers are suppressed.
+    seam:
+        Optional predicate selecting the chunks that start a new segment.
+        When given, only those chunks are crossfaded with the preceding
+        audio; all other chunks are joined without overlap, which keeps
+        contiguous audio within a segment intact.
+    drop_partial:
+        When ``True`` a stream that ends without an ``eos`` chunk is treated
+        as interrupted (barge-in) and the held-back overlap tail is dropped
+        instead of being flushed as a final chunk.
     """
 
     tail = np.zeros(0, dtype=np.int16)
@@ -38,7 +49,7 @@ async def stitch_chunks(
     async for chunk in chunks:
         pcm = np.frombuffer(chunk.pcm, dtype=np.int16)
         if tail.size:
-            if overlap_samples > 0:
+            if overlap_samples > 0 and (seam is None or seam(chunk)):
                 ov = min(overlap_samples, tail.size, pcm.size)
                 if ov:
                     fade_out = tail[-ov:] * np.linspace(1.0, 0.0, ov, endpoint=False)
@@ -74,6 +85,6 @@ async def stitch_chunks(
         yield AudioChunk(pcm=out.astype('<i2').tobytes(), duration_ms=duration_ms, markers=markers, eos=False)
 
     # If stream ended without explicit EOS, flush remaining tail
-    if tail.size:
+    if tail.size and not drop_partial:
         duration_ms = len(tail) / sample_rate * 1000.0
         yield AudioChunk(pcm=tail.astype('<i2').tobytes(), duration_ms=duration_ms, markers=None, eos=True)
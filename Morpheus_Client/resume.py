@@ -0,0 +1,333 @@
+"""Resumable audio streams for clients on unreliable links.
+
+A stream opened under a client-chosen session id is generated by a producer
+task into a :class:`SpillBuffer` instead of straight into the socket.  The
+socket is only a reader at a byte offset, so when it drops the generation
+carries on and a reconnect with ``(session, offset)`` continues from the
+buffer without synthesizing anything twice.  A stream nobody reads for
+``ttl_s`` expires: generation still running is cancelled and the buffer is
+discarded.  If generation fails, readers get the audio produced so far and
+then :class:`StreamFailed`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict
+
+# Largest single read handed to a socket
+READ_BYTES = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class StreamFailed(RuntimeError):
+    """Generation of a resumable stream ended with an error."""
+
+
+class SpillBuffer:
+    """Append-only byte log with the newest bytes in memory.
+
+    Once more than ``memory_bytes`` are held the oldest segments move to an
+    anonymous temporary file, so memory stays bounded however long the
+    utterance gets while recent offsets, where reconnects usually resume,
+    are still served from memory.  The file holds at most ``spill_bytes``;
+    an append that would spill beyond that raises :class:`BufferError`
+    (the appended bytes are kept, in memory).
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int,
+        directory: str | os.PathLike | None = None,
+        spill_bytes: int | None = None,
+    ) -> None:
+        self.memory_bytes = memory_bytes
+        self.directory = directory
+        self.spill_bytes = spill_bytes
+        self._segments: Deque[bytes] = deque()
+        self._memory = 0
+        self._spilled = 0  # bytes [0, spilled) live in the file
+        self._file = None
+
+    @property
+    def size(self) -> int:
+        return self._spilled + self._memory
+
+    @property
+    def spilled(self) -> int:
+        return self._spilled
+
+    def append(self, data: bytes) -> None:
+        if not data:
+            return
+        self._segments.append(data)
+        self._memory += len(data)
+        if self._memory > self.memory_bytes:
+            self._spill()
+
+    def _spill(self) -> None:
+        # Spill down to half the budget so writes happen in batches
+        count = amount = 0
+        for segment in self._segments:
+            if self._memory - amount <= self.memory_bytes // 2:
+                break
+            count += 1
+            amount += len(segment)
+        if self.spill_bytes is not None and self._spilled + amount > self.spill_bytes:
+            raise BufferError(f"spill file would exceed {self.spill_bytes} bytes")
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self.directory)
+        parts = [self._segments.popleft() for _ in range(count)]
+        self._memory -= amount
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(b"".join(parts))
+        self._spilled += sum(map(len, parts))
+
+    def read(self, offset: int, limit: int = READ_BYTES) -> bytes:
+        """Return bytes from ``offset`` up to the end of its segment.
+
+        Reads in memory keep the segment boundaries of the producer; spilled
+        reads return up to ``limit`` bytes.
+        """
+
+        if offset < self._spilled:
+            self._file.seek(offset)
+            return self._file.read(min(limit, self._spilled - offset))
+        position = self._spilled
+        for segment in self._segments:
+            if offset < position + len(segment):
+                return segment[offset - position :] if offset > position else segment
+            position += len(segment)
+        return b""
+
+    def close(self) -> None:
+        self._segments.clear()
+        self._memory = self._spilled = 0
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ResumableStream:
+    """One session's audio, generated once and readable from any offset."""
+
+    def __init__(
+        self,
+        session_id: str,
+        source: AsyncIterator[bytes],
+        buffer: SpillBuffer,
+        registry: "ResumableStreams",
+    ) -> None:
+        self.session_id = session_id
+        self.buffer = buffer
+        self.registry = registry
+        self.done = False
+        self.error: str | None = None
+        self.readers = 0
+        self._source = source
+        self._changed: asyncio.Future | None = None
+        self._expiry: asyncio.TimerHandle | None = None
+        self._producer = asyncio.create_task(self._produce())
+        # Expires unless a reader attaches in time
+        self._detach()
+
+    async def _produce(self) -> None:
+        try:
+            async for pcm in self._source:
+                self.buffer.append(pcm)
+                self._wake()
+        except Exception as exc:
+            logger.exception("generation for session %s failed", self.session_id)
+            self.error = str(exc) or type(exc).__name__
+            self.registry._counters["failed"] += 1
+        finally:
+            self.done = True
+            self._wake()
+            await self._source.aclose()
+
+    def _current(self) -> bool:
+        return self.registry.streams.get(self.session_id) is self
+
+    def _detach(self) -> None:
+        self._expiry = asyncio.get_running_loop().call_later(
+            self.registry.ttl_s, self.registry.expire, self.session_id
+        )
+
+    def _wake(self) -> None:
+        if self._changed is not None and not self._changed.done():
+            self._changed.set_result(None)
+        self._changed = None
+
+    async def read(self, offset: int = 0) -> AsyncIterator[bytes]:
+        """Yield the stream from byte ``offset`` until generation ends.
+
+        The stream is released once a reader has received all of it;
+        a reader that leaves early starts the expiry timer instead.  When
+        generation failed, :class:`StreamFailed` is raised after the last
+        byte and the stream is kept until it expires, so a reconnect learns
+        of the failure too.
+        """
+
+        self.readers += 1
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        complete = False
+        try:
+            while True:
+                data = self.buffer.read(offset)
+                if data:
+                    offset += len(data)
+                    yield data
+                elif self.done:
+                    if self.error is not None:
+                        raise StreamFailed(self.error)
+                    complete = offset >= self.buffer.size
+                    return
+                else:
+                    if self._changed is None:
+                        self._changed = asyncio.get_running_loop().create_future()
+                    await asyncio.shield(self._changed)
+        finally:
+            self.readers -= 1
+            if complete and self._current():
+                self.registry.discard(self.session_id)
+            elif not self.readers and self._current():
+                self._detach()
+
+    def close(self) -> None:
+        """Stop generation if still running and drop the buffer."""
+
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        self._producer.cancel()
+        self.buffer.close()
+        self.done = True
+        self._wake()
+
+
+class ResumableStreams:
+    """Registry of resumable streams by session id.
+
+    Parameters
+    ----------
+    ttl_s:
+        How long a stream without readers is kept for a reconnect.
+    memory_bytes:
+        In-memory budget of each stream's :class:`SpillBuffer`.
+    directory:
+        Where spill files are created; the system temp directory by default.
+    spill_bytes:
+        Largest spill file per stream; generation past it fails the stream.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float = 30.0,
+        memory_bytes: int = 1 << 20,
+        directory: str | os.PathLike | None = None,
+        spill_bytes: int | None = 256 << 20,
+    ) -> None:
+        self.ttl_s = ttl_s
+        self.memory_bytes = memory_bytes
+        self.directory = directory
+        self.spill_bytes = spill_bytes
+        self.streams: Dict[str, ResumableStream] = {}
+        self._counters: Dict[str, int] = {
+            "opened": 0,
+            "resumed": 0,
+            "expired": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "ResumableStreams":
+        """Build from ``ORPHEUS_RESUME_TTL_S``, ``ORPHEUS_RESUME_MEMORY_KB``,
+        ``ORPHEUS_RESUME_DIR`` and ``ORPHEUS_RESUME_SPILL_MB``."""
+
+        return cls(
+            ttl_s=float(os.environ.get("ORPHEUS_RESUME_TTL_S", "30")),
+            memory_bytes=int(float(os.environ.get("ORPHEUS_RESUME_MEMORY_KB", "1024")) * 1024),
+            directory=os.environ.get("ORPHEUS_RESUME_DIR") or None,
+            spill_bytes=int(float(os.environ.get("ORPHEUS_RESUME_SPILL_MB", "256")) * (1 << 20)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0
+
+    def open(
+        self, session_id: str, source: AsyncIterator[bytes], header: bytes = b""
+    ) -> ResumableStream:
+        """Start generating ``source`` for ``session_id``.
+
+        ``header`` is stored in front of the generated bytes, so offsets
+        count everything the client received.  Raises :class:`KeyError` if
+        a stream is already registered under the id; it belongs to another
+        client and is left alone.
+        """
+
+        if session_id in self.streams:
+            self._counters["rejected"] += 1
+            raise KeyError(session_id)
+        buffer = SpillBuffer(self.memory_bytes, self.directory, self.spill_bytes)
+        buffer.append(header)
+        stream = ResumableStream(session_id, source, buffer, self)
+        self.streams[session_id] = stream
+        self._counters["opened"] += 1
+        return stream
+
+    def resume(self, session_id: str, offset: int) -> ResumableStream | None:
+        """Return the stream to continue at ``offset``, if it can be."""
+
+        stream = self.streams.get(session_id)
+        if stream is None or offset > stream.buffer.size:
+            return None
+        self._counters["resumed"] += 1
+        return stream
+
+    def discard(self, session_id: str) -> None:
+        """Forget a stream that was delivered completely."""
+
+        stream = self.streams.pop(session_id, None)
+        if stream is not None:
+            stream.close()
+            self._counters["completed"] += 1
+
+    def expire(self, session_id: str) -> None:
+        stream = self.streams.pop(session_id, None)
+        if stream is not None:
+            stream.close()
+            self._counters["expired"] += 1
+
+    async def close(self) -> None:
+        """Expire every stream and wait for their generation to stop."""
+
+        producers = [stream._producer for stream in self.streams.values()]
+        for session_id in list(self.streams):
+            self.expire(session_id)
+        await asyncio.gather(*producers, return_exceptions=True)
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Counters, open streams and buffered bytes."""
+
+        streams = list(self.streams.values())
+        return {
+            **self._counters,
+            "ttl_s": self.ttl_s,
+            "active": len(streams),
+            "detached": sum(1 for s in streams if not s.readers),
+            "buffered_bytes": sum(s.buffer.size for s in streams),
+            "spilled_bytes": sum(s.buffer.spilled for s in streams),
+        }
+
+
+__all__ = ["READ_BYTES", "ResumableStream", "ResumableStreams", "SpillBuffer", "StreamFailed"]
@@ -9,23 +9,34 @@ clients continue to function.
 from __future__ import annotations
 
 import asyncio
+import codecs
+import functools
+import math
 import os
 import struct
-from contextlib import suppress
+import tempfile
+import time
+import uuid
+from contextlib import aclosing, asynccontextmanager, contextmanager, nullcontext, suppress
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, ValidationError
 from starlette.applications import Starlette
+from starlette.background import BackgroundTask
 from starlette.exceptions import HTTPException
-from starlette.requests import Request
-from starlette.responses import JSONResponse, StreamingResponse
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import FileResponse, JSONResponse, StreamingResponse
 from starlette.routing import Mount, Route, WebSocketRoute
 from starlette.staticfiles import StaticFiles
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
-from .config import ensure_env_file_exists, get_current_config, save_config
+from .batch import BatchItem, BatchManager, ManifestError, parse_manifest
+from .broadcast import LAG_POLICIES, BroadcastHub, SubscriberDropped, record
+from .cache import UtteranceCache, compose_phrases, is_sentence_start, utterance_key
+from .cluster import Cluster
+from .config import ConfigSnapshot, ConfigStore, SharedConfig, ensure_env_file_exists
 from .tts_engine import (
     AVAILABLE_VOICES,
     DEFAULT_VOICE,
@@ -33,14 +44,23 @@ from .tts_engine import (
     AVAILABLE_LANGUAGES,
 )
 from .tts_engine import inference as inference_params
+from .tts_engine import llama_local
 from .tts_engine.adapter_registry import VoiceSchema, registry as adapter_registry
 from .tts_engine.inference import SAMPLE_RATE
 from .orchestrator.buffer import PlaybackBuffer
 from .orchestrator.chunk_ladder import ChunkLadder
 from .orchestrator.core import Orchestrator
+from .orchestrator.admission import AdmissionController, Overloaded, Ticket
+from .orchestrator.lookahead import LookaheadPipeline
+from .orchestrator.scheduler import PRIORITY_CLASSES, ScheduledJob, SynthesisScheduler
 from .orchestrator.stitcher import stitch_chunks
+from .resume import ResumableStream, ResumableStreams, StreamFailed
+from .session import SpeechSession
+from .stats_feed import StatsFeed
 from text_sources import TextSource
+from text_sources.coalescer import CoalescingSource
 from text_sources.registry import registry as source_registry
+from text_sources.segmenter import SentenceSegmenter, split_sentences
 
 # Ensure environment is initialized
 ensure_env_file_exists()
@@ -89,39 +109,214 @@ async def websocket_pcm_stream(
 
 # Global orchestrator state for barge-in
 current_orchestrator: Orchestrator | None = None
-current_adapter_name = "llama_cpp"
-current_voice = VoiceSchema(voice=DEFAULT_VOICE)
+# Set for multi-worker serving; config and session ownership live there
+CLUSTER_DIR = os.environ.get("ORPHEUS_CLUSTER_DIR") or None
+# Versioned configuration; sessions capture ``config_store.current`` at start
+config_store = ConfigStore(
+    voice=VoiceSchema(voice=DEFAULT_VOICE),
+    shared=SharedConfig(Path(CLUSTER_DIR) / "config.sqlite3") if CLUSTER_DIR else None,
+    voice_type=VoiceSchema,
+)
+# Worker membership; started by the lifespan when ``CLUSTER_DIR`` is set
+cluster: Cluster | None = None
+# Sessions served by this worker: session id -> barge-in callback
+local_sessions: dict[str, Callable[[], None]] = {}
 current_source_name = "cli_pipe"
 current_source: TextSource | None = None
 current_source_task: asyncio.Task | None = None
+current_pipeline: LookaheadPipeline | None = None
+# Completed utterances keyed by text, voice, adapter and generation params
+utterance_cache = UtteranceCache.from_env()
+# Admits synthesis per sentence onto the available model instances
+scheduler = SynthesisScheduler(
+    int(os.environ.get("ORPHEUS_SCHED_SLOTS", "0")) or llama_local.model_pool.size
+)
+# Sheds real-time requests the measured capacity cannot play without stalls
+admission = AdmissionController(
+    scheduler.capacity,
+    slack_s=float(os.environ.get("ORPHEUS_ADMISSION_SLACK_MS", "500")) / 1000.0,
+    max_queue_s=float(os.environ.get("ORPHEUS_ADMISSION_QUEUE_MS", "2000")) / 1000.0,
+)
+
+
+# Text-source audio is synthesized once and fanned out to every listener
+broadcast_hub = BroadcastHub(int(os.environ.get("ORPHEUS_BROADCAST_CHUNKS", "256")))
+# Prompt-mode ``/ws/tts`` streams kept for reconnects with an offset
+resumable_streams = ResumableStreams.from_env()
+# Synthesis abandoned before EOS (client gone, cancelled or barged in)
+cancelled_work = {"streams": 0, "seconds": 0.0, "audio_seconds": 0.0}
+
+
+def _stats_gauges() -> dict[str, Any]:
+    return {
+        "sessions": admission.metrics["active"],
+        "admission_waiting": admission.metrics["waiting"],
+        "scheduler_in_use": scheduler.metrics["in_use"],
+        "scheduler_capacity": scheduler.capacity,
+        "model_pool": llama_local.model_pool.metrics,
+        "cancelled_streams": cancelled_work["streams"],
+        "listeners": broadcast_hub.metrics["subscribers"],
+        "dashboards": stats_feed.metrics["subscribers"],
+    }
+
+
+# Aggregated timeline pushed to ``/ws/stats`` dashboards
+stats_feed = StatsFeed(
+    _stats_gauges,
+    interval_s=float(os.environ.get("ORPHEUS_STATS_INTERVAL_MS", "500")) / 1000.0,
+)
+
 
+async def _consume_source(source: TextSource, lookahead: int = 1) -> None:
+    """Continuously feed text from a source into the orchestrator.
 
-async def _consume_source(source: TextSource) -> None:
-    """Continuously feed text from a source into the orchestrator."""
+    Up to ``lookahead`` messages are synthesized ahead of the one being
+    emitted; see :class:`LookaheadPipeline`.  The audio is published to
+    :data:`broadcast_hub` for ``/ws/listen`` and ``/v1/audio/live``.
+    """
+
+    global current_pipeline
+    pipeline = current_pipeline = LookaheadPipeline(
+        lambda text: orchestrated_pcm_stream(prompt=text, voice=None), depth=lookahead
+    )
+
+    async def publish(pcm: bytes) -> None:
+        broadcast_hub.publish(pcm)
 
     try:
-        async for text in source.stream():
-            pcm_stream = orchestrated_pcm_stream(prompt=text, voice=None)
-            async for _ in pcm_stream:
-                pass
+        await pipeline.run(source.stream(), sink=publish)
     except asyncio.CancelledError:  # pragma: no cover - task cancel
         pass
 
 
 async def init_source(name: str, **options: Any) -> None:
-    """Instantiate and begin consuming from a text source."""
+    """Instantiate and begin consuming from a text source.
+
+    With a ``coalesce_idle_ms`` above ``0`` fragments are merged by
+    :class:`CoalescingSource` before synthesis; ``coalesce_idle_ms`` and
+    ``coalesce_max_chars`` override the ``ORPHEUS_COALESCE_*`` environment
+    defaults.  The default idle time of ``0`` leaves the source unwrapped,
+    so every message is synthesized as sent.  ``lookahead`` (default
+    ``ORPHEUS_LOOKAHEAD``) sets how many messages are synthesized ahead.
+    """
 
     global current_source_name, current_source, current_source_task
     current_source_name = name
+    idle_ms = float(
+        options.pop("coalesce_idle_ms", os.environ.get("ORPHEUS_COALESCE_IDLE_MS", "0"))
+    )
+    max_chars = int(
+        options.pop("coalesce_max_chars", os.environ.get("ORPHEUS_COALESCE_MAX_CHARS", "400"))
+    )
+    lookahead = int(options.pop("lookahead", os.environ.get("ORPHEUS_LOOKAHEAD", "1")))
     if name == "cli_pipe" and "reader" not in options:
         options["reader"] = asyncio.StreamReader()
     source = source_registry.create(name, **options)
+    if idle_ms > 0:
+        source = CoalescingSource(source, idle_timeout=idle_ms / 1000.0, max_chars=max_chars)
     current_source = source
     if current_source_task:
         current_source_task.cancel()
         with suppress(asyncio.CancelledError):
             await current_source_task
-    current_source_task = asyncio.create_task(_consume_source(source))
+    current_source_task = asyncio.create_task(_consume_source(source, lookahead))
+
+
+# Crossfade applied where cached and live sentences meet
+SENTENCE_CROSSFADE_MS = 15.0
+
+
+def _generation(snapshot: ConfigSnapshot) -> dict[str, float | int]:
+    """Generation parameters of ``snapshot``, engine defaults for unset ones."""
+
+    return {
+        "temperature": inference_params.TEMPERATURE,
+        "top_p": inference_params.TOP_P,
+        "max_tokens": inference_params.MAX_TOKENS,
+        **snapshot.generation,
+    }
+
+
+def _utterance_key(
+    text: str, adapter: str, schema: VoiceSchema, generation: dict[str, float | int]
+) -> str:
+    return utterance_key(text, voice=schema.model_dump_json(), adapter=adapter, **generation)
+
+
+async def _synthesize_chunks(
+    prompt: str,
+    adapter_name: str,
+    schema: VoiceSchema,
+    *,
+    job: ScheduledJob,
+    use_batching: bool = False,
+    max_batch_chars: int = 1000,
+    session_id: str | None = None,
+    interruptible: bool = True,
+):
+    """Run one orchestrator over ``prompt`` and yield its adapter chunks.
+
+    The adapter is created only once ``job`` was granted a scheduler slot,
+    which is held until the stream ends; long prompts reach this function
+    one batch at a time (see :func:`orchestrated_pcm_stream`).  Completed
+    generations feed the rate estimate of :data:`admission`; streams closed
+    before EOS count their generation time in :data:`cancelled_work`.  Time
+    the adapter reports waiting for a model (``lease_wait_s``) is not
+    generation time.  With ``session_id`` a barge-in on that session
+    interrupts this orchestrator.  A stream that
+    is not ``interruptible`` never becomes :data:`current_orchestrator`, so
+    global barge-ins and adapter swaps leave it alone, and it raises
+    :class:`RuntimeError` if it still ends without EOS.
+    """
+
+    global current_orchestrator
+    async with job.slot():
+        adapter = adapter_registry.create(
+            adapter_name,
+            prompt=prompt,
+            voice=schema,
+            use_batching=use_batching,
+            max_batch_chars=max_batch_chars,
+        )
+        buffer = PlaybackBuffer(capacity_ms=1000)
+        orchestrator = Orchestrator(adapter, buffer, ChunkLadder(), on_record=stats_feed.record)
+        orchestrator.log_transcript(prompt)
+        if interruptible:
+            current_orchestrator = orchestrator
+            if session_id in local_sessions:
+                local_sessions[session_id] = orchestrator.signal_barge_in
+        stream = orchestrator.stream()
+        busy = audio_ms = 0.0
+        complete = False
+        start = None
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    if not complete and not interruptible:
+                        raise RuntimeError("synthesis ended before end of stream") from None
+                    break
+                # Time spent generating, not waiting for our consumer
+                busy += time.perf_counter() - start
+                start = None
+                audio_ms += chunk.duration_ms
+                if chunk.eos:
+                    complete = True
+                    busy -= getattr(adapter, "lease_wait_s", 0.0)
+                    admission.observe(audio_ms / 1000.0, busy, len(prompt))
+                yield chunk
+        finally:
+            if start is not None:  # left while a pull was pending
+                busy += time.perf_counter() - start
+            await stream.aclose()
+            # Hold the slot until a barge-in reset has stopped the model
+            await orchestrator.settle()
+            if not complete:
+                cancelled_work["streams"] += 1
+                cancelled_work["seconds"] += busy - getattr(adapter, "lease_wait_s", 0.0)
+                cancelled_work["audio_seconds"] += audio_ms / 1000.0
 
 
 async def orchestrated_pcm_stream(
@@ -131,31 +326,132 @@ async def orchestrated_pcm_stream(
     adapter_name: str | None = None,
     use_batching: bool = False,
     max_batch_chars: int = 1000,
+    priority: str = "streaming",
+    deadline_ms: float | None = None,
+    session_id: str | None = None,
+    interruptible: bool = True,
 ):
-    """Create an orchestrator-driven PCM stream."""
-
-    global current_orchestrator
-    name = adapter_name or current_adapter_name
+    """Create an orchestrator-driven PCM stream.
+
+    Completed utterances are stored in :data:`utterance_cache`; a repeated
+    request with the same text, voice, adapter and generation parameters is
+    replayed from the cache without touching the adapter.  A prompt with
+    several sentences is synthesized sentence by sentence when at least one
+    of them is cached, when it runs under the ``batch`` priority, or for
+    every prompt with ``ORPHEUS_CACHE_SENTENCES=1``: cached sentences are
+    served, only the missing ones are synthesized (at most
+    ``ORPHEUS_LOOKAHEAD`` sentences ahead of playback) and the seams are
+    crossfaded.  Otherwise a prompt longer than ``max_batch_chars`` is
+    synthesized the same way in ``batch_sentences`` batches, and a shorter
+    one is one run, which keeps prosody across sentences and pays adapter
+    startup once.  With ``use_batching`` the missing sentences or batches
+    are generated on up to all scheduler slots at once.
+
+    Synthesis is admitted by :data:`scheduler` under ``priority``
+    (``interactive``, ``streaming`` or ``batch``) with a time-to-first-audio
+    ``deadline_ms``; split prompts take one slot per sentence or batch, so
+    more urgent requests overtake them at the next boundary.  ``session_id`` names the
+    session a routed barge-in should interrupt; with ``interruptible=False``
+    no barge-in reaches the stream and synthesis ending early is an error.
+    """
+
+    snapshot = config_store.current
+    name = adapter_name or snapshot.adapter
+    generation = _generation(snapshot)
     schema = (
-        current_voice
+        snapshot.voice
         if voice is None
         else (VoiceSchema(voice=voice) if isinstance(voice, str) else voice)
     )
-    adapter = adapter_registry.create(
-        name,
-        prompt=prompt,
-        voice=schema,
-        use_batching=use_batching,
-        max_batch_chars=max_batch_chars,
+    options = {
+        "use_batching": use_batching,
+        "max_batch_chars": max_batch_chars,
+        "job": scheduler.job(priority, deadline_ms),
+        "session_id": session_id,
+        "interruptible": interruptible,
+    }
+    sentences = split_sentences(prompt, min_chars=20) or [prompt]
+    keys = [_utterance_key(sentence, name, schema, generation) for sentence in sentences]
+    split = len(sentences) > 1 and (
+        os.environ.get("ORPHEUS_CACHE_SENTENCES", "0") == "1"
+        or priority == "batch"
+        or any(key in utterance_cache for key in keys)
     )
-    buffer = PlaybackBuffer(capacity_ms=1000)
-    current_orchestrator = Orchestrator(adapter, buffer, ChunkLadder())
-    current_orchestrator.log_transcript(prompt)
+    if not split and len(prompt) > max_batch_chars:
+        # Batches re-enter the scheduler, so a long prompt never holds slots
+        # past a batch boundary while more urgent work waits
+        sentences = inference_params.batch_sentences(prompt, max_batch_chars)
+        keys = [_utterance_key(batch, name, schema, generation) for batch in sentences]
+        split = len(sentences) > 1
+    if split:
+        # Long inputs spread their sentences over all scheduler slots
+        parallel = scheduler.capacity if use_batching else 1
+        composed = compose_phrases(
+            sentences,
+            keys,
+            utterance_cache,
+            lambda sentence: _synthesize_chunks(sentence, name, schema, **options),
+            sample_rate=SAMPLE_RATE,
+            parallel=parallel,
+            lookahead=max(parallel, int(os.environ.get("ORPHEUS_LOOKAHEAD", "1"))),
+        )
+        stitched = stitch_chunks(
+            composed,
+            sample_rate=SAMPLE_RATE,
+            overlap_ms=SENTENCE_CROSSFADE_MS,
+            seam=is_sentence_start,
+            # Audio held for the crossfade must not play after a barge-in
+            drop_partial=True,
+        )
+        try:
+            async for chunk in stitched:
+                yield chunk.pcm
+        finally:
+            await stitched.aclose()
+            await composed.aclose()
+        return
+
+    key = _utterance_key(prompt, name, schema, generation)
+    cached = await utterance_cache.lookup(key)
+    if cached is not None:
+        try:
+            async for pcm in cached:
+                yield pcm
+        finally:
+            await cached.aclose()
+        return
     stitched = stitch_chunks(
-        current_orchestrator.stream(), sample_rate=SAMPLE_RATE
+        _synthesize_chunks(prompt, name, schema, **options), sample_rate=SAMPLE_RATE
     )
+    parts: list[bytes] = []
+    complete = False
     async for chunk in stitched:
+        parts.append(chunk.pcm)
+        complete = chunk.eos
         yield chunk.pcm
+    # A barge-in ends the stream without an EOS chunk; never cache partials
+    if complete:
+        await utterance_cache.store(key, b"".join(parts))
+
+
+def _batch_sentence(text: str, item: BatchItem):
+    params = dict(item.params)
+    adapter_name = params.pop("adapter", None)
+    voice = VoiceSchema(voice=item.voice, **params) if item.voice or params else None
+    # Barge-ins target live speech; a cut sentence must not land in a WAV
+    return orchestrated_pcm_stream(
+        prompt=text, voice=voice, adapter_name=adapter_name, priority="batch", interruptible=False
+    )
+
+
+# Offline JSONL jobs; one sentence per scheduler slot at a time
+batch_jobs = BatchManager(
+    os.environ.get("ORPHEUS_BATCH_DIR") or Path("outputs") / "batch",
+    _batch_sentence,
+    concurrency=lambda: scheduler.capacity,
+    sample_rate=SAMPLE_RATE,
+    crossfade_ms=SENTENCE_CROSSFADE_MS,
+)
 
 
 class SpeechRequest(BaseModel):
@@ -164,10 +460,225 @@ class SpeechRequest(BaseModel):
     voice: str = DEFAULT_VOICE
     response_format: str = "wav"
     speed: float = 1.0
+    priority: str = "streaming"
+    deadline_ms: float | None = None
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """Streaming response that closes its body however the response ends.
+
+    When the client disconnects Starlette stops iterating but leaves the
+    body generator suspended; closing it runs the ``finally`` blocks down to
+    the adapter, which stops generation and frees its model lease.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
+
+@contextmanager
+def _owned_session(session_id: str, interrupt: Callable[[], None] | None = None):
+    """Own ``session_id`` on this worker while the block runs.
+
+    ``interrupt`` handles barge-ins on the session; without it the session's
+    current orchestrator is interrupted.  In multi-worker mode the session is
+    also claimed in the shared registry so other workers route to us.
+    """
+
+    local_sessions[session_id] = interrupt or (lambda: None)
+    if cluster is not None:
+        cluster.claim(session_id)
+    try:
+        yield
+    finally:
+        local_sessions.pop(session_id, None)
+        if cluster is not None:
+            cluster.release(session_id)
+
+
+class IngestStreamingResponse(ClosingStreamingResponse):
+    """Streaming response whose request body is still being read.
+
+    Starlette listens for the client disconnect by calling ``receive`` while
+    the response streams, which would swallow body chunks; the listener is
+    held back until ``body_read`` is set.
+    """
+
+    def __init__(self, content, body_read: asyncio.Event, **kwargs: Any) -> None:
+        super().__init__(content, **kwargs)
+        self.body_read = body_read
+
+    async def __call__(self, scope, receive, send) -> None:
+        async def receive_after_body():
+            await self.body_read.wait()
+            return await receive()
+
+        await super().__call__(scope, receive_after_body, send)
+
+
+# Text without a sentence boundary is cut after this many characters
+INGEST_MAX_CHARS = int(os.environ.get("ORPHEUS_INGEST_MAX_CHARS", "1000"))
+
+
+async def _body_sentences(request: Request, encoding: str, body_read: asyncio.Event):
+    """Decode the request body as it arrives and yield closed sentences.
+
+    Text without a boundary is cut at a word break after
+    :data:`INGEST_MAX_CHARS`, so memory stays bounded by one network chunk
+    plus one sentence.
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    segmenter = SentenceSegmenter(min_chars=20, max_chars=INGEST_MAX_CHARS)
+    try:
+        async for data in request.stream():
+            for sentence in segmenter.feed(decoder.decode(data)):
+                yield sentence
+    except ClientDisconnect:
+        return
+    finally:
+        body_read.set()
+    for sentence in segmenter.feed(decoder.decode(b"", final=True)) + segmenter.flush():
+        yield sentence
+
+
+async def _ingested_pcm(
+    sentences,
+    first: str,
+    *,
+    session_id: str,
+    ticket: Ticket | None = None,
+    **options: Any,
+):
+    """Synthesize ``sentences`` in order while more text is still uploading.
+
+    Sentences go through a :class:`LookaheadPipeline` (``ORPHEUS_LOOKAHEAD``
+    ahead) and the audio through a small bounded queue, so neither reading
+    nor synthesis runs far ahead of what the client has received.  A
+    barge-in on ``session_id`` ends the whole stream.  With ``ticket``
+    (admitted for ``first``) every further sentence is admitted on it before
+    synthesis; if one is refused the audio admitted so far is sent and
+    :class:`Overloaded` is raised.
+    """
+
+    stopped = asyncio.Event()
+    deadline_s = _deadline_s(options.get("priority", "streaming"), options.get("deadline_ms"))
+
+    async def texts():
+        yield first
+        async for sentence in sentences:
+            if stopped.is_set():
+                return
+            if ticket is not None:
+                await admission.admit(sentence, deadline_s, ticket)
+            yield sentence
+
+    pipeline = LookaheadPipeline(
+        lambda text: orchestrated_pcm_stream(prompt=text, **options),
+        depth=int(os.environ.get("ORPHEUS_LOOKAHEAD", "1")),
+    )
+    pcm_queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+    failure: list[BaseException] = []
+
+    async def run() -> None:
+        try:
+            await pipeline.run(texts(), sink=pcm_queue.put)
+        except Exception as exc:
+            failure.append(exc)
+        await pcm_queue.put(None)
+
+    def interrupt() -> None:
+        stopped.set()
+        pipeline.barge_in()
+        while not pcm_queue.empty():
+            pcm_queue.get_nowait()
+        pcm_queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    try:
+        with _owned_session(session_id, interrupt):
+            while (pcm := await pcm_queue.get()) is not None:
+                yield pcm
+        if failure:
+            raise failure[0]
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await sentences.aclose()
+
+
+async def _ingest_speech(request: Request, encoding: str) -> StreamingResponse:
+    """Speech for a ``text/plain`` body read incrementally.
+
+    Options come from the query string (``voice``, ``priority``,
+    ``deadline_ms``).  Admission and synthesis start with the first complete
+    sentence while the rest of the body is still being uploaded; later
+    sentences are admitted one by one as they arrive.
+    """
+
+    params = request.query_params
+    priority = params.get("priority") or "streaming"
+    if priority not in PRIORITY_CLASSES:
+        raise HTTPException(status_code=400, detail=f"Unknown priority {priority!r}")
+    try:
+        deadline_ms = float(params["deadline_ms"]) if params.get("deadline_ms") else None
+        codecs.lookup(encoding)
+    except (ValueError, LookupError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    body_read = asyncio.Event()
+    sentences = _body_sentences(request, encoding, body_read)
+    first = await anext(sentences, None)
+    if first is None:
+        raise HTTPException(status_code=400, detail="Missing input text")
+    ticket = None
+    if priority != "batch":
+        try:
+            ticket = await admission.admit(first, _deadline_s(priority, deadline_ms))
+        except Overloaded as exc:
+            await sentences.aclose()
+            return _overloaded_response(exc)
+
+    session_id = request.headers.get("x-session-id") or uuid.uuid4().hex
+    pcm_stream = _ingested_pcm(
+        sentences,
+        first,
+        session_id=session_id,
+        ticket=ticket,
+        voice=params.get("voice") or DEFAULT_VOICE,
+        priority=priority,
+        deadline_ms=deadline_ms,
+    )
+    return IngestStreamingResponse(
+        wav_streamer(_admitted(pcm_stream, ticket), sample_rate=SAMPLE_RATE),
+        body_read,
+        media_type="audio/wav",
+        headers={"X-Session-Id": session_id},
+        background=BackgroundTask(ticket.release) if ticket else None,
+    )
 
 
 async def create_speech_api(request: Request) -> StreamingResponse:
-    """Generate speech from text via orchestrator."""
+    """Generate speech from text via orchestrator.
+
+    The session id is taken from the ``X-Session-Id`` request header or
+    generated, and returned in the same response header; ``POST
+    /barge-in?session=<id>`` interrupts it on whichever worker serves it.
+    A ``text/plain`` body is streamed sentence by sentence instead of being
+    read in full first; see :func:`_ingest_speech`.
+    """
+
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip().lower() == "text/plain":
+        charset = "utf-8"
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "charset" and value:
+                charset = value.strip('"')
+        return await _ingest_speech(request, charset)
 
     try:
         payload = SpeechRequest(**await request.json())
@@ -176,20 +687,113 @@ async def create_speech_api(request: Request) -> StreamingResponse:
 
     if not payload.input:
         raise HTTPException(status_code=400, detail="Missing input text")
+    if payload.priority not in PRIORITY_CLASSES:
+        raise HTTPException(status_code=400, detail=f"Unknown priority {payload.priority!r}")
 
+    # Long inputs are generated as parallel batches on several slots
     use_batching = len(payload.input) > 1000
+    ticket = None
+    if payload.priority != "batch":
+        try:
+            ticket = await admission.admit(
+                payload.input,
+                _deadline_s(payload.priority, payload.deadline_ms),
+                batched=use_batching,
+            )
+        except Overloaded as exc:
+            return _overloaded_response(exc)
+
+    session_id = request.headers.get("x-session-id") or uuid.uuid4().hex
     pcm_stream = orchestrated_pcm_stream(
         prompt=payload.input,
         voice=payload.voice,
         use_batching=use_batching,
         max_batch_chars=1000,
+        priority=payload.priority,
+        deadline_ms=payload.deadline_ms,
+        session_id=session_id,
     )
-    return StreamingResponse(
-        wav_streamer(pcm_stream, sample_rate=SAMPLE_RATE),
+    return ClosingStreamingResponse(
+        wav_streamer(_admitted(pcm_stream, ticket, session_id), sample_rate=SAMPLE_RATE),
         media_type="audio/wav",
+        headers={"X-Session-Id": session_id},
+        background=BackgroundTask(ticket.release) if ticket else None,
     )
 
 
+def _deadline_s(priority: str, deadline_ms: float | None) -> float:
+    """Seconds a request of ``priority`` may wait for audio, for admission."""
+
+    if deadline_ms is None:
+        deadline_ms = scheduler.deadlines_ms[priority]
+    return deadline_ms / 1000.0
+
+
+def _overloaded_response(exc: Overloaded) -> JSONResponse:
+    return JSONResponse(
+        {"detail": "Server at capacity", "admission": exc.decision},
+        status_code=503,
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
+async def _admitted(pcm_stream, ticket: Ticket | None, session_id: str | None = None):
+    """Yield from ``pcm_stream`` and release ``ticket`` when it ends.
+
+    ``session_id`` is owned by this worker for as long as the stream runs.
+    """
+
+    try:
+        with _owned_session(session_id) if session_id else nullcontext():
+            async for pcm in pcm_stream:
+                yield pcm
+    finally:
+        if ticket is not None:
+            ticket.release()
+        await pcm_stream.aclose()
+
+
+async def create_batch(request: Request) -> JSONResponse:
+    """Accept a JSONL manifest and start an offline batch job."""
+
+    try:
+        items = parse_manifest((await request.body()).decode("utf-8"))
+    except (ManifestError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    for item in items:
+        adapter_name = item.params.get("adapter")
+        if adapter_name is not None and adapter_name not in adapter_registry._registry:
+            raise HTTPException(status_code=400, detail=f"Unknown adapter {adapter_name!r}")
+    job = batch_jobs.submit(items)
+    return JSONResponse(
+        {"id": job.id, "status_url": f"/v1/audio/batch/{job.id}", "total": len(items)},
+        status_code=202,
+    )
+
+
+def _batch_job(request: Request):
+    job = batch_jobs.get(request.path_params["job_id"])
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown batch job")
+    return job
+
+
+async def batch_status(request: Request) -> JSONResponse:
+    """Return progress, throughput and ETA of a batch job."""
+
+    return JSONResponse(_batch_job(request).status())
+
+
+async def batch_item(request: Request) -> FileResponse:
+    """Download the finalized WAV file of one batch item."""
+
+    job = _batch_job(request)
+    item_id = request.path_params["item_id"]
+    if item_id not in {item.id for item in job.items} or not job.wav_path(item_id).is_file():
+        raise HTTPException(status_code=404, detail="Item not synthesized")
+    return FileResponse(job.wav_path(item_id), media_type="audio/wav")
+
+
 async def list_voices(request: Request) -> JSONResponse:  # pragma: no cover - simple
     """Return available voices and languages."""
 
@@ -207,19 +811,136 @@ async def list_voices(request: Request) -> JSONResponse:  # pragma: no cover - s
 
 
 async def tts_ws(websocket: WebSocket) -> None:
-    """Stream synthesized audio over WebSocket."""
+    """Stream synthesized audio over WebSocket.
+
+    With a ``prompt`` query parameter the whole prompt is synthesized and
+    the socket closes afterwards.  Without one the socket runs a
+    :class:`SpeechSession`: the client streams text deltas and control
+    messages and receives audio per sentence as soon as it is closed.
+    Both are scheduled in the ``interactive`` class and subject to
+    :data:`admission`, the prompt as a whole and a session sentence by
+    sentence; when overloaded the server sends
+    ``{"type": "overloaded", "retry_after": seconds}`` and closes with 1013.
+    A ``session`` query parameter names the session for routed barge-ins.
+
+    A prompt stream opened with a ``session`` is resumable: generation
+    continues into a spill buffer when the socket drops, and reconnecting
+    with ``session`` and the byte ``offset`` received so far (RIFF header
+    included) continues from there.  Unknown or expired sessions, and a
+    ``session`` that is already streaming, get ``{"type": "error"}`` and
+    close 1008; if generation fails the reader gets ``{"type": "error"}``
+    after the audio produced so far and the socket closes with 1011.
+    """
 
     await websocket.accept()
+    voice = websocket.query_params.get("voice")
+    prompt = websocket.query_params.get("prompt") or ""
+    requested_session = websocket.query_params.get("session")
+    session_id = requested_session or uuid.uuid4().hex
+    if (offset := websocket.query_params.get("offset")) is not None:
+        await _resume(websocket, requested_session, offset)
+        return
+    resumable = bool(requested_session) and resumable_streams.enabled
+    if prompt and resumable and session_id in resumable_streams.streams:
+        await _reject_session(websocket, "session already streaming")
+        return
+    synthesize = functools.partial(orchestrated_pcm_stream, priority="interactive")
+    if not prompt:
+        session = SpeechSession(
+            websocket,
+            synthesize,
+            header=riff_header(SAMPLE_RATE),
+            voice=voice,
+            admit=functools.partial(
+                admission.admit, deadline_s=_deadline_s("interactive", None)
+            ),
+        )
+        with _owned_session(session_id, session.barge_in):
+            await session.run()
+        return
     try:
-        prompt = websocket.query_params.get("prompt") or ""
-        if not prompt:
-            await websocket.close(code=1008)
+        ticket = await admission.admit(prompt, _deadline_s("interactive", None))
+    except Overloaded as exc:
+        await websocket.send_json({"type": "overloaded", "retry_after": math.ceil(exc.retry_after)})
+        await websocket.close(code=1013)
+        return
+    pcm_stream = _admitted(
+        synthesize(prompt=prompt, voice=voice, session_id=session_id), ticket, session_id
+    )
+    if resumable:
+        try:
+            stream = resumable_streams.open(
+                session_id, pcm_stream, header=riff_header(SAMPLE_RATE)
+            )
+        except KeyError:  # opened by another socket meanwhile
+            await pcm_stream.aclose()
+            ticket.release()
+            await _reject_session(websocket, "session already streaming")
             return
-        voice = websocket.query_params.get("voice")
-        pcm_stream = orchestrated_pcm_stream(prompt=prompt, voice=voice)
-        await websocket_pcm_stream(websocket, pcm_stream, sample_rate=SAMPLE_RATE)
+        await _send_resumable(websocket, stream, 0)
+        return
+    try:
+        await _until_disconnect(
+            websocket, websocket_pcm_stream(websocket, pcm_stream, sample_rate=SAMPLE_RATE)
+        )
     except WebSocketDisconnect:  # pragma: no cover - network race
         pass
+    finally:
+        await pcm_stream.aclose()
+        ticket.release()
+
+
+async def _resume(websocket: WebSocket, session_id: str | None, offset: str) -> None:
+    stream = None
+    if session_id and offset.isdigit():
+        stream = resumable_streams.resume(session_id, int(offset))
+    if stream is None:
+        await _reject_session(websocket, "unknown or expired session")
+        return
+    await _send_resumable(websocket, stream, int(offset))
+
+
+async def _reject_session(websocket: WebSocket, detail: str) -> None:
+    await websocket.send_json({"type": "error", "detail": detail})
+    await websocket.close(code=1008)
+
+
+async def _send_resumable(websocket: WebSocket, stream: ResumableStream, offset: int) -> None:
+    async def send() -> None:
+        async with aclosing(stream.read(offset)) as data:
+            async for pcm in data:
+                await websocket.send_bytes(pcm)
+
+    try:
+        await _until_disconnect(websocket, send())
+    except WebSocketDisconnect:  # pragma: no cover - network race
+        pass
+    except StreamFailed as exc:
+        await websocket.send_json({"type": "error", "detail": f"synthesis failed: {exc}"})
+        await websocket.close(code=1011)
+
+
+async def _until_disconnect(websocket: WebSocket, coro) -> None:
+    """Run ``coro`` but cancel it as soon as the client disconnects.
+
+    Prompt mode receives nothing from the client, so without listening a
+    disconnect would only surface at the next send.
+    """
+
+    async def listen() -> None:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    work = asyncio.ensure_future(coro)
+    listener = asyncio.ensure_future(listen())
+    try:
+        await asyncio.wait({work, listener}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (work, listener):
+            task.cancel()
+        await asyncio.gather(work, listener, return_exceptions=True)
+    if not work.cancelled() and work.exception() is not None:
+        raise work.exception()
 
 
 async def get_adapters(request: Request) -> JSONResponse:
@@ -235,22 +956,27 @@ async def get_sources(request: Request) -> JSONResponse:
 
 
 async def get_config(request: Request) -> JSONResponse:
-    """Return current configuration from environment and `.env`."""
+    """Return the current configuration snapshot."""
 
-    return JSONResponse(get_current_config())
+    snapshot = config_store.current
+    return JSONResponse(
+        dict(snapshot.values),
+        headers={"X-Config-Version": str(snapshot.version)},
+    )
 
 
 async def update_config(request: Request) -> JSONResponse:
-    """Update configuration and persist changes to `.env`."""
+    """Publish a new configuration snapshot and persist it in the background.
 
-    global current_adapter_name, current_voice
+    In-flight sessions keep the snapshot they started with, generation
+    parameters included; only an adapter swap interrupts the active stream.
+    """
 
     try:
         data = await request.json()
     except Exception as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    gen_updates: dict[str, float | int] = {}
     if (temp := data.get("ORPHEUS_TEMPERATURE")) is not None:
         try:
             temp_val = float(temp)
@@ -259,7 +985,6 @@ async def update_config(request: Request) -> JSONResponse:
         if not 0.1 <= temp_val <= 1.5:
             raise HTTPException(status_code=400, detail="ORPHEUS_TEMPERATURE out of range")
         data["ORPHEUS_TEMPERATURE"] = temp_val
-        gen_updates["temperature"] = temp_val
 
     if (top_p := data.get("ORPHEUS_TOP_P")) is not None:
         try:
@@ -269,7 +994,6 @@ async def update_config(request: Request) -> JSONResponse:
         if not 0.0 < top_p_val <= 1.0:
             raise HTTPException(status_code=400, detail="ORPHEUS_TOP_P out of range")
         data["ORPHEUS_TOP_P"] = top_p_val
-        gen_updates["top_p"] = top_p_val
 
     if (mt := data.get("ORPHEUS_MAX_TOKENS")) is not None:
         try:
@@ -279,21 +1003,22 @@ async def update_config(request: Request) -> JSONResponse:
         if not 1 <= mt_val <= 200000:
             raise HTTPException(status_code=400, detail="ORPHEUS_MAX_TOKENS out of range")
         data["ORPHEUS_MAX_TOKENS"] = mt_val
-        gen_updates["max_tokens"] = mt_val
 
+    previous = config_store.current
+    fields: dict[str, Any] = {}
     adapter = data.get("adapter")
     if adapter:
         available = adapter_registry.available()
         if adapter not in available:
             raise HTTPException(status_code=404, detail="Unknown adapter")
-        current_adapter_name = adapter
+        fields["adapter"] = adapter
 
     voice = data.get("voice")
     if voice:
         if isinstance(voice, dict):
-            current_voice = VoiceSchema(**voice)
+            fields["voice"] = VoiceSchema(**voice)
         else:
-            current_voice = VoiceSchema(voice=voice)
+            fields["voice"] = VoiceSchema(voice=voice)
 
     source = data.get("source")
     source_cfg = data.get("source_config", {})
@@ -305,31 +1030,29 @@ async def update_config(request: Request) -> JSONResponse:
     elif source_cfg and current_source_name:
         await init_source(current_source_name, **source_cfg)
 
-    if current_orchestrator:
-        current_orchestrator.signal_barge_in()
-
-    env_cfg = get_current_config()
     persist = {k: v for k, v in data.items() if k != "source_config"}
     if voice:
-        persist["voice"] = current_voice.voice
-    env_cfg.update({k: str(v) if not isinstance(v, str) else v for k, v in persist.items()})
-    save_config(env_cfg)
-
-    for key in ("ORPHEUS_TEMPERATURE", "ORPHEUS_TOP_P", "ORPHEUS_MAX_TOKENS"):
-        if key in data:
-            os.environ[key] = str(data[key])
+        persist["voice"] = fields["voice"].voice
+    snapshot = await config_store.publish(
+        {k: str(v) if not isinstance(v, str) else v for k, v in persist.items()},
+        **fields,
+    )
 
-    if gen_updates:
-        inference_params.update_generation_params(**gen_updates)
+    if snapshot.adapter != previous.adapter:
+        if cluster is not None:
+            await cluster.barge_in()
+        elif current_orchestrator:
+            current_orchestrator.signal_barge_in()
 
-    resp = {"message": "ok"}
+    env_cfg = snapshot.values
+    resp: dict[str, Any] = {"message": "ok", "version": snapshot.version}
     if "adapter" in env_cfg:
         resp["adapter"] = env_cfg["adapter"]
     if "voice" in env_cfg:
-        resp["voice"] = current_voice.model_dump()
+        resp["voice"] = snapshot.voice.model_dump()
     if "source" in env_cfg:
         resp["source"] = env_cfg["source"]
-    return JSONResponse(resp)
+    return JSONResponse(resp, background=BackgroundTask(config_store.persist))
 
 
 async def stats(request: Request) -> JSONResponse:
@@ -341,22 +1064,147 @@ async def stats(request: Request) -> JSONResponse:
     else:
         timeline = current_orchestrator.timeline
         transcripts = current_orchestrator.transcripts
-    return JSONResponse({"timeline": timeline, "transcripts": transcripts})
+    body: dict[str, Any] = {"timeline": timeline, "transcripts": transcripts}
+    source_metrics = getattr(current_source, "metrics", None)
+    if source_metrics is not None:
+        body["source"] = {"name": current_source_name, **source_metrics}
+        if current_pipeline is not None:
+            body["source"]["lookahead"] = current_pipeline.metrics
+    body["cache"] = utterance_cache.stats()
+    body["model_pool"] = llama_local.model_pool.metrics
+    body["scheduler"] = scheduler.metrics
+    body["admission"] = admission.metrics
+    body["cancelled"] = dict(cancelled_work)
+    body["broadcast"] = broadcast_hub.metrics
+    body["stats_feed"] = stats_feed.metrics
+    body["resume"] = resumable_streams.metrics
+    if cluster is not None:
+        await cluster.refresh()
+        body["cluster"] = cluster.metrics
+    return JSONResponse(body)
+
+
+async def stats_ws(websocket: WebSocket) -> None:
+    """Push aggregated stats frames to a dashboard.
+
+    Frames are published every ``ORPHEUS_STATS_INTERVAL_MS``; a client may
+    ask for fewer with ``interval_ms``, in which case intermediate frames
+    are coalesced into the latest one.
+    """
+
+    try:
+        min_interval_s = float(websocket.query_params.get("interval_ms") or 0) / 1000.0
+    except ValueError:
+        min_interval_s = -1.0
+    await websocket.accept()
+    if min_interval_s < 0:
+        await websocket.close(code=1008)
+        return
+    subscription = stats_feed.subscribe(min_interval_s)
+
+    async def push() -> None:
+        async for frame in subscription:
+            await websocket.send_text(frame)
+
+    try:
+        await _until_disconnect(websocket, push())
+    except WebSocketDisconnect:  # pragma: no cover - network race
+        pass
+    finally:
+        subscription.close()
+
+
+def _subscribe(lag: str | None):
+    if (lag or "skip") not in LAG_POLICIES:
+        raise HTTPException(status_code=400, detail=f"lag must be one of {LAG_POLICIES}")
+    return broadcast_hub.subscribe(lag or "skip")
+
+
+async def _listen(subscription):
+    try:
+        async for pcm in subscription:
+            yield pcm
+    except SubscriberDropped:
+        pass
+    finally:
+        subscription.close()
 
 
-async def barge_in(request: Request) -> JSONResponse:  # pragma: no cover - simple
+async def live_audio(request: Request) -> StreamingResponse:
+    """Stream the text-source broadcast as chunked WAV."""
+
+    subscription = _subscribe(request.query_params.get("lag"))
+    return ClosingStreamingResponse(
+        wav_streamer(_listen(subscription), sample_rate=SAMPLE_RATE), media_type="audio/wav"
+    )
+
+
+async def listen_ws(websocket: WebSocket) -> None:
+    """Stream the text-source broadcast over a WebSocket.
+
+    ``lag=drop`` closes the socket with 1008 once the listener falls
+    behind the broadcast ring; the default skips it ahead instead.
+    """
+
+    lag = websocket.query_params.get("lag") or "skip"
+    await websocket.accept()
+    if lag not in LAG_POLICIES:
+        await websocket.close(code=1008)
+        return
+    subscription = broadcast_hub.subscribe(lag)
+    try:
+        await _until_disconnect(
+            websocket, websocket_pcm_stream(websocket, subscription, sample_rate=SAMPLE_RATE)
+        )
+    except SubscriberDropped:
+        await websocket.close(code=1008)
+    except WebSocketDisconnect:  # pragma: no cover - network race
+        pass
+    finally:
+        subscription.close()
+
+
+def _signal_barge_in(session_id: str | None = None) -> bool:
+    """Interrupt ``session_id`` on this worker, or whatever is speaking.
+
+    Returns whether there was anything to interrupt.
+    """
+
+    if session_id is not None:
+        interrupt = local_sessions.get(session_id)
+        if interrupt is None:
+            return False
+        interrupt()
+        return True
     if current_orchestrator:
         current_orchestrator.signal_barge_in()
+    if current_pipeline:
+        current_pipeline.barge_in()
+    return bool(current_orchestrator or current_pipeline)
+
+
+async def _route_barge_in(session_id: str | None = None) -> bool:
+    if cluster is not None:
+        return await cluster.barge_in(session_id)
+    return _signal_barge_in(session_id)
+
+
+async def barge_in(request: Request) -> JSONResponse:
+    """Interrupt speech; ``?session=<id>`` targets one session on any worker."""
+
+    session_id = request.query_params.get("session")
+    if not await _route_barge_in(session_id) and session_id is not None:
+        raise HTTPException(status_code=404, detail="Unknown session")
     return JSONResponse({"status": "ok"})
 
 
 async def barge_in_ws(websocket: WebSocket) -> None:
     await websocket.accept()
+    session_id = websocket.query_params.get("session")
     try:
         while True:
             await websocket.receive_text()
-            if current_orchestrator:
-                current_orchestrator.signal_barge_in()
+            if await _route_barge_in(session_id):
                 await websocket.send_text("ok")
     except WebSocketDisconnect:  # pragma: no cover - network race
         pass
@@ -365,10 +1213,16 @@ async def barge_in_ws(websocket: WebSocket) -> None:
 routes = [
     Route("/v1/audio/speech", create_speech_api, methods=["POST"]),
     Route("/v1/audio/voices", list_voices, methods=["GET"]),
+    Route("/v1/audio/batch", create_batch, methods=["POST"]),
+    Route("/v1/audio/batch/{job_id}", batch_status, methods=["GET"]),
+    Route("/v1/audio/batch/{job_id}/items/{item_id}", batch_item, methods=["GET"]),
     WebSocketRoute("/ws/tts", tts_ws),
+    Route("/v1/audio/live", live_audio, methods=["GET"]),
+    WebSocketRoute("/ws/listen", listen_ws),
     Route("/adapters", get_adapters, methods=["GET"]),
     Route("/sources", get_sources, methods=["GET"]),
     Route("/stats", stats, methods=["GET"]),
+    WebSocketRoute("/ws/stats", stats_ws),
     Route("/config", get_config, methods=["GET"]),
     Route("/config", update_config, methods=["POST"]),
     Route("/barge-in", barge_in, methods=["POST"]),
@@ -381,13 +1235,62 @@ routes = [
 ]
 
 
-app = Starlette(routes=routes)
-
-
-def start_server(host: str = "0.0.0.0", port: int = 5005) -> None:
-    """Start the Morpheus client API and admin server using uvicorn."""
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    """Resume unfinished batch jobs on start; pause them on shutdown.
+
+    With ``ORPHEUS_BROADCAST_FILE`` set the broadcast is also recorded to
+    that WAV file.  With ``ORPHEUS_CLUSTER_DIR`` set this worker joins the
+    cluster so barge-ins for its sessions are routed to it, and polls the
+    shared config every ``ORPHEUS_CONFIG_POLL_MS``.
+    """
+
+    global cluster
+    config_watch = None
+    if CLUSTER_DIR:
+        cluster = Cluster(CLUSTER_DIR, _signal_barge_in)
+        await cluster.start()
+        poll_s = float(os.environ.get("ORPHEUS_CONFIG_POLL_MS", "500")) / 1000.0
+        config_watch = asyncio.create_task(config_store.watch(poll_s))
+    batch_jobs.resume()
+    recorder = None
+    if path := os.environ.get("ORPHEUS_BROADCAST_FILE"):
+        recorder = asyncio.create_task(record(broadcast_hub.subscribe(), path, SAMPLE_RATE))
+    yield
+    if recorder is not None:
+        recorder.cancel()
+        await asyncio.gather(recorder, return_exceptions=True)
+    await batch_jobs.close()
+    await resumable_streams.close()
+    await utterance_cache.flush()
+    if config_watch is not None:
+        config_watch.cancel()
+        await asyncio.gather(config_watch, return_exceptions=True)
+    if cluster is not None:
+        await cluster.stop()
+        cluster = None
+
+
+app = Starlette(routes=routes, lifespan=lifespan)
+
+
+def start_server(host: str = "0.0.0.0", port: int = 5005, workers: int | None = None) -> None:
+    """Start the Morpheus client API and admin server using uvicorn.
+
+    With more than one worker (``workers`` or ``ORPHEUS_HTTP_WORKERS``) each
+    worker process shares configuration and session routing through
+    ``ORPHEUS_CLUSTER_DIR``, which defaults to a per-port temp directory.
+    """
 
     import uvicorn
 
-    uvicorn.run(app, host=host, port=port)
+    workers = workers or int(os.environ.get("ORPHEUS_HTTP_WORKERS", "1"))
+    if workers <= 1:
+        uvicorn.run(app, host=host, port=port)
+        return
+    # Workers import the app afresh and read both settings at import time
+    os.environ["ORPHEUS_HTTP_WORKERS"] = str(workers)
+    if not os.environ.get("ORPHEUS_CLUSTER_DIR"):
+        os.environ["ORPHEUS_CLUSTER_DIR"] = str(Path(tempfile.gettempdir()) / f"morpheus-{port}")
+    uvicorn.run("Morpheus_Client.server:app", host=host, port=port, workers=workers)
 
@@ -0,0 +1,224 @@
+"""Bidirectional text-in/audio-out WebSocket sessions.
+
+A :class:`SpeechSession` lets a client stream text deltas (for example an
+LLM reply as it is generated) over the ``/ws/tts`` socket and receive audio
+for each sentence as soon as that sentence is closed.
+
+Client → server messages are JSON objects in text frames; a non-JSON text
+frame is treated as a ``text`` delta and a binary frame is answered with
+``error``:
+
+``{"type": "text", "text": "..."}``
+    Append a text delta.
+``{"type": "flush"}``
+    Synthesize pending text even without a closing punctuation mark.
+``{"type": "voice", "voice": "leo"}``
+    Use ``voice`` for sentences closed after this message.
+``{"type": "barge_in"}``
+    Stop the current sentence and drop queued ones.
+``{"type": "end"}``
+    Flush, finish queued audio and close the socket.
+
+Server → client: one RIFF header (binary) when the session opens, PCM frames
+(binary) and JSON events ``sentence``/``done`` per sentence, ``barge_in``
+acknowledgements, ``error`` for malformed messages and ``end`` before close.
+If synthesis fails the session sends ``error`` and closes with 1011; if a
+sentence is not admitted it sends ``{"type": "overloaded", "retry_after":
+seconds}`` and closes with 1013.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from contextlib import suppress
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from text_sources.segmenter import SentenceSegmenter
+
+from .orchestrator.admission import Overloaded, Ticket
+
+_END = object()
+
+
+class SpeechSession:
+    """Drive one streaming conversation over an accepted WebSocket.
+
+    Parameters
+    ----------
+    websocket:
+        Accepted Starlette WebSocket.
+    synthesize:
+        ``synthesize(prompt=..., voice=...)`` returning an async iterator of
+        PCM bytes, normally :func:`Morpheus_Client.server.orchestrated_pcm_stream`.
+    header:
+        Bytes sent once before any audio (the streaming RIFF header).
+    voice:
+        Initial voice; ``None`` uses the configured default.
+    admit:
+        ``admit(sentence)`` returning a :class:`Ticket` that is released
+        once the sentence was spoken, or raising :class:`Overloaded`;
+        normally :meth:`AdmissionController.admit`.  ``None`` admits all.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        synthesize: Callable[..., AsyncIterator[bytes]],
+        *,
+        header: bytes = b"",
+        voice: str | None = None,
+        admit: Callable[[str], Awaitable[Ticket]] | None = None,
+    ) -> None:
+        self.websocket = websocket
+        self.synthesize = synthesize
+        self.admit = admit
+        self.header = header
+        self.voice = voice
+        self.segmenter = SentenceSegmenter()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._send_lock = asyncio.Lock()
+        self._speaking: asyncio.Task | None = None
+        self._index = 0
+
+    async def _send_json(self, payload: dict[str, Any]) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(payload))
+
+    async def _send_bytes(self, data: bytes) -> None:
+        async with self._send_lock:
+            await self.websocket.send_bytes(data)
+
+    def _enqueue(self, sentences: list[str]) -> None:
+        for sentence in sentences:
+            self._queue.put_nowait((self._index, sentence, self.voice))
+            self._index += 1
+
+    def barge_in(self) -> None:
+        """Stop the current sentence and drop queued ones.
+
+        Same as a ``barge_in`` message, for barge-ins arriving elsewhere.
+        """
+
+        self._barge_in()
+
+    def _barge_in(self) -> None:
+        self.segmenter.flush()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        if self._speaking is not None:
+            self._speaking.cancel()
+
+    async def _speak(self, index: int, sentence: str, voice: str | None) -> None:
+        ticket = await self.admit(sentence) if self.admit is not None else None
+        try:
+            await self._send_json({"type": "sentence", "index": index, "text": sentence})
+            stream = self.synthesize(prompt=sentence, voice=voice)
+            try:
+                async for pcm in stream:
+                    if pcm:
+                        await self._send_bytes(pcm)
+            finally:
+                await stream.aclose()
+        finally:
+            if ticket is not None:
+                ticket.release()
+        await self._send_json({"type": "done", "index": index})
+
+    async def _speaker(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is _END:
+                return
+            task = self._speaking = asyncio.create_task(self._speak(*item))
+            try:
+                # ``wait`` lets a barge-in cancel ``task`` without cancelling us
+                await asyncio.wait({task})
+            finally:
+                self._speaking = None
+                task.cancel()
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    async def _handle(self, raw: str) -> bool:
+        """Apply one client message; return ``False`` once the client ends."""
+
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            message = {"type": "text", "text": raw}
+
+        kind = message.get("type")
+        if kind == "text":
+            self._enqueue(self.segmenter.feed(str(message.get("text", ""))))
+        elif kind == "flush":
+            self._enqueue(self.segmenter.flush())
+        elif kind == "voice":
+            self.voice = message.get("voice") or None
+        elif kind == "barge_in":
+            self._barge_in()
+            await self._send_json({"type": "barge_in"})
+        elif kind == "end":
+            self._enqueue(self.segmenter.flush())
+            return False
+        else:
+            await self._send_json({"type": "error", "detail": f"unknown type {kind!r}"})
+        return True
+
+    async def _receive(self) -> None:
+        """Handle client frames until the client sends ``end``."""
+
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            text = message.get("text")
+            if text is None:
+                await self._send_json({"type": "error", "detail": "binary frames are not accepted"})
+            elif not await self._handle(text):
+                return
+
+    async def run(self) -> None:
+        """Serve the session until the client ends it or disconnects.
+
+        The speaker is watched while client frames are awaited, so a failed
+        synthesis (1011) or a refused sentence (1013) closes the socket
+        instead of going unnoticed.
+        """
+
+        if self.header:
+            await self._send_bytes(self.header)
+        speaker = asyncio.create_task(self._speaker())
+        receiver = asyncio.create_task(self._receive())
+        try:
+            await asyncio.wait({speaker, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if not receiver.done():
+                await speaker  # the speaker only stops early by failing
+            await receiver
+            self._queue.put_nowait(_END)
+            await speaker
+            await self._send_json({"type": "end"})
+            await self.websocket.close()
+        except WebSocketDisconnect:
+            pass
+        except Overloaded as exc:
+            with suppress(WebSocketDisconnect, RuntimeError):
+                await self._send_json(
+                    {"type": "overloaded", "retry_after": math.ceil(exc.retry_after)}
+                )
+                await self.websocket.close(code=1013)
+        except Exception as exc:
+            with suppress(WebSocketDisconnect, RuntimeError):
+                await self._send_json({"type": "error", "detail": f"synthesis failed: {exc}"})
+                await self.websocket.close(code=1011)
+        finally:
+            for task in (speaker, receiver):
+                task.cancel()
+            await asyncio.gather(speaker, receiver, return_exceptions=True)
+
+
+__all__ = ["SpeechSession"]
@@ -0,0 +1,215 @@
+"""Push-based live statistics for dashboards.
+
+``/stats`` serializes the whole timeline and transcript history on every
+request, so a dashboard polling it costs a full snapshot per client per
+poll.  :class:`StatsFeed` instead aggregates on the server: orchestrator
+events are folded into bounded per-stage windows as they are recorded, and
+while anyone is subscribed a single ticker builds one frame per interval
+holding only the events since the previous frame, rolling percentiles for
+the stages that changed and a few gauges.  The frame is serialized once and
+the same string is handed to every subscriber.
+
+Each subscriber only ever holds the latest frame.  A client that is slower
+than the tick rate, or asked for a longer interval, gets the newest frame
+when it is ready and the frames in between are coalesced away; the gap is
+visible through ``seq``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List
+
+PERCENTILES = (50, 95, 99)
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    out: Dict[str, float] = {}
+    for p in PERCENTILES:
+        rank = max(1, math.ceil(p / 100.0 * len(ordered)))
+        out[f"p{p}"] = round(ordered[rank - 1], 3)
+    out["count"] = len(ordered)
+    return out
+
+
+class StatsSubscription:
+    """One dashboard's view of a :class:`StatsFeed`.
+
+    Iterate it to receive serialized frames, at most one per
+    ``min_interval_s``; frames published in between are coalesced.
+    """
+
+    def __init__(self, feed: "StatsFeed", min_interval_s: float) -> None:
+        self.feed = feed
+        self.min_interval_s = min_interval_s
+        self.seq = 0
+        self.coalesced = 0
+        self.closed = False
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        try:
+            while not self.closed:
+                if self.feed.seq <= self.seq:
+                    await self.feed._wait()
+                    continue
+                if self.seq and self.feed.seq > self.seq + 1:
+                    self.coalesced += self.feed.seq - self.seq - 1
+                    self.feed._counters["coalesced_frames"] += self.feed.seq - self.seq - 1
+                self.seq = self.feed.seq
+                sent = time.monotonic()
+                yield self.feed.frame
+                if self.min_interval_s > self.feed.interval_s:
+                    await asyncio.sleep(self.min_interval_s - (time.monotonic() - sent))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.feed._unsubscribe(self)
+
+
+class StatsFeed:
+    """Aggregate timeline events and publish coalesced frames on a timer.
+
+    Parameters
+    ----------
+    gauges:
+        Callable returning a JSON-serializable dict of current gauges; it is
+        called once per tick, not once per subscriber.
+    interval_s:
+        Tick period.  Nothing runs while there are no subscribers.
+    window:
+        Number of recent durations kept per stage for the percentiles.
+    max_pending:
+        Events buffered between two ticks; older ones are counted and
+        dropped so a burst cannot grow a frame without bound.
+    """
+
+    def __init__(
+        self,
+        gauges: Callable[[], Dict[str, Any]] | None = None,
+        *,
+        interval_s: float = 0.5,
+        window: int = 512,
+        max_pending: int = 256,
+    ) -> None:
+        self.gauges = gauges or dict
+        self.interval_s = max(0.01, interval_s)
+        self.window = window
+        self.seq = 0
+        self.frame = ""
+        self._pending: Deque[dict] = deque(maxlen=max_pending)
+        self._durations: Dict[str, Deque[float]] = {}
+        self._percentiles: Dict[str, Dict[str, float]] = {}
+        self._dirty: set[str] = set()
+        self._last_gauges: Dict[str, Any] | None = None
+        self._subscribers: set[StatsSubscription] = set()
+        self._ticker: asyncio.Task | None = None
+        self._published: asyncio.Future | None = None
+        self._counters: Dict[str, int] = {
+            "events": 0,
+            "dropped_events": 0,
+            "frames": 0,
+            "coalesced_frames": 0,
+        }
+
+    def record(self, event: dict) -> None:
+        """Fold one timeline event into the aggregates; O(1)."""
+
+        stage = event.get("stage", "")
+        durations = self._durations.get(stage)
+        if durations is None:
+            durations = self._durations[stage] = deque(maxlen=self.window)
+        durations.append(float(event.get("duration_ms", 0.0)))
+        self._dirty.add(stage)
+        if len(self._pending) == self._pending.maxlen:
+            self._counters["dropped_events"] += 1
+        self._pending.append({**event, "ts": round(time.time(), 3)})
+        self._counters["events"] += 1
+
+    def subscribe(self, min_interval_s: float = 0.0) -> StatsSubscription:
+        """Return a subscription, starting the ticker if it is the first.
+
+        A frame is published right away so the new dashboard does not wait
+        a whole interval for its first gauges and percentiles.
+        """
+
+        subscription = StatsSubscription(self, min_interval_s)
+        self._subscribers.add(subscription)
+        if self._ticker is None or self._ticker.done():
+            self.publish()
+            self._ticker = asyncio.create_task(self._tick())
+        else:
+            subscription.seq = self.seq - 1
+        return subscription
+
+    def publish(self) -> bool:
+        """Build, serialize and publish one frame.
+
+        Returns ``False`` without publishing when nothing changed since the
+        previous frame, so an idle server sends nothing.
+        """
+
+        gauges = self.gauges()
+        if not self._pending and not self._dirty and gauges == self._last_gauges and self.seq:
+            return False
+        for stage in self._dirty:
+            self._percentiles[stage] = _percentiles(list(self._durations[stage]))
+        self._dirty.clear()
+        self._last_gauges = gauges
+        self.seq += 1
+        self.frame = json.dumps(
+            {
+                "type": "stats",
+                "seq": self.seq,
+                "interval_ms": self.interval_s * 1000.0,
+                "events": list(self._pending),
+                "percentiles": self._percentiles,
+                "gauges": gauges,
+            },
+            default=str,
+        )
+        self._pending.clear()
+        self._counters["frames"] += 1
+        if self._published is not None and not self._published.done():
+            self._published.set_result(None)
+        self._published = None
+        return True
+
+    async def _tick(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.interval_s)
+            if self._subscribers:
+                self.publish()
+
+    async def _wait(self) -> None:
+        if self._published is None:
+            self._published = asyncio.get_running_loop().create_future()
+        await asyncio.shield(self._published)
+
+    def _unsubscribe(self, subscription: StatsSubscription) -> None:
+        self._subscribers.discard(subscription)
+        if not self._subscribers and self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Event and frame counters plus the subscriber count."""
+
+        return {
+            **self._counters,
+            "interval_ms": self.interval_s * 1000.0,
+            "subscribers": len(self._subscribers),
+        }
+
+
+__all__ = ["PERCENTILES", "StatsFeed", "StatsSubscription"]
@@ -6,8 +6,9 @@ Each adapter provides a :func:`describe` method to advertise its
 capabilities and a voice mapping function that projects the abstract
 voice schema into backend specific parameters.  The registry exposes a
 simple factory for constructing adapters by name.  The bundled registry
-ships with a single entry: ``llama_cpp`` which uses the in-process
-``llama_cpp`` engine for synthesis.
+ships with ``llama_cpp``, which uses the in-process ``llama_cpp`` engine
+for synthesis, and ``workers``, which runs the same engine in separate
+synthesis processes (see :mod:`Morpheus_Client.workers`).
 """
 
 from dataclasses import dataclass
@@ -15,6 +16,7 @@ from typing import Any, Callable, Dict, Type
 
 from pydantic import BaseModel
 
+from ..workers import ProcessAdapter
 from .adapter import TTSAdapter as LlamaAdapter
 from .inference import AVAILABLE_VOICES, DEFAULT_VOICE
 
@@ -60,6 +62,12 @@ def _llama_describe() -> Dict[str, Any]:
     }
 
 
+def _workers_describe() -> Dict[str, Any]:
+    """Return capability descriptor for the out-of-process adapter."""
+
+    return {**_llama_describe(), "name": "workers", "transport": "shared_memory"}
+
+
 @dataclass
 class _AdapterSpec:
     constructor: Type
@@ -98,10 +106,13 @@ class AdapterRegistry:
         return spec.constructor(prompt=prompt, **params)
 
 
-# Global registry instance pre-populated with the default llama_cpp adapter
+# Global registry instance pre-populated with the bundled adapters
 registry = AdapterRegistry()
 registry.register(
     "llama_cpp", LlamaAdapter, _llama_describe, _llama_voice_mapper
 )
+registry.register(
+    "workers", ProcessAdapter, _workers_describe, _llama_voice_mapper
+)
 
 __all__ = ["VoiceSchema", "AdapterRegistry", "registry"]
@@ -213,14 +213,16 @@ def format_prompt(prompt: str, voice: str = DEFAULT_VOICE) -> str:
         print(f"Warning: Voice '{voice}' not recognized. Using '{DEFAULT_VOICE}' instead.")
         voice = DEFAULT_VOICE
         
+    special_end = "<|eot_id|>"   # Using the eos_token from config
+
+    return f"{prompt_prefix(voice)}{prompt}{special_end}"
+
+
+def prompt_prefix(voice: str = DEFAULT_VOICE) -> str:
+    """Return the fixed part of a formatted prompt preceding the user text."""
     # Format similar to how engine_class.py does it with special tokens
-    formatted_prompt = f"{voice}: {prompt}"
-    
-    # Add special token markers for the Orpheus-FASTAPI
     special_start = "<|audio|>"  # Using the additional_special_token from config
-    special_end = "<|eot_id|>"   # Using the eos_token from config
-    
-    return f"{special_start}{formatted_prompt}{special_end}"
+    return f"{special_start}{voice}: "
 
 
 def stream_audio(audio_buffer):
@@ -291,6 +293,25 @@ def split_text_into_sentences(text):
     
     return combined_sentences
 
+def batch_sentences(text, max_batch_chars=1000):
+    """Group the sentences of ``text`` into batches of at most ``max_batch_chars``.
+
+    A single sentence longer than the limit forms its own batch.
+    """
+    batches = []
+    current_batch = ""
+    for sentence in split_text_into_sentences(text):
+        if len(current_batch) + len(sentence) > max_batch_chars and current_batch:
+            batches.append(current_batch)
+            current_batch = sentence
+        else:
+            if current_batch:
+                current_batch += " "
+            current_batch += sentence
+    if current_batch:
+        batches.append(current_batch)
+    return batches
+
 def stitch_wav_files(input_files, output_file, crossfade_ms=50):
     """Stitch multiple WAV files together with crossfading for smooth transitions."""
     if not input_files:
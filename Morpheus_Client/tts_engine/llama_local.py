@@ -1,9 +1,16 @@
 """Llama.cpp TTS adapter for local PCM streaming.
 
-Audio is generated using a locally loaded :class:`llama_cpp.Llama` model.  The
-model is cached at module scope so subsequent calls reuse the same
-instance.  The underlying generator may yield PCM segments of arbitrary
-size, so we maintain an internal buffer and slice the data to honour the
+Audio is generated using locally loaded :class:`llama_cpp.Llama` models.
+Instances live in a module-level :class:`ModelPool`; each generation leases
+one exclusively, so concurrent requests never share an evaluation context,
+and the weights are memory-mapped so all instances share one copy.  Model
+state after the fixed voice prefix of the prompt is
+snapshotted per voice (see :class:`VoiceStateCache`) so each request only
+evaluates its own text.  With ``use_batching`` a prompt longer than
+``max_batch_chars`` is split into sentence batches that are generated
+concurrently on separate pooled instances and reassembled in order.  The
+underlying generator may yield PCM segments of arbitrary
+size, so we queue them in a :class:`PCMQueue` and slice the data to honour the
 ``chunk_size`` requested by the orchestrator.  ``chunk_size`` is the
 maximum number of PCM bytes that a returned
 :class:`~Morpheus_Client.orchestrator.adapter.AudioChunk` may contain.
@@ -14,30 +21,144 @@ bounded chunk sizes.
 from __future__ import annotations
 
 import asyncio
-from functools import lru_cache
-from typing import AsyncGenerator, Optional, TYPE_CHECKING
+from collections import OrderedDict, deque
+from contextlib import aclosing, asynccontextmanager, suppress
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Tuple, TYPE_CHECKING
 import os
+import threading
+import time
+import weakref
 
 from ..orchestrator.adapter import (
     AudioChunk,
     TTSAdapter as TTSAdapterProtocol,
 )
+from ..orchestrator.chunk_queue import PCMQueue
 
 from .inference import (
     SAMPLE_RATE,
     DEFAULT_VOICE,
+    batch_sentences,
+    prompt_prefix,
 )
+from .model_pool import ModelPool, default_pool_size
 
 if TYPE_CHECKING:  # pragma: no cover - used only for type hints
     from llama_cpp import Llama
 
 
-_model_lock = asyncio.Lock()
+_STATE_METHODS = ("tokenize", "eval", "reset", "save_state", "load_state")
+_DONE = object()
+
+
+class VoiceStateCache:
+    """Bounded LRU of llama_cpp states taken right after a voice prefix.
+
+    Every prompt starts with ``<|audio|>{voice}:``.  The first request for a
+    voice evaluates that prefix once and stores ``Llama.save_state()``;
+    later requests ``load_state()`` it instead.  ``Llama.generate`` reuses
+    the KV cache for the longest token prefix shared by the loaded state and
+    the new prompt, so only the user text is evaluated.  States are keyed by
+    a token bound to the model object rather than its ``id()``, so a newly
+    loaded model never picks up another's states; they are dropped by
+    :meth:`forget` when the pool discards the model, or once it is collected.
+    Models lacking the state API are left untouched.
+    """
+
+    def __init__(self, maxsize: int = 8) -> None:
+        self.maxsize = maxsize
+        self._states: "OrderedDict[Tuple[object, str], Any]" = OrderedDict()
+        self._tokens: "weakref.WeakKeyDictionary[Any, object]" = weakref.WeakKeyDictionary()
+        # Tokens of collected models; finalizers may run anywhere, even
+        # while the lock is held, so they only append here
+        self._collected: deque = deque()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._reap()
+            return len(self._states)
+
+    def invalidate(self) -> None:
+        """Forget every snapshot."""
+
+        with self._lock:
+            self._states.clear()
+
+    def forget(self, model: "Llama") -> None:
+        """Forget the snapshots of ``model``, e.g. when it is unloaded."""
+
+        with self._lock:
+            token = self._tokens.pop(model, None)
+            if token is not None:
+                self._collected.append(token)
+            self._reap()
+
+    def _reap(self) -> None:
+        dead = set()
+        while self._collected:
+            dead.add(self._collected.popleft())
+        if dead:
+            for key in [key for key in self._states if key[0] in dead]:
+                del self._states[key]
+
+    def _token(self, model: "Llama") -> object:
+        token = self._tokens.get(model)
+        if token is None:
+            token = self._tokens[model] = object()
+            weakref.finalize(model, self._collected.append, token)
+        return token
+
+    def prime(self, model: "Llama", voice: str) -> bool:
+        """Bring ``model`` to the state after ``voice``'s prompt prefix.
+
+        Returns ``False`` when the cache is disabled or ``model`` does not
+        support state snapshots.  Runs model code, so call it off the event
+        loop.
+        """
+
+        if self.maxsize <= 0 or not all(hasattr(model, m) for m in _STATE_METHODS):
+            return False
+        with self._lock:
+            self._reap()
+            key = (self._token(model), voice)
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+                self.hits += 1
+        if state is not None:
+            model.load_state(state)
+            return True
+        # The trailing space would merge with the first word when the full
+        # prompt is tokenized, so stop the snapshot before it.
+        prefix = prompt_prefix(voice).rstrip().encode("utf-8")
+        model.reset()
+        model.eval(model.tokenize(prefix, add_bos=True, special=True))
+        state = model.save_state()
+        with self._lock:
+            self.misses += 1
+            if self._tokens.get(model) is not key[0]:
+                return True  # forgotten meanwhile
+            self._states[key] = state
+            while len(self._states) > self.maxsize:
+                self._states.popitem(last=False)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
+
+
+voice_states = VoiceStateCache(int(os.environ.get("LLAMA_VOICE_STATE_CACHE", "8")))
 
 
-@lru_cache(maxsize=1)
 def _load_model_sync() -> "Llama":
-    """Load and cache the underlying :class:`llama_cpp.Llama` model."""
+    """Load one :class:`llama_cpp.Llama` instance from the environment.
+
+    ``use_mmap`` keeps the weights in the page cache so every pooled
+    instance maps the same file instead of holding a private copy.
+    """
 
     from llama_cpp import Llama
 
@@ -49,46 +170,242 @@ def _load_model_sync() -> "Llama":
         model_path=model_path,
         n_ctx=n_ctx,
         n_gpu_layers=n_gpu_layers,
+        use_mmap=True,
     )
 
 
-async def _load_model() -> "Llama":
-    """Thread-safe coroutine returning the cached :class:`llama_cpp.Llama` instance."""
+def _pool_size() -> int:
+    size = int(os.environ.get("LLAMA_POOL_SIZE", "0"))
+    if size > 0:
+        return size
+    instance_mb = float(os.environ.get("LLAMA_INSTANCE_MB", "1024"))
+    return default_pool_size(int(instance_mb * 1024 * 1024))
+
+
+_pool_timeout = float(os.environ.get("LLAMA_POOL_TIMEOUT", "0"))
+model_pool: ModelPool["Llama"] = ModelPool(
+    _load_model_sync,
+    _pool_size(),
+    acquire_timeout=_pool_timeout or None,
+    on_discard=voice_states.forget,
+)
+
+
+# Pieces a generation thread may run ahead of its consumer
+STREAM_QUEUE_SIZE = int(os.environ.get("LLAMA_STREAM_QUEUE", "8"))
 
-    async with _model_lock:
-        return _load_model_sync()
+
+def _pcm_bytes(result: Any) -> bytes:
+    if isinstance(result, tuple) and len(result) == 2:
+        _sr, chunk = result
+        return bytes(chunk.tobytes() if hasattr(chunk, "tobytes") else chunk)
+    return bytes(result)
 
 
 async def _stream_from_model(
     model: "Llama",
     prompt: str,
     voice: str,
-    *_: object,
 ) -> AsyncGenerator[bytes, None]:
     """Asynchronously stream PCM chunks from ``model``.
 
-    The underlying ``Llama.text_to_speech`` method is synchronous.  We
-    execute each ``next`` call in a thread via :func:`asyncio.to_thread` to avoid
-    blocking the event loop.  The iterator is expected to yield either raw
-    PCM ``bytes`` or ``(sample_rate, chunk)`` tuples where ``chunk`` exposes
-    a ``tobytes`` method.
+    The underlying ``Llama.text_to_speech`` method is synchronous.  A
+    dedicated thread primes the model with the cached voice-prefix state
+    from :data:`voice_states`, iterates the generator and hands each piece
+    to the event loop; it blocks once :data:`STREAM_QUEUE_SIZE` pieces are
+    waiting, so a slow consumer throttles generation.  The iterator is
+    expected to yield either raw PCM ``bytes`` or ``(sample_rate, chunk)``
+    tuples where ``chunk`` exposes a ``tobytes`` method; ``None`` ends it.
+
+    When the consumer stops early the thread closes the generator at its
+    next piece.  This coroutine only returns once the thread has finished,
+    so the model is never released to another lease while still in use.
+    """
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(STREAM_QUEUE_SIZE)
+    stop = threading.Event()
+    finished = loop.create_future()
+
+    def send(item: Any) -> None:
+        with suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def produce() -> None:
+        try:
+            voice_states.prime(model, voice)
+            gen = model.text_to_speech(prompt, voice=voice)
+            try:
+                for result in gen:
+                    if result is None:
+                        break
+                    data = _pcm_bytes(result)
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    send(data)
+            finally:
+                close = getattr(gen, "close", None)
+                if close is not None:
+                    close()
+        except BaseException as exc:  # surfaced to the consumer
+            send(exc)
+        finally:
+            send(_DONE)
+            with suppress(RuntimeError):
+                loop.call_soon_threadsafe(
+                    lambda: finished.done() or finished.set_result(None)
+                )
+
+    thread = threading.Thread(target=produce, name=f"llama-tts-{voice}", daemon=True)
+    thread.start()
+    try:
+        while (item := await queue.get()) is not _DONE:
+            if isinstance(item, BaseException):
+                raise item
+            slots.release()
+            yield item
+    finally:
+        stop.set()
+        cancelled = False
+        while not finished.done():
+            try:
+                await asyncio.shield(finished)
+            except asyncio.CancelledError:
+                cancelled = True
+        if cancelled:
+            raise asyncio.CancelledError
+
+
+class _LeaseClock:
+    """Leases :data:`model_pool` models for one stream and times the waits.
+
+    ``wait_s`` is the wall time during which the stream waited for a model
+    while holding none, so nothing was generated for it; a batch waiting
+    while an earlier one generates does not count.
+    """
+
+    def __init__(self) -> None:
+        self.wait_s = 0.0
+        self._waiting = 0
+        self._held = 0
+        self._idle_since: float | None = None
+
+    def _shift(self, waiting: int, held: int) -> None:
+        now = time.monotonic()
+        if self._idle_since is not None:
+            self.wait_s += now - self._idle_since
+        self._waiting += waiting
+        self._held += held
+        self._idle_since = now if self._waiting and not self._held else None
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["Llama"]:
+        granted = False
+        self._shift(1, 0)
+        try:
+            async with model_pool.lease() as model:
+                granted = True
+                self._shift(-1, 1)
+                try:
+                    yield model
+                finally:
+                    self._shift(0, -1)
+        finally:
+            if not granted:
+                self._shift(-1, 0)
+
+
+async def _stream_leased(
+    prompt: str, voice: str, clock: _LeaseClock
+) -> AsyncGenerator[bytes, None]:
+    """Stream from a pooled model held for the whole generation.
+
+    The model stream is closed inside the lease, so the generation thread
+    has stopped before the model returns to the pool.
+    """
+
+    async with clock.lease() as model:
+        async with aclosing(_stream_from_model(model, prompt, voice)) as stream:
+            async for pcm in stream:
+                yield pcm
+
+
+async def _stream_batches(
+    batches: List[str], voice: str, window: int, clock: _LeaseClock
+) -> AsyncGenerator[bytes, None]:
+    """Generate ``batches`` concurrently and yield their PCM in order.
+
+    Each batch leases its own pooled model, so up to ``model_pool.size``
+    batches run at once; the pool queues the rest in submission order.
+    Audio of later batches waits in per-batch queues (the reorder buffer)
+    until every earlier batch was emitted.  At most ``window`` batches are
+    started ahead of the one being emitted, which bounds that buffer.
     """
 
-    gen = model.text_to_speech(prompt, voice=voice)
-    while True:
-        result = await asyncio.to_thread(lambda: next(gen, None))
-        if result is None:
-            break
-        if isinstance(result, tuple) and len(result) == 2:
-            _sr, chunk = result
-            data = chunk.tobytes() if hasattr(chunk, "tobytes") else chunk
-        else:
-            data = result
-        yield bytes(data)
+    queues: List[asyncio.Queue] = [asyncio.Queue() for _ in batches]
+    tasks: Dict[int, asyncio.Task] = {}
+
+    async def produce(index: int) -> None:
+        try:
+            async with aclosing(_stream_leased(batches[index], voice, clock)) as stream:
+                async for pcm in stream:
+                    queues[index].put_nowait(pcm)
+        finally:
+            queues[index].put_nowait(_DONE)
+
+    def start(index: int) -> None:
+        if index < len(batches):
+            tasks[index] = asyncio.create_task(produce(index))
+
+    try:
+        for index in range(min(window, len(batches))):
+            start(index)
+        for index, queue in enumerate(queues):
+            while (pcm := await queue.get()) is not _DONE:
+                yield pcm
+            await tasks.pop(index)  # re-raise a failed generation
+            start(index + window)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+def _stream_text(
+    prompt: str,
+    voice: str,
+    use_batching: bool,
+    max_batch_chars: int,
+    max_parallel: Optional[int] = None,
+    clock: Optional[_LeaseClock] = None,
+) -> AsyncGenerator[bytes, None]:
+    """Stream ``prompt``, split into concurrently generated batches if enabled.
+
+    ``max_parallel`` caps the batches in flight, and so the models leased at
+    once; by default up to twice the pool size are started ahead.  Leases
+    are timed by ``clock``.
+    """
+
+    clock = clock or _LeaseClock()
+
+    if use_batching and len(prompt) > max_batch_chars:
+        batches = batch_sentences(prompt, max_batch_chars)
+        if len(batches) > 1:
+            window = max_parallel or 2 * model_pool.size
+            return _stream_batches(batches, voice, window=window, clock=clock)
+    return _stream_leased(prompt, voice, clock)
 
 
 class TTSAdapter(TTSAdapterProtocol):
-    """Concrete adapter that streams PCM audio from a local Llama.cpp model."""
+    """Concrete adapter that streams PCM audio from a local Llama.cpp model.
+
+    ``lease_wait_s`` is the time its pulls spent waiting for a pooled model
+    rather than generating.
+    """
 
     def __init__(
         self,
@@ -97,24 +414,31 @@ class TTSAdapter(TTSAdapterProtocol):
         *,
         use_batching: bool = False,
         max_batch_chars: int = 1000,
+        max_parallel: Optional[int] = None,
     ) -> None:
         self.prompt = prompt
         self.voice = voice
         self.use_batching = use_batching
         self.max_batch_chars = max_batch_chars
+        self.max_parallel = max_parallel
         self._gen: Optional[AsyncGenerator[bytes, None]] = None
-        self._buffer = bytearray()
+        self._buffer = PCMQueue()
         self._exhausted = False
+        self._clock = _LeaseClock()
+
+    @property
+    def lease_wait_s(self) -> float:
+        return self._clock.wait_s
 
     async def _ensure_gen(self) -> None:
         if self._gen is None and not self._exhausted:
-            model = await _load_model()
-            self._gen = _stream_from_model(
-                model,
+            self._gen = _stream_text(
                 self.prompt,
                 self.voice,
                 self.use_batching,
                 self.max_batch_chars,
+                self.max_parallel,
+                self._clock,
             )
 
     async def pull(self, chunk_size: int) -> AudioChunk:
@@ -135,7 +459,7 @@ class TTSAdapter(TTSAdapterProtocol):
         while len(self._buffer) < target_bytes and not self._exhausted:
             assert self._gen is not None
             try:
-                self._buffer.extend(await self._gen.__anext__())
+                self._buffer.append(await self._gen.__anext__())
             except StopAsyncIteration:
                 self._exhausted = True
                 break
@@ -143,8 +467,7 @@ class TTSAdapter(TTSAdapterProtocol):
         if not self._buffer and self._exhausted:
             return AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
 
-        pcm = bytes(self._buffer[:target_bytes])
-        del self._buffer[:target_bytes]
+        pcm = self._buffer.take(target_bytes)
         duration_ms = len(pcm) / 2 / SAMPLE_RATE * 1000.0
         eos = self._exhausted and len(self._buffer) == 0
         return AudioChunk(pcm=pcm, duration_ms=duration_ms, eos=eos)
@@ -152,10 +475,12 @@ class TTSAdapter(TTSAdapterProtocol):
     async def reset(self) -> None:
         """Reset internal generator after a barge-in event."""
 
+        if self._gen is not None:
+            await self._gen.aclose()  # returns the model lease
         self._gen = None
         self._buffer.clear()
         self._exhausted = False
 
 
-__all__ = ["TTSAdapter"]
+__all__ = ["TTSAdapter", "VoiceStateCache", "model_pool", "voice_states"]
 
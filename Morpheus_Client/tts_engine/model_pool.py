@@ -0,0 +1,221 @@
+"""Pool of model instances leased exclusively per generation.
+
+A ``llama_cpp.Llama`` object owns a single evaluation context and is not
+safe to drive from two generations at once.  :class:`ModelPool` keeps up to
+``size`` instances, created lazily through ``factory`` in a worker thread,
+and hands each one to exactly one caller at a time.  Waiters are served
+strictly first-come first-served and may give up after ``acquire_timeout``
+seconds.  Utilization and queueing statistics are exposed through
+:attr:`ModelPool.metrics`.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class PoolTimeout(TimeoutError):
+    """Raised when no instance became free within the acquire timeout."""
+
+
+def default_pool_size(instance_bytes: int, *, cores_per_instance: int = 4) -> int:
+    """Size a pool from the CPU count and the memory currently available.
+
+    ``instance_bytes`` is the private memory of one instance (context and
+    scratch buffers); weights are memory-mapped and shared between
+    instances, so they are not counted per instance.
+    """
+
+    by_cores = max(1, (os.cpu_count() or 1) // cores_per_instance)
+    try:
+        import psutil
+
+        available = psutil.virtual_memory().available
+    except Exception:  # pragma: no cover - psutil missing or unsupported
+        return by_cores
+    by_ram = max(1, available // max(1, instance_bytes))
+    return int(min(by_cores, by_ram))
+
+
+class ModelPool(Generic[T]):
+    """Fixed-size pool with exclusive leases and fair FIFO queuing.
+
+    Parameters
+    ----------
+    factory:
+        Synchronous callable creating one instance; run via
+        :func:`asyncio.to_thread` the first time each slot is needed.
+    size:
+        Maximum number of instances.
+    acquire_timeout:
+        Seconds a caller may wait for a free instance before
+        :class:`PoolTimeout` is raised.  ``None`` waits indefinitely.
+    on_close:
+        Called after :meth:`close` dropped all instances.
+    on_discard:
+        Called with every instance the pool drops, e.g. to forget
+        per-instance caches.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        size: int,
+        *,
+        acquire_timeout: float | None = None,
+        on_close: Callable[[], None] | None = None,
+        on_discard: Callable[[T], None] | None = None,
+    ) -> None:
+        self.factory = factory
+        self.size = max(1, size)
+        self.acquire_timeout = acquire_timeout
+        self.on_close = on_close
+        self.on_discard = on_discard
+        self._instances: List[T] = []
+        self._idle: List[T] = []
+        self._creating = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._growing: set = set()
+        self._lease_started: Dict[int, float] = {}
+        self._started = time.monotonic()
+        self._counters: Dict[str, float] = {
+            "leases": 0,
+            "waited": 0,
+            "timeouts": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "busy_seconds": 0.0,
+        }
+
+    @property
+    def in_use(self) -> int:
+        return len(self._lease_started)
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Counters plus current occupancy and derived utilization."""
+
+        now = time.monotonic()
+        busy = self._counters["busy_seconds"] + sum(
+            now - started for started in self._lease_started.values()
+        )
+        leases = self._counters["leases"]
+        return {
+            **self._counters,
+            "size": self.size,
+            "loaded": len(self._instances),
+            "in_use": self.in_use,
+            "waiting": sum(1 for w in self._waiters if not w.done()),
+            "mean_wait_ms": self._counters["wait_seconds"] / leases * 1000.0 if leases else 0.0,
+            "utilization": busy / (self.size * max(now - self._started, 1e-9)),
+        }
+
+    def _checkout(self, instance: T, waited: float) -> T:
+        self._lease_started[id(instance)] = time.monotonic()
+        self._counters["leases"] += 1
+        self._counters["wait_seconds"] += waited
+        self._counters["max_wait_seconds"] = max(self._counters["max_wait_seconds"], waited)
+        return instance
+
+    async def acquire(self, timeout: float | None = None) -> T:
+        """Lease an instance, waiting in FIFO order if all are busy."""
+
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        if self._idle and not self._waiters:
+            return self._checkout(self._idle.pop(), 0.0)
+        if len(self._instances) + self._creating < self.size and not self._waiters:
+            self._creating += 1
+            try:
+                instance = await asyncio.to_thread(self.factory)
+            finally:
+                self._creating -= 1
+            self._instances.append(instance)
+            return self._checkout(instance, time.monotonic() - start)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._counters["waited"] += 1
+        try:
+            instance = await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            self._counters["timeouts"] += 1
+            self._abandon(waiter)
+            raise PoolTimeout(f"no model instance free after {timeout:.1f}s") from None
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return self._checkout(instance, time.monotonic() - start)
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        with_instance = waiter.done() and not waiter.cancelled()
+        if with_instance:
+            # Handed over just as we gave up: pass it on
+            self._hand_over(waiter.result())
+        else:
+            waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _hand_over(self, instance: T) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(instance)
+                return
+        self._idle.append(instance)
+
+    def release(self, instance: T) -> None:
+        """Return a leased instance to the pool."""
+
+        started = self._lease_started.pop(id(instance), None)
+        if started is not None:
+            self._counters["busy_seconds"] += time.monotonic() - started
+        if instance in self._instances:
+            self._hand_over(instance)
+        elif self._waiters and len(self._instances) + self._creating < self.size:
+            # Dropped by ``close`` while leased: load a replacement for waiters
+            task = asyncio.get_running_loop().create_task(self._grow())
+            self._growing.add(task)
+            task.add_done_callback(self._growing.discard)
+
+    async def _grow(self) -> None:
+        self._creating += 1
+        try:
+            instance = await asyncio.to_thread(self.factory)
+        finally:
+            self._creating -= 1
+        self._instances.append(instance)
+        self._hand_over(instance)
+
+    @asynccontextmanager
+    async def lease(self, timeout: float | None = None) -> AsyncIterator[T]:
+        """Context manager leasing one instance for the enclosed block."""
+
+        instance = await self.acquire(timeout)
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+    def close(self) -> None:
+        """Drop all instances so the next lease loads fresh ones."""
+
+        dropped, self._instances = self._instances, []
+        self._idle.clear()
+        if self.on_discard is not None:
+            for instance in dropped:
+                self.on_discard(instance)
+        if self.on_close is not None:
+            self.on_close()
+
+
+__all__ = ["ModelPool", "PoolTimeout", "default_pool_size"]
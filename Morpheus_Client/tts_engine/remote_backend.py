@@ -18,7 +18,7 @@ from dotenv import load_dotenv
 from .inference import (
     PerformanceMonitor,
     format_prompt,
-    split_text_into_sentences,
+    batch_sentences,
     DEFAULT_VOICE,
     HIGH_END_GPU,
     TEMPERATURE,
@@ -27,7 +27,9 @@ from .inference import (
     REPETITION_PENALTY,
     SAMPLE_RATE,
 )
-from .speechpipe import tokens_decoder, tokens_decoder_sync
+from ..cache import UtteranceCache, pack_codes, unpack_codes, utterance_key
+from ..cache.codes import FRAME_CODES
+from .speechpipe import STREAM_RESTART, decode_codes, tokens_decoder, tokens_decoder_sync
 
 load_dotenv()
 
@@ -41,6 +43,13 @@ except (ValueError, TypeError):
 
 perf_monitor = PerformanceMonitor()
 
+# ``ORPHEUS_CACHE_MODE=codes`` stores the SNAC code stream of each prompt
+# instead of PCM; hits skip the LLM and only re-run SNAC decoding.
+CACHE_MODE = os.environ.get("ORPHEUS_CACHE_MODE", "pcm")
+code_cache = (
+    UtteranceCache.from_env(suffix=".snac", subdir="codes") if CACHE_MODE == "codes" else None
+)
+
 
 async def generate_tokens_from_api(
     prompt: str,
@@ -49,8 +58,16 @@ async def generate_tokens_from_api(
     top_p: float = TOP_P,
     max_tokens: int = MAX_TOKENS,
     repetition_penalty: float = REPETITION_PENALTY,
+    outcome: dict | None = None,
 ) -> AsyncGenerator[str, None]:
-    """Stream tokens from a remote API compatible with the OpenAI spec."""
+    """Stream tokens from a remote API compatible with the OpenAI spec.
+
+    A retry after tokens were already yielded starts generation over, which
+    is announced by yielding :data:`STREAM_RESTART` first.  When
+    ``outcome`` is a dict, ``outcome["complete"]`` is set once the server
+    ended the stream normally; failures after the last retry still end the
+    stream quietly, so callers that keep the result must check it.
+    """
 
     start_time = time.time()
     formatted_prompt = format_prompt(prompt, voice)
@@ -75,9 +92,17 @@ async def generate_tokens_from_api(
 
     retry_count = 0
     max_retries = 3
+    if outcome is None:
+        outcome = {}
+    outcome["complete"] = False
+    yielded = False
 
     async with httpx.AsyncClient() as client:
         while retry_count < max_retries:
+            if yielded:
+                # The retry generates from the first token again
+                yielded = False
+                yield STREAM_RESTART
             try:
                 async with client.stream(
                     "POST",
@@ -114,11 +139,13 @@ async def generate_tokens_from_api(
                                         token_counter += 1
                                         perf_monitor.add_tokens()
                                         if token_text:
+                                            yielded = True
                                             yield token_text
                             except json.JSONDecodeError as e:
                                 print(f"Error decoding JSON: {e}")
                                 continue
 
+                    outcome["complete"] = True
                     generation_time = time.time() - start_time
                     tokens_per_second = (
                         token_counter / generation_time if generation_time > 0 else 0
@@ -154,6 +181,58 @@ async def generate_tokens_from_api(
                     return
 
 
+async def _decode_prompt(prompt, voice, temperature, top_p, max_tokens, decoder=tokens_decoder):
+    """Yield PCM for ``prompt``, replaying cached SNAC codes when available.
+
+    Codes are only cached after the API ended the stream normally; a retry
+    that restarts generation clears those captured so far (see
+    :data:`STREAM_RESTART`), so truncated or doubled runs are never stored.
+    """
+
+    outcome: dict = {}
+
+    async def synthesize(codes=None):
+        tokens = generate_tokens_from_api(
+            prompt=prompt,
+            voice=voice,
+            temperature=temperature,
+            top_p=top_p,
+            max_tokens=max_tokens,
+            repetition_penalty=REPETITION_PENALTY,
+            outcome=outcome,
+        )
+        try:
+            async for chunk in decoder(tokens, codes):
+                yield chunk
+        finally:
+            # Closes the HTTP stream at once when the listener went away
+            await tokens.aclose()
+
+    if code_cache is None:
+        async for chunk in synthesize():
+            yield chunk
+        return
+
+    key = utterance_key(
+        prompt,
+        voice=voice,
+        adapter="remote",
+        temperature=temperature,
+        top_p=top_p,
+        max_tokens=max_tokens,
+    )
+    data = await code_cache.get(key)
+    if data is not None:
+        async for chunk in decode_codes(unpack_codes(data)):
+            yield chunk
+        return
+    codes: list[int] = []
+    async for chunk in synthesize(codes):
+        yield chunk
+    if outcome.get("complete") and len(codes) >= FRAME_CODES:
+        await code_cache.store(key, pack_codes(codes))
+
+
 async def generate_speech_from_api(
     prompt,
     voice=DEFAULT_VOICE,
@@ -181,15 +260,7 @@ async def generate_speech_from_api(
 
     async def _stream_batches(batches):
         for batch in batches:
-            token_gen = generate_tokens_from_api(
-                prompt=batch,
-                voice=voice,
-                temperature=temperature,
-                top_p=top_p,
-                max_tokens=max_tokens,
-                repetition_penalty=REPETITION_PENALTY,
-            )
-            async for chunk in tokens_decoder(token_gen):
+            async for chunk in _decode_prompt(batch, voice, temperature, top_p, max_tokens):
                 yield chunk
 
     if output_file:
@@ -199,15 +270,8 @@ async def generate_speech_from_api(
             wav_file.setnchannels(1)
             wav_file.setsampwidth(2)
             wav_file.setframerate(SAMPLE_RATE)
-            async for chunk in tokens_decoder_sync(
-                generate_tokens_from_api(
-                    prompt=prompt,
-                    voice=voice,
-                    temperature=temperature,
-                    top_p=top_p,
-                    max_tokens=max_tokens,
-                    repetition_penalty=REPETITION_PENALTY,
-                )
+            async for chunk in _decode_prompt(
+                prompt, voice, temperature, top_p, max_tokens, decoder=tokens_decoder_sync
             ):
                 if chunk:
                     wav_file.writeframes(chunk)
@@ -223,19 +287,7 @@ async def generate_speech_from_api(
         print(
             f"Using sentence-based batching for text with {len(prompt)} characters"
         )
-        sentences = split_text_into_sentences(prompt)
-        current_batch = ""
-        batches = []
-        for sentence in sentences:
-            if len(current_batch) + len(sentence) > max_batch_chars and current_batch:
-                batches.append(current_batch)
-                current_batch = sentence
-            else:
-                if current_batch:
-                    current_batch += " "
-                current_batch += sentence
-        if current_batch:
-            batches.append(current_batch)
+        batches = batch_sentences(prompt, max_batch_chars)
         print(f"Created {len(batches)} batches for processing")
 
     return _stream_batches(batches)
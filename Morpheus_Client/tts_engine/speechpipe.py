@@ -5,6 +5,7 @@ import asyncio
 import time
 import os
 import sys
+from contextlib import suppress
 
 # Helper to detect if running in Uvicorn's reloader (same as in inference.py)
 def is_reloader_process():
@@ -139,6 +140,9 @@ def convert_to_audio(multiframe, count):
 # Define the custom token prefix
 CUSTOM_TOKEN_PREFIX = "<custom_token_"
 
+# Yielded by a token stream whose generation restarted from the first token
+STREAM_RESTART = "<|stream_restart|>"
+
 # Use a single global cache for token processing
 token_id_cache = {}
 MAX_CACHE_SIZE = 10000  # Increased cache size for better performance
@@ -188,33 +192,35 @@ def turn_token_into_id(token_string, index):
     except (ValueError, IndexError):
         return None
 
-async def tokens_decoder(token_gen):
-    """Optimized token decoder with early first-chunk processing for lower latency"""
-    buffer = []
+async def _validated_codes(token_gen, codes=None):
+    """Yield validated SNAC code ids parsed from streamed token strings.
+
+    Every accepted id is also appended to ``codes`` when a list is given, so
+    callers can persist the code stream and decode it again later with
+    :func:`decode_codes` instead of re-running the LLM.  A
+    :data:`STREAM_RESTART` marker starts the frame position and ``codes``
+    over.
+    """
     count = 0
-    
-    # Track if first chunk has been processed
-    first_chunk_processed = False
-    
-    # Use different thresholds for first chunk vs. subsequent chunks
-    min_frames_first = 7  # Just one chunk (7 tokens) for first audio - ultra-low latency
-    min_frames_subsequent = 28  # Standard minimum (4 chunks of 7 tokens) after first audio
-    ideal_frames = 49  # Ideal standard frame size (7×7 window) - unchanged
-    process_every_n = 7  # Process every 7 tokens (standard for Orpheus model) - unchanged
-    
     start_time = time.time()
     token_count = 0
     last_log_time = start_time
-    
+
     async for token_sim in token_gen:
+        if token_sim == STREAM_RESTART:
+            count = 0
+            if codes is not None:
+                codes.clear()
+            continue
         token_count += 1
-        
+
         # Use the unified turn_token_into_id which already handles caching
         token = turn_token_into_id(token_sim, count)
-        
+
         if token is not None and token > 0:
-            buffer.append(token)
             count += 1
+            if codes is not None:
+                codes.append(token)
 
             # Log throughput periodically
             current_time = time.time()
@@ -226,38 +232,58 @@ async def tokens_decoder(token_gen):
                     print(f"Token processing rate: {tokens_per_sec:.1f} tokens/second")
                 last_log_time = current_time
                 token_count = 0
-            
-            # Different processing logic based on whether first chunk has been processed
-            if not first_chunk_processed:
-                # Process first chunk as soon as possible for minimal latency
-                if count >= min_frames_first:
-                    buffer_to_proc = buffer[-min_frames_first:]
-                    
-                    # Process the first chunk of audio for immediate feedback
-                    print(f"Processing first audio chunk with {len(buffer_to_proc)} tokens for low latency")
-                    audio_samples = convert_to_audio(buffer_to_proc, count)
-                    if audio_samples is not None:
-                        first_chunk_processed = True  # Mark first chunk as processed
-                        yield audio_samples
-            else:
-                # For subsequent chunks, use original processing with proper batching
-                if count % process_every_n == 0:
-                    # Use same prioritization logic as before
-                    if len(buffer) >= ideal_frames:
-                        buffer_to_proc = buffer[-ideal_frames:]
-                    elif len(buffer) >= min_frames_subsequent:
-                        buffer_to_proc = buffer[-min_frames_subsequent:]
-                    else:
-                        continue
-                    
-                    # Debug output to help diagnose issues
-                    if count % 28 == 0:
-                        print(f"Processing buffer with {len(buffer_to_proc)} tokens, total collected: {len(buffer)}")
-                    
-                    # Process the tokens
-                    audio_samples = convert_to_audio(buffer_to_proc, count)
-                    if audio_samples is not None:
-                        yield audio_samples
+
+            yield token
+
+async def code_stream_decoder(code_gen):
+    """Decode a stream of validated SNAC code ids with early first-chunk processing"""
+    buffer = []
+    count = 0
+    
+    # Track if first chunk has been processed
+    first_chunk_processed = False
+    
+    # Use different thresholds for first chunk vs. subsequent chunks
+    min_frames_first = 7  # Just one chunk (7 tokens) for first audio - ultra-low latency
+    min_frames_subsequent = 28  # Standard minimum (4 chunks of 7 tokens) after first audio
+    ideal_frames = 49  # Ideal standard frame size (7×7 window) - unchanged
+    process_every_n = 7  # Process every 7 tokens (standard for Orpheus model) - unchanged
+    
+    async for token in code_gen:
+        buffer.append(token)
+        count += 1
+
+        # Different processing logic based on whether first chunk has been processed
+        if not first_chunk_processed:
+            # Process first chunk as soon as possible for minimal latency
+            if count >= min_frames_first:
+                buffer_to_proc = buffer[-min_frames_first:]
+                
+                # Process the first chunk of audio for immediate feedback
+                print(f"Processing first audio chunk with {len(buffer_to_proc)} tokens for low latency")
+                audio_samples = convert_to_audio(buffer_to_proc, count)
+                if audio_samples is not None:
+                    first_chunk_processed = True  # Mark first chunk as processed
+                    yield audio_samples
+        else:
+            # For subsequent chunks, use original processing with proper batching
+            if count % process_every_n == 0:
+                # Use same prioritization logic as before
+                if len(buffer) >= ideal_frames:
+                    buffer_to_proc = buffer[-ideal_frames:]
+                elif len(buffer) >= min_frames_subsequent:
+                    buffer_to_proc = buffer[-min_frames_subsequent:]
+                else:
+                    continue
+                
+                # Debug output to help diagnose issues
+                if count % 28 == 0:
+                    print(f"Processing buffer with {len(buffer_to_proc)} tokens, total collected: {len(buffer)}")
+                
+                # Process the tokens
+                audio_samples = convert_to_audio(buffer_to_proc, count)
+                if audio_samples is not None:
+                    yield audio_samples
     
     # CRITICAL: End-of-generation handling - process all remaining frames
     # Process remaining complete frames (ideal size)
@@ -291,9 +317,30 @@ async def tokens_decoder(token_gen):
         audio_samples = convert_to_audio(padded_buffer, count)
         if audio_samples is not None:
             yield audio_samples
+
+async def tokens_decoder(token_gen, codes=None):
+    """Optimized token decoder with early first-chunk processing for lower latency
+
+    When ``codes`` is a list, the validated code stream is appended to it.
+    """
+    async for audio_samples in code_stream_decoder(_validated_codes(token_gen, codes)):
+        yield audio_samples
+
+async def decode_codes(codes):
+    """Re-run only SNAC decoding over a stored code stream."""
+    async def replay():
+        for code in codes:
+            yield code
+
+    async for audio_samples in code_stream_decoder(replay()):
+        yield audio_samples
 # ------------------ Synchronous Tokens Decoder Wrapper ------------------ #
-async def tokens_decoder_sync(syn_token_gen):
-    """Optimized asynchronous decoder with larger queue and parallel processing"""
+async def tokens_decoder_sync(syn_token_gen, codes=None):
+    """Optimized asynchronous decoder with larger queue and parallel processing
+
+    When the consumer stops early the producer task is cancelled and the
+    token stream closed, so remote generation does not run on unheard.
+    """
     max_queue_size = 32 if snac_device == "cuda" else 8
     audio_queue = asyncio.Queue(maxsize=max_queue_size)
 
@@ -301,7 +348,7 @@ async def tokens_decoder_sync(syn_token_gen):
         start_time = time.time()
         chunk_count = 0
         try:
-            async for audio_chunk in tokens_decoder(syn_token_gen):
+            async for audio_chunk in tokens_decoder(syn_token_gen, codes):
                 if audio_chunk:
                     await audio_queue.put(audio_chunk)
                     chunk_count += 1
@@ -312,26 +359,35 @@ async def tokens_decoder_sync(syn_token_gen):
             print(f"Error in audio producer: {e}")
             import traceback
             traceback.print_exc()
-        finally:
-            await audio_queue.put(None)
+        # Not reached when cancelled: nobody is left to read the sentinel
+        await audio_queue.put(None)
 
     producer_task = asyncio.create_task(async_producer())
 
     buffer_size = 5
     audio_buffer = []
 
-    while True:
-        audio = await audio_queue.get()
-        if audio is None:
-            break
+    try:
+        while True:
+            audio = await audio_queue.get()
+            if audio is None:
+                break
 
-        audio_buffer.append(audio)
-        if len(audio_buffer) >= buffer_size:
-            for chunk in audio_buffer:
-                yield chunk
-            audio_buffer = []
+            audio_buffer.append(audio)
+            if len(audio_buffer) >= buffer_size:
+                for chunk in audio_buffer:
+                    yield chunk
+                audio_buffer = []
 
-    for chunk in audio_buffer:
-        yield chunk
+        for chunk in audio_buffer:
+            yield chunk
 
-    await producer_task
+        await producer_task
+    finally:
+        if not producer_task.done():
+            producer_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await producer_task
+        aclose = getattr(syn_token_gen, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,446 @@
+"""Out-of-process synthesis workers with shared-memory PCM transport.
+
+LLM sampling, SNAC decoding and HTTP serving otherwise share one process
+and one GIL.  :class:`WorkerPool` starts synthesis processes (each pinned to
+its own group of cores where the platform allows) that take jobs from a
+shared :mod:`multiprocessing` queue, run a regular adapter and write its PCM
+into a per-job :class:`ShmRing` – a single-producer/single-consumer ring
+buffer in :mod:`multiprocessing.shared_memory`.  The serving process reads
+audio straight out of shared memory; nothing is pickled or sent through a
+pipe.
+
+:class:`ProcessAdapter` is the proxy the orchestrator sees: it satisfies the
+usual ``pull``/``reset`` contract and is registered as the ``workers``
+adapter.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import importlib
+import multiprocessing as mp
+import os
+import struct
+import time
+from contextlib import suppress
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence
+
+from .orchestrator.adapter import AudioChunk
+
+DEFAULT_ADAPTER = "Morpheus_Client.tts_engine.llama_local:TTSAdapter"
+
+# Header: write position, read position, producer flags, consumer flags,
+# worker pid, error length, error text.  Each side owns its own flag word,
+# so neither has to read-modify-write a value the other one writes.
+_HEADER = struct.Struct("<QQIIII")
+_FIELDS = ("<Q", "<Q", "<I", "<I", "<I", "<I")
+_OFFSETS = (0, 8, 16, 20, 24, 28)
+_WRITE, _READ, _PRODUCER, _CONSUMER, _PID, _ERROR_LEN = range(6)
+_ERROR_BYTES = 256
+_DATA_OFFSET = 320
+_EOS, _FAILED, _CANCELLED = 1, 2, 4
+
+
+class WorkerError(RuntimeError):
+    """Raised by :class:`ProcessAdapter` when the worker's adapter failed."""
+
+
+class ShmRing:
+    """SPSC byte ring buffer living in a shared memory block.
+
+    Positions are monotonically increasing byte counters, so the producer
+    only ever writes the write position and the consumer only the read
+    position.  Likewise the producer's flags (end of stream, failure) and
+    the consumer's (cancellation) live in separate words.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self.name = shm.name
+        self.capacity = shm.size - _DATA_OFFSET
+        self._buf = shm.buf
+
+    @classmethod
+    def create(cls, capacity: int) -> "ShmRing":
+        shm = shared_memory.SharedMemory(create=True, size=_DATA_OFFSET + capacity)
+        shm.buf[:_DATA_OFFSET] = bytes(_DATA_OFFSET)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ShmRing":
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 registers the block again; worker processes share
+            # the parent's resource tracker, so the creator's unlink covers it
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    def _get(self, index: int) -> int:
+        return _HEADER.unpack_from(self._buf)[index]
+
+    def _set(self, index: int, value: int) -> None:
+        struct.pack_into(_FIELDS[index], self._buf, _OFFSETS[index], value)
+
+    @property
+    def state(self) -> int:
+        return self._get(_PRODUCER) | self._get(_CONSUMER)
+
+    @property
+    def worker(self) -> int:
+        """Pid of the worker process that took the job; ``0`` while queued."""
+
+        return self._get(_PID)
+
+    @property
+    def available(self) -> int:
+        """Bytes written but not yet read."""
+
+        return self._get(_WRITE) - self._get(_READ)
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.state & _EOS)
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self.state & _CANCELLED)
+
+    @property
+    def error(self) -> Optional[str]:
+        if not self.state & _FAILED:
+            return None
+        length = self._get(_ERROR_LEN)
+        return bytes(self._buf[_HEADER.size : _HEADER.size + length]).decode("utf-8", "replace")
+
+    # -- producer side -------------------------------------------------
+    def claim(self, pid: int) -> None:
+        """Record the worker process running the job."""
+
+        self._set(_PID, pid)
+
+    def write(self, data: bytes) -> int:
+        """Copy as much of ``data`` as fits; return the number of bytes written."""
+
+        write, read = self._get(_WRITE), self._get(_READ)
+        n = min(len(data), self.capacity - (write - read))
+        if n <= 0:
+            return 0
+        start = write % self.capacity
+        first = min(n, self.capacity - start)
+        base = _DATA_OFFSET
+        self._buf[base + start : base + start + first] = data[:first]
+        if first < n:
+            self._buf[base : base + n - first] = data[first:n]
+        self._set(_WRITE, write + n)
+        return n
+
+    async def write_all(self, data: bytes, poll: float = 0.002) -> bool:
+        """Write ``data`` completely, waiting for space; ``False`` if cancelled."""
+
+        view = memoryview(data)
+        while view:
+            if self.cancelled:
+                return False
+            n = self.write(view)
+            view = view[n:]
+            if view:
+                await asyncio.sleep(poll)
+        return True
+
+    def finish(self) -> None:
+        self._set(_PRODUCER, self._get(_PRODUCER) | _EOS)
+
+    def fail(self, message: str) -> None:
+        encoded = message.encode("utf-8")[:_ERROR_BYTES]
+        self._buf[_HEADER.size : _HEADER.size + len(encoded)] = encoded
+        self._set(_ERROR_LEN, len(encoded))
+        self._set(_PRODUCER, self._get(_PRODUCER) | _FAILED | _EOS)
+
+    # -- consumer side -------------------------------------------------
+    def read(self, max_bytes: int) -> bytes:
+        """Return up to ``max_bytes`` of buffered PCM (possibly empty)."""
+
+        write, read = self._get(_WRITE), self._get(_READ)
+        n = min(max_bytes, write - read)
+        if n <= 0:
+            return b""
+        start = read % self.capacity
+        first = min(n, self.capacity - start)
+        base = _DATA_OFFSET
+        if first == n:
+            data = bytes(self._buf[base + start : base + start + n])
+        else:
+            data = bytes(self._buf[base + start : base + self.capacity]) + bytes(
+                self._buf[base : base + n - first]
+            )
+        self._set(_READ, read + n)
+        return data
+
+    def cancel(self) -> None:
+        self._set(_CONSUMER, _CANCELLED)
+
+    def close(self) -> None:
+        """Detach; the creating side also unlinks the block."""
+
+        self._buf = None  # type: ignore[assignment]
+        with suppress(BufferError):
+            self._shm.close()
+        if self._owner:
+            with suppress(FileNotFoundError):
+                self._shm.unlink()
+
+
+def _resolve(spec: str) -> Any:
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+async def _run_job(name: str, spec: str, kwargs: Dict[str, Any], chunk_bytes: int) -> None:
+    try:
+        ring = ShmRing.attach(name)
+    except FileNotFoundError:
+        return  # consumer gave up before the job started
+    ring.claim(os.getpid())
+    try:
+        adapter = _resolve(spec)(**kwargs)
+        while not ring.cancelled:
+            chunk = await adapter.pull(chunk_bytes)
+            if chunk.pcm and not await ring.write_all(chunk.pcm):
+                break
+            if chunk.eos:
+                break
+        if ring.cancelled:
+            await adapter.reset()
+        ring.finish()
+    except Exception as exc:  # reported to the consumer through the ring
+        ring.fail(f"{type(exc).__name__}: {exc}")
+    finally:
+        ring.close()
+
+
+async def _serve(jobs: Any) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        job = await loop.run_in_executor(None, jobs.get)
+        if job is None:
+            return
+        await _run_job(*job)
+
+
+def _worker_main(jobs: Any, cpus: Sequence[int]) -> None:
+    if cpus and hasattr(os, "sched_setaffinity"):
+        with suppress(OSError):
+            os.sched_setaffinity(0, cpus)
+    asyncio.run(_serve(jobs))
+
+
+def _core_groups(workers: int) -> List[List[int]]:
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - non-Linux platforms
+        return [[] for _ in range(workers)]
+    if len(cpus) < workers:
+        return [[] for _ in range(workers)]
+    size = len(cpus) // workers
+    return [cpus[i * size : (i + 1) * size] for i in range(workers)]
+
+
+class WorkerPool:
+    """Synthesis processes consuming jobs from a shared queue.
+
+    Parameters
+    ----------
+    workers:
+        Number of processes; each is pinned to ``cpu_count // workers``
+        cores when affinity is supported.
+    adapter:
+        ``"module:callable"`` building the adapter inside each worker.
+    ring_bytes:
+        Capacity of each job's shared-memory ring; a full ring pauses the
+        worker until the consumer catches up.
+    chunk_bytes:
+        Size of the pulls the worker issues to its adapter.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        adapter: str = DEFAULT_ADAPTER,
+        ring_bytes: int = 1 << 20,
+        chunk_bytes: int = 8192,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.adapter = adapter
+        self.ring_bytes = ring_bytes
+        self.chunk_bytes = chunk_bytes
+        self._ctx = mp.get_context("spawn")
+        self._jobs: Any = None
+        self._processes: List[Any] = []
+        self._counters: Dict[str, int] = {"submitted": 0}
+
+    @classmethod
+    def from_env(cls) -> "WorkerPool":
+        workers = int(os.environ.get("ORPHEUS_WORKERS", "0")) or max(1, (os.cpu_count() or 1) // 4)
+        return cls(workers, adapter=os.environ.get("ORPHEUS_WORKER_ADAPTER", DEFAULT_ADAPTER))
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        alive = sum(1 for p in self._processes if p.is_alive())
+        return {**self._counters, "workers": self.workers, "alive": alive}
+
+    def start(self) -> "WorkerPool":
+        if self._processes:
+            return self
+        self._jobs = self._ctx.Queue()
+        for cpus in _core_groups(self.workers):
+            process = self._ctx.Process(target=_worker_main, args=(self._jobs, cpus), daemon=True)
+            process.start()
+            self._processes.append(process)
+        return self
+
+    def lost(self, ring: ShmRing) -> Optional[str]:
+        """Why ``ring``'s job can no longer finish, or ``None`` if it can.
+
+        A claimed job is lost when its worker process died; a queued one
+        when no worker is left to take it.
+        """
+
+        pid = ring.worker
+        if pid:
+            for process in self._processes:
+                if process.pid == pid:
+                    if process.is_alive():
+                        return None
+                    return f"worker process {pid} exited with code {process.exitcode}"
+            return f"worker process {pid} is gone"
+        if any(process.is_alive() for process in self._processes):
+            return None
+        return "no worker process is alive"
+
+    def submit(self, **kwargs: Any) -> ShmRing:
+        """Queue a synthesis job; return the ring its PCM will arrive in."""
+
+        self.start()
+        ring = ShmRing.create(self.ring_bytes)
+        self._jobs.put((ring.name, self.adapter, kwargs, self.chunk_bytes))
+        self._counters["submitted"] += 1
+        return ring
+
+    def close(self, timeout: float = 5.0) -> None:
+        if not self._processes:
+            return
+        for _ in self._processes:
+            self._jobs.put(None)
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+        self._jobs.close()
+
+
+_pool: WorkerPool | None = None
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the process-wide pool, starting it from the environment."""
+
+    global _pool
+    if _pool is None:
+        _pool = WorkerPool.from_env().start()
+        atexit.register(_pool.close)
+    return _pool
+
+
+class ProcessAdapter:
+    """Proxy adapter streaming PCM produced by a :class:`WorkerPool`.
+
+    Keyword arguments other than ``pool``, ``sample_rate`` and
+    ``poll_interval`` are forwarded to the adapter inside the worker.  While
+    waiting for audio it checks the worker every ``liveness_interval``
+    seconds and raises :class:`WorkerError` if the job can no longer finish.
+    """
+
+    name = "workers"
+
+    def __init__(
+        self,
+        prompt: str,
+        *,
+        pool: WorkerPool | None = None,
+        sample_rate: int = 24000,
+        poll_interval: float = 0.002,
+        liveness_interval: float = 0.1,
+        **kwargs: Any,
+    ) -> None:
+        self.prompt = prompt
+        self.kwargs = kwargs
+        self.sample_rate = sample_rate
+        self.poll_interval = poll_interval
+        self.liveness_interval = liveness_interval
+        self._pool = pool
+        self._ring: ShmRing | None = None
+
+    async def pull(self, chunk_size: int) -> AudioChunk:
+        if self._pool is None:
+            self._pool = get_worker_pool()
+        if self._ring is None:
+            self._ring = self._pool.submit(prompt=self.prompt, **self.kwargs)
+        ring = self._ring
+        check_at = time.monotonic() + self.liveness_interval
+        while True:
+            finished = ring.finished
+            data = ring.read(chunk_size)
+            if data:
+                eos = finished and not ring.available and ring.error is None
+                if eos:
+                    self._close()
+                duration_ms = len(data) / 2 / self.sample_rate * 1000.0
+                return AudioChunk(pcm=data, duration_ms=duration_ms, eos=eos)
+            if finished:
+                error = ring.error
+                self._close()
+                if error is not None:
+                    raise WorkerError(error)
+                return AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+            if time.monotonic() >= check_at:
+                check_at = time.monotonic() + self.liveness_interval
+                lost = self._pool.lost(ring)
+                # The worker may have finished the job just before exiting
+                if lost is not None and not ring.finished and not ring.available:
+                    ring.cancel()
+                    self._close()
+                    raise WorkerError(lost)
+            await asyncio.sleep(self.poll_interval)
+
+    def _close(self) -> None:
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    async def reset(self) -> None:
+        """Cancel the worker job after a barge-in."""
+
+        if self._ring is not None:
+            self._ring.cancel()
+            self._close()
+
+    def __del__(self) -> None:  # pragma: no cover - best effort cleanup
+        with suppress(Exception):
+            if self._ring is not None:
+                self._ring.cancel()
+                self._close()
+
+
+__all__ = [
+    "ProcessAdapter",
+    "ShmRing",
+    "WorkerError",
+    "WorkerPool",
+    "get_worker_pool",
+]
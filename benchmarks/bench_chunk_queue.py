@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Compare adapter PCM buffering under small-chunk pulls.
+
+Feeds generator-sized segments into a buffer that is allowed to run
+``--ahead`` bytes ahead of the consumer and drains it in ``--chunk``-byte
+pulls.  The legacy ``bytearray`` copies each segment in, slices a copy out
+and deletes the prefix, which periodically compacts the backlog;
+:class:`PCMQueue` only copies the bytes it returns.  The gap widens with
+the backlog; with tiny pulls over a short backlog the per-call overhead of
+the deque can outweigh it.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from Morpheus_Client.orchestrator.chunk_queue import PCMQueue  # noqa: E402
+
+
+class BytearrayBuffer:
+    """The previous ``TTSAdapter`` buffering."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def append(self, data):
+        self._buffer.extend(data)
+
+    def take(self, n):
+        pcm = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return pcm
+
+
+def _run(buffer, segment, total, ahead, chunk):
+    produced = pulled = 0
+    start = time.perf_counter()
+    while pulled < total:
+        while produced < total and len(buffer) < ahead:
+            buffer.append(segment)
+            produced += len(segment)
+        pulled += len(buffer.take(chunk))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=600.0, help="Audio to stream")
+    parser.add_argument("--segment", type=int, default=8192, help="Generator segment bytes")
+    parser.add_argument("--chunk", type=int, default=480, help="Pull size (10 ms at 24 kHz)")
+    parser.add_argument(
+        "--ahead", type=int, nargs="+", default=[48_000, 480_000, 4_800_000],
+        help="Backlog bytes generation runs ahead",
+    )
+    args = parser.parse_args()
+
+    total = int(args.seconds * 48_000)
+    segment = bytes(args.segment)
+    print(f"{args.seconds:.0f}s of audio, {args.segment}-byte segments, {args.chunk}-byte pulls")
+    for ahead in args.ahead:
+        legacy = _run(BytearrayBuffer(), segment, total, ahead, args.chunk)
+        queued = _run(PCMQueue(), segment, total, ahead, args.chunk)
+        print(
+            f"ahead {ahead / 48_000:6.1f}s: bytearray {legacy:7.3f}s  "
+            f"PCMQueue {queued:7.3f}s  ({legacy / queued:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
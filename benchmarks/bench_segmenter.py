@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Compare sentence splitting on book-length input.
+
+Times the legacy ``inference.split_text_into_sentences`` on the complete
+text against :class:`text_sources.segmenter.SentenceSegmenter`, both on the
+complete text and fed in small deltas as an LLM would stream them.  The
+legacy function only works on complete text, so streaming with it means
+re-splitting the accumulated text after every delta; that comparison runs on
+a shorter prefix because it is quadratic.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from text_sources.segmenter import SentenceSegmenter, split_sentences  # noqa: E402
+
+PARAGRAPH = (
+    "It was the best of times, it was the worst of times. Mr. Lorry paid "
+    "3.50 francs for the coach! Was it worth it? Nobody could say, e.g. the "
+    "guard did not know... and the horses were tired.\n\n"
+)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, default=2_000_000, help="Input size")
+    parser.add_argument("--delta", type=int, default=4, help="Streaming delta size")
+    parser.add_argument(
+        "--resplit-chars", type=int, default=20_000, help="Prefix size for the re-split comparison"
+    )
+    args = parser.parse_args()
+
+    text = (PARAGRAPH * (args.chars // len(PARAGRAPH) + 1))[: args.chars]
+
+    from Morpheus_Client.tts_engine.inference import split_text_into_sentences
+
+    legacy_s, legacy = _timed(lambda: split_text_into_sentences(text))
+    whole_s, whole = _timed(lambda: split_sentences(text, min_chars=20))
+
+    def streamed(source):
+        segmenter = SentenceSegmenter(min_chars=20)
+        out = []
+        for i in range(0, len(source), args.delta):
+            out.extend(segmenter.feed(source[i : i + args.delta]))
+        out.extend(segmenter.flush())
+        return out
+
+    def resplit(source):
+        segments = []
+        for i in range(args.delta, len(source) + args.delta, args.delta):
+            segments = split_text_into_sentences(source[:i])
+        return segments
+
+    stream_s, stream = _timed(lambda: streamed(text))
+    prefix = text[: args.resplit_chars]
+    resplit_s, _ = _timed(lambda: resplit(prefix))
+    prefix_s, _ = _timed(lambda: streamed(prefix))
+
+    print(f"input: {len(text):,} chars")
+    print(f"legacy split_text_into_sentences: {legacy_s:8.3f}s  {len(legacy):,} segments")
+    print(f"SentenceSegmenter (whole text):   {whole_s:8.3f}s  {len(whole):,} segments")
+    print(
+        f"SentenceSegmenter ({args.delta}-char deltas): {stream_s:8.3f}s  {len(stream):,} segments"
+    )
+    print(f"streaming {len(prefix):,} chars in {args.delta}-char deltas:")
+    print(f"  legacy re-split per delta: {resplit_s:8.3f}s")
+    print(f"  SentenceSegmenter:         {prefix_s:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Measure synthesis throughput against the number of worker processes.
+
+Runs a CPU-bound stand-in adapter (a pure-Python loop per chunk, holding the
+GIL like token sampling does) through :class:`Morpheus_Client.workers.WorkerPool`
+with 1..N workers and reports aggregate audio seconds produced per wall
+second.  With one core per worker the rate should grow near-linearly until
+workers outnumber cores.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from Morpheus_Client.orchestrator.adapter import AudioChunk  # noqa: E402
+from Morpheus_Client.workers import ProcessAdapter, WorkerPool  # noqa: E402
+
+CHUNK_BYTES = 4800  # 100 ms at 24 kHz mono s16
+
+
+class BusyAdapter:
+    """Burns a fixed amount of CPU per 100 ms chunk of silence."""
+
+    def __init__(self, prompt, chunks=20, work=200_000, **_):
+        self.left = chunks
+        self.work = work
+
+    async def pull(self, chunk_size):
+        total = 0
+        for i in range(self.work):
+            total += i * i
+        self.left -= 1
+        return AudioChunk(pcm=bytes(CHUNK_BYTES), duration_ms=100.0, eos=self.left <= 0)
+
+    async def reset(self):
+        self.left = 0
+
+
+async def _drain(adapter):
+    seconds = 0.0
+    while True:
+        chunk = await adapter.pull(CHUNK_BYTES)
+        seconds += len(chunk.pcm) / 48_000
+        if chunk.eos:
+            return seconds
+
+
+async def _run(pool, jobs):
+    adapters = [ProcessAdapter(f"job {i}", pool=pool) for i in range(jobs)]
+    return sum(await asyncio.gather(*(_drain(a) for a in adapters)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--jobs", type=int, default=16, help="Concurrent utterances")
+    args = parser.parse_args()
+
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        pool = WorkerPool(workers, adapter="bench_workers:BusyAdapter", chunk_bytes=CHUNK_BYTES)
+        pool.start()
+        asyncio.run(_run(pool, workers))  # warm up: spawn and import
+        start = time.perf_counter()
+        audio = asyncio.run(_run(pool, args.jobs))
+        elapsed = time.perf_counter() - start
+        pool.close()
+        rate = audio / elapsed
+        baseline = baseline or rate
+        print(f"{workers:3d} workers: {rate:8.1f} audio s/s  speed-up x{rate / baseline:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,11 @@
-"""Barge-In scenario."""
+"""Barge-In scenario.
+
+The barge-in lands while the adapter is inside a slow pull (standing in for
+a model step), so the measured latency shows whether the pull is raced
+against the interrupt instead of awaited.
+"""
+import asyncio
+
 from Morpheus_Client.orchestrator.adapter import AudioChunk, TTSAdapter
 
 from .utils import run_scene
@@ -7,14 +14,17 @@ from .utils import run_scene
 class BargeAdapter(TTSAdapter):
     """Emit chunks until barge-in occurs."""
 
-    def __init__(self, total: int = 5) -> None:
+    def __init__(self, total: int = 5, step_s: float = 0.0) -> None:
         self.total = total
+        self.step_s = step_s
         self.sent = 0
         self.reset_called = False
 
     async def pull(self, _size):
         if self.sent >= self.total:
             return AudioChunk(pcm=b"", duration_ms=0, eos=True)
+        if self.sent and self.step_s:
+            await asyncio.sleep(self.step_s)
         self.sent += 1
         return AudioChunk(pcm=b"\x05\x00" * 160, duration_ms=10, eos=False)
 
@@ -24,8 +34,11 @@ class BargeAdapter(TTSAdapter):
 
 def run(tmp_path):
     """Run Barge-In and record artifacts."""
-    adapter = BargeAdapter()
-    timeline_path, wav_path, timeline = run_scene("barge_in", adapter, tmp_path, barge_in_at=2)
+    adapter = BargeAdapter(step_s=0.2)
+    metrics: dict = {}
+    timeline_path, wav_path, timeline = run_scene(
+        "barge_in", adapter, tmp_path, barge_in_at=1, barge_in_delay_ms=20, metrics=metrics
+    )
     return (
         timeline_path,
         wav_path,
@@ -33,5 +46,7 @@ def run(tmp_path):
             "timeline": timeline,
             "reset_called": adapter.reset_called,
             "planned_chunks": adapter.total,
+            "step_ms": adapter.step_s * 1000.0,
+            "barge_in_latency_ms": metrics["barge_in_latency_ms"],
         },
     )
@@ -17,7 +17,14 @@ from Morpheus_Client.orchestrator.chunk_ladder import ChunkLadder
 from Morpheus_Client.orchestrator.core import Orchestrator
 
 
-def run_scene(scene_name: str, adapter, tmp_path: Path, barge_in_at: int | None = None):
+def run_scene(
+    scene_name: str,
+    adapter,
+    tmp_path: Path,
+    barge_in_at: int | None = None,
+    barge_in_delay_ms: float = 0.0,
+    metrics: dict | None = None,
+):
     """Run a scene and capture timeline + WAV artifacts.
 
     Parameters
@@ -30,6 +37,12 @@ def run_scene(scene_name: str, adapter, tmp_path: Path, barge_in_at: int | None
         Directory to write artifacts into.
     barge_in_at: int | None
         If provided, signal a barge-in after this many chunks.
+    barge_in_delay_ms: float
+        Delay between that chunk and the signal, so the barge-in can land
+        while the next pull is still running.
+    metrics: dict | None
+        Filled with ``barge_in_latency_ms``, the time from the signal until
+        the stream fell silent, when a barge-in was signalled.
     """
     buffer = PlaybackBuffer(capacity_ms=1000)
     orch = Orchestrator(adapter, buffer, ChunkLadder())
@@ -53,7 +66,20 @@ def run_scene(scene_name: str, adapter, tmp_path: Path, barge_in_at: int | None
                 }
             )
             if barge_in_at is not None and event["chunk_id"] == barge_in_at:
-                orch.signal_barge_in()
+                if barge_in_delay_ms > 0:
+                    loop = asyncio.get_running_loop()
+                    loop.call_later(barge_in_delay_ms / 1000.0, _signal)
+                else:
+                    _signal()
+        if signalled and metrics is not None:
+            metrics["barge_in_latency_ms"] = (time.perf_counter() - signalled[0]) * 1000.0
+        await orch.settle()
+
+    signalled: list[float] = []
+
+    def _signal():
+        signalled.append(time.perf_counter())
+        orch.signal_barge_in()
 
     asyncio.run(_run())
 
@@ -0,0 +1,132 @@
+import asyncio
+
+import httpx
+
+import Morpheus_Client.server as server
+from Morpheus_Client.orchestrator.admission import AdmissionController, Overloaded
+
+LONG = "x" * 150  # ten seconds of audio at the default 15 characters per second
+
+
+def _loaded(**options):
+    controller = AdmissionController(1, slack_s=0.5, **options)
+    controller.observe(audio_s=1.0, busy_s=1.0, chars=15)  # one slot, real time
+    return controller
+
+
+def test_idle_or_unmeasured_server_accepts():
+    controller = AdmissionController(1)
+    first = controller.decide(LONG)
+    assert first["action"] == "accept" and first["projected_rtf"] == 0.0
+
+    controller = _loaded()
+    assert controller.capacity == 1.0
+    assert controller.decide(LONG)["action"] == "accept"  # nothing active yet
+
+
+def test_decisions_follow_projected_real_time_factor():
+    async def run():
+        controller = _loaded(max_queue_s=2.0)
+        ticket = await controller.admit("short")  # finishes in ~0.3s
+        # Sharing one real-time slot doubles generation time: 10s behind
+        long_decision = controller.decide(LONG)
+        # A short prompt ends within the slack even at half speed
+        short_decision = controller.decide("tiny")
+        ticket.release()
+        busy = await controller.admit(LONG)  # ten seconds of work
+        rejected = controller.decide(LONG)
+        busy.release()
+        return long_decision, short_decision, rejected
+
+    long_decision, short_decision, rejected = asyncio.run(run())
+    assert long_decision["action"] == "queue" and long_decision["projected_rtf"] == 2.0
+    assert short_decision["action"] == "accept"
+    assert rejected["action"] == "reject" and rejected["wait_s"] > 9
+
+
+def test_lag_is_compared_to_the_request_deadline():
+    async def run():
+        controller = _loaded()
+        ticket = await controller.admit("short")
+        # Ten seconds behind playback: too late for the default, not for a
+        # client that accepts to wait twelve seconds
+        strict = controller.decide(LONG)
+        patient = controller.decide(LONG, deadline_s=12.0)
+        ticket.release()
+        return strict, patient
+
+    strict, patient = asyncio.run(run())
+    assert strict["action"] != "accept" and strict["lag_s"] == 10.0
+    assert patient["action"] == "accept" and patient["deadline_s"] == 12.0
+
+
+def test_more_text_for_a_ticket_is_admitted_on_that_ticket():
+    async def run():
+        controller = _loaded(max_queue_s=0.0)
+        ticket = await controller.admit("x" * 15)
+        # Alone, the stream is not slowed down by its own earlier text
+        same = await controller.admit(LONG, ticket=ticket)
+        after_extension = controller.metrics["active"], ticket.remaining_s(ticket.started)
+        other = await controller.admit("tiny")
+        try:
+            await controller.admit(LONG, ticket=ticket)
+        except Overloaded as exc:
+            refused = exc.decision
+        other.release()
+        ticket.release()
+        return same is ticket, after_extension, refused
+
+    same, (active, remaining), refused = asyncio.run(run())
+    assert same and active == 1 and remaining > 10
+    assert refused["action"] == "rejected" and refused["projected_rtf"] == 2.0
+
+
+def test_a_stream_gets_at_most_one_slot_unless_batched():
+    async def run():
+        controller = AdmissionController(4, slack_s=0.5)
+        controller.observe(audio_s=1.0, busy_s=2.0, chars=15)  # each slot at half speed
+        ticket = await controller.admit("short")
+        single = controller.decide("x" * 900)
+        batched = controller.decide("x" * 900, batched=True)
+        ticket.release()
+        return single, batched
+
+    single, batched = asyncio.run(run())
+    assert single["projected_rtf"] == 2.0 and single["lag_s"] == 60.0
+    assert single["action"] != "accept"
+    assert batched["projected_rtf"] == 1.0 and batched["action"] == "accept"
+
+
+def test_queued_request_is_admitted_when_a_stream_ends():
+    async def run():
+        controller = _loaded(max_queue_s=5.0)
+        first = await controller.admit("x" * 15)
+        waiting = asyncio.create_task(controller.admit(LONG))
+        await asyncio.sleep(0.01)
+        assert not waiting.done() and controller.metrics["waiting"] == 1
+        first.release()
+        second = await asyncio.wait_for(waiting, 1)
+        return controller.metrics, second
+
+    metrics, second = asyncio.run(run())
+    assert (metrics["accepted"], metrics["queued"], metrics["active"]) == (1, 1, 1)
+    second.release()
+
+
+def test_rest_request_is_shed_with_retry_after(monkeypatch):
+    async def run():
+        controller = _loaded()
+        monkeypatch.setattr(server, "admission", controller)
+        busy = await controller.admit(LONG)
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/v1/audio/speech", json={"input": LONG})
+            stats = (await client.get("/stats")).json()["admission"]
+        busy.release()
+        return response, stats
+
+    response, stats = asyncio.run(run())
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 9
+    assert response.json()["admission"]["action"] == "rejected"
+    assert stats["rejected"] == 1 and stats["last_decision"]["action"] == "rejected"
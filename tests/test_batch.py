@@ -0,0 +1,199 @@
+import asyncio
+import json
+import wave
+
+import httpx
+import pytest
+
+import Morpheus_Client.server as server
+from Morpheus_Client.batch import BatchManager, ManifestError, parse_manifest
+from Morpheus_Client.cache import UtteranceCache
+from Morpheus_Client.config import ConfigStore
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.orchestrator.scheduler import SynthesisScheduler
+from Morpheus_Client.tts_engine.adapter_registry import VoiceSchema, _AdapterSpec
+
+MANIFEST = "\n".join(
+    json.dumps(line)
+    for line in [
+        {"id": "a", "text": "The first sentence is long enough. And a second one follows it."},
+        {"id": "b", "text": "Only one sentence here.", "voice": "leo"},
+        {"id": "c", "text": "Another single sentence."},
+    ]
+)
+
+
+def test_manifest_validation():
+    items = parse_manifest(MANIFEST + "\n\n")
+    assert [item.id for item in items] == ["a", "b", "c"] and items[1].voice == "leo"
+    for bad in ("", "nope", '{"id": "../x", "text": "t"}', '{"id": "a", "text": ""}',
+                '{"id": "a", "text": "t"}\n{"id": "a", "text": "u"}',
+                '{"id": "a", "text": "t", "params": {"temperature": 1}}'):
+        with pytest.raises(ManifestError):
+            parse_manifest(bad)
+
+
+def _fake_synthesize(calls):
+    async def synthesize(text, item):
+        calls.append(text)
+        await asyncio.sleep(0)
+        yield b"\x01\x00" * 240
+        yield b"\x02\x00" * 240
+
+    return synthesize
+
+
+def test_job_writes_finalized_wavs(tmp_path):
+    calls = []
+
+    async def run():
+        manager = BatchManager(tmp_path, _fake_synthesize(calls), concurrency=2, crossfade_ms=0)
+        job = manager.submit(parse_manifest(MANIFEST))
+        await manager._tasks[job.id]
+        return job
+
+    job = asyncio.run(run())
+    assert len(calls) == 4  # item "a" is synthesized as two sentences
+    status = job.status()
+    assert (status["state"], status["done"], status["progress"], status["eta_seconds"]) == (
+        "completed", 3, 1.0, 0.0,
+    )
+    assert status["throughput"] > 0
+    with wave.open(str(job.wav_path("a")), "rb") as wav:
+        assert (wav.getframerate(), wav.getnframes()) == (24000, 960)
+    raw = job.wav_path("b").read_bytes()
+    assert int.from_bytes(raw[4:8], "little") == len(raw) - 8  # real RIFF size
+
+
+def test_job_resumes_after_restart(tmp_path):
+    calls = []
+
+    async def interrupted():
+        manager = BatchManager(tmp_path, _fake_synthesize(calls), concurrency=1)
+        job = manager.submit(parse_manifest(MANIFEST))
+        while not job.wav_path("a").exists():
+            await asyncio.sleep(0)
+        await manager.close()
+        return job.id
+
+    job_id = asyncio.run(interrupted())
+    calls.clear()
+
+    async def restarted():
+        manager = BatchManager(tmp_path, _fake_synthesize(calls), concurrency=1)
+        assert manager.resume() == [job_id]
+        await manager._tasks[job_id]
+        return manager.get(job_id)
+
+    job = asyncio.run(restarted())
+    assert job.status()["done"] == 3
+    assert "The first sentence is long enough." not in calls
+    assert json.loads((tmp_path / job_id / "job.json").read_text())["state"] == "completed"
+
+
+def test_failed_items_leave_job_partial_and_are_retried(tmp_path):
+    calls = []
+    fake = _fake_synthesize(calls)
+
+    def flaky(text, item):
+        if item.id == "b":
+            raise RuntimeError("model crashed")
+        return fake(text, item)
+
+    async def first():
+        manager = BatchManager(tmp_path, flaky, concurrency=2)
+        job = manager.submit(parse_manifest(MANIFEST))
+        await manager._tasks[job.id]
+        return job
+
+    job = asyncio.run(first())
+    status = job.status()
+    assert (status["state"], status["done"], status["failed"]) == ("partial", 2, 1)
+    assert json.loads((tmp_path / job.id / "job.json").read_text())["state"] == "partial"
+    assert not list(tmp_path.glob(f"{job.id}/*.tmp"))
+    calls.clear()
+
+    async def restarted():
+        manager = BatchManager(tmp_path, _fake_synthesize(calls), concurrency=1)
+        assert manager.resume() == [job.id]
+        await manager._tasks[job.id]
+        return manager.get(job.id)
+
+    job = asyncio.run(restarted())
+    assert calls == ["Only one sentence here."]
+    assert job.status()["state"] == "completed" and job.errors == {}
+
+
+class ToneAdapter:
+    def __init__(self, prompt, voice=None, **_):
+        self.chunks = [b"\x03\x00" * 120]
+
+    async def pull(self, _size):
+        if self.chunks:
+            return AudioChunk(pcm=self.chunks.pop(), duration_ms=5.0)
+        return AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+
+    async def reset(self):
+        self.chunks = []
+
+
+def test_batch_endpoints(monkeypatch, tmp_path):
+    spec = _AdapterSpec(ToneAdapter, lambda: {"name": "tone"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "tone", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="tone", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=0))
+    monkeypatch.setattr(server, "scheduler", SynthesisScheduler(2))
+    monkeypatch.setattr(
+        server, "batch_jobs", BatchManager(tmp_path, server._batch_sentence, concurrency=2)
+    )
+
+    async def run():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            bad = await client.post("/v1/audio/batch", content='{"id": "x"}')
+            created = await client.post("/v1/audio/batch", content=MANIFEST)
+            job = created.json()
+            while (status := (await client.get(job["status_url"])).json())["state"] != "completed":
+                await asyncio.sleep(0.01)
+            item = await client.get(f"{job['status_url']}/items/b")
+            missing = await client.get("/v1/audio/batch/unknown")
+            return bad, created, status, item, missing
+
+    bad, created, status, item, missing = asyncio.run(run())
+    assert bad.status_code == 400 and created.status_code == 202
+    assert status["done"] == 3 and status["errors"] == {}
+    assert item.status_code == 200 and item.content[:4] == b"RIFF"
+    assert missing.status_code == 404
+    assert server.scheduler.metrics["classes"]["batch"]["dispatched"] == 4
+
+
+class SlowToneAdapter(ToneAdapter):
+    def __init__(self, prompt, voice=None, **_):
+        self.chunks = [b"\x03\x00" * 120] * 6
+
+    async def pull(self, size):
+        await asyncio.sleep(0.005)
+        return await super().pull(size)
+
+
+def test_global_barge_in_does_not_cut_batch_sentences(monkeypatch, tmp_path):
+    spec = _AdapterSpec(SlowToneAdapter, lambda: {"name": "tone"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "tone", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="tone", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=0))
+    monkeypatch.setattr(server, "scheduler", SynthesisScheduler(1))
+    monkeypatch.setattr(server, "current_orchestrator", None)
+
+    async def run():
+        manager = BatchManager(tmp_path, server._batch_sentence, concurrency=1, crossfade_ms=0)
+        job = manager.submit(parse_manifest(MANIFEST))
+        task = manager._tasks[job.id]
+        while not task.done():
+            server._signal_barge_in()  # e.g. POST /barge-in or an adapter swap
+            await asyncio.sleep(0.003)
+        return job
+
+    job = asyncio.run(run())
+    assert job.status()["errors"] == {}
+    with wave.open(str(job.wav_path("b")), "rb") as wav:
+        assert wav.getnframes() == 6 * 120
@@ -0,0 +1,116 @@
+import asyncio
+import wave
+
+import httpx
+import pytest
+
+import Morpheus_Client.server as server
+from Morpheus_Client.broadcast import BroadcastHub, SubscriberDropped, record
+
+
+async def _take(subscription, n):
+    out = []
+    async for pcm in subscription:
+        out.append(pcm)
+        if len(out) == n:
+            break
+    return out
+
+
+def test_every_subscriber_gets_the_same_chunk_objects():
+    async def run():
+        hub = BroadcastHub(capacity=8)
+        subscriptions = [hub.subscribe() for _ in range(1000)]
+        readers = [asyncio.create_task(_take(s, 3)) for s in subscriptions]
+        await asyncio.sleep(0)
+        chunks = [bytes([i]) * 480 for i in range(3)]
+        for chunk in chunks:
+            hub.publish(chunk)
+            await asyncio.sleep(0)
+        results = await asyncio.gather(*readers)
+        return chunks, results, hub.metrics
+
+    chunks, results, metrics = asyncio.run(run())
+    assert all(all(a is b for a, b in zip(result, chunks)) for result in results)
+    assert metrics["chunks"] == 3 and metrics["subscribers"] == 0
+
+
+def test_slow_subscriber_skips_ahead_without_stalling_publisher():
+    async def run():
+        hub = BroadcastHub(capacity=4)
+        slow = hub.subscribe()
+        for i in range(10):  # publishing never waits for the reader
+            hub.publish(bytes([i]))
+        lag = hub.metrics["max_lag_chunks"]
+        hub.close()
+        return lag, [pcm async for pcm in slow], slow.skipped, hub.metrics
+
+    lag, received, skipped, metrics = asyncio.run(run())
+    assert lag == 10
+    assert received == [bytes([9])] and skipped == 9
+    assert metrics["skipped_chunks"] == 9
+
+
+def test_drop_policy_ends_lagging_subscriber():
+    async def run():
+        hub = BroadcastHub(capacity=2)
+        subscription = hub.subscribe(lag="drop")
+        for i in range(3):
+            hub.publish(bytes([i]))
+        with pytest.raises(SubscriberDropped):
+            await _take(subscription, 1)
+        return hub.metrics
+
+    metrics = asyncio.run(run())
+    assert metrics["dropped"] == 1 and metrics["subscribers"] == 0
+
+
+def test_file_sink_writes_wav(tmp_path):
+    path = tmp_path / "live.wav"
+
+    async def run():
+        hub = BroadcastHub()
+        recorder = asyncio.create_task(record(hub.subscribe(), path, 24000))
+        await asyncio.sleep(0)
+        hub.publish(b"\x01\x00" * 240)
+        hub.publish(b"\x02\x00" * 240)
+        hub.close()
+        await recorder
+
+    asyncio.run(run())
+    with wave.open(str(path), "rb") as wav:
+        assert (wav.getframerate(), wav.getnframes()) == (24000, 480)
+
+
+def test_live_endpoint_streams_source_audio(monkeypatch):
+    hub = BroadcastHub()
+    monkeypatch.setattr(server, "broadcast_hub", hub)
+
+    async def fake(prompt, voice=None, **kwargs):
+        yield prompt.encode()
+
+    monkeypatch.setattr(server, "orchestrated_pcm_stream", fake)
+
+    async def texts():
+        yield "one"
+        yield "two"
+
+    class Source:
+        def stream(self):
+            return texts()
+
+    async def run():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            request = asyncio.create_task(client.get("/v1/audio/live"))
+            while hub.metrics["subscribers"] == 0:
+                await asyncio.sleep(0.001)
+            await server._consume_source(Source(), lookahead=0)
+            hub.close()
+            response = await request
+            bad = await client.get("/v1/audio/live?lag=never")
+            return response, bad
+
+    response, bad = asyncio.run(run())
+    assert response.content == server.riff_header(server.SAMPLE_RATE) + b"onetwo"
+    assert bad.status_code == 400
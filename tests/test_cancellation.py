@@ -0,0 +1,157 @@
+import asyncio
+import json
+import time
+
+import Morpheus_Client.server as server
+from Morpheus_Client.cache import UtteranceCache
+from Morpheus_Client.config import ConfigStore
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.orchestrator.admission import AdmissionController
+from Morpheus_Client.orchestrator.buffer import PlaybackBuffer
+from Morpheus_Client.orchestrator.chunk_ladder import ChunkLadder
+from Morpheus_Client.orchestrator.core import Orchestrator
+from Morpheus_Client.orchestrator.scheduler import SynthesisScheduler
+from Morpheus_Client.tts_engine import speechpipe
+from Morpheus_Client.tts_engine.adapter_registry import VoiceSchema, _AdapterSpec
+
+
+class EndlessAdapter:
+    """Produces 10 ms frames forever until reset."""
+
+    instances = []
+
+    def __init__(self, prompt, voice=None, **_):
+        self.pulls = 0
+        self.reset_at = None
+        type(self).instances.append(self)
+
+    async def pull(self, _size):
+        await asyncio.sleep(0.005)
+        self.pulls += 1
+        return AudioChunk(pcm=b"\x00\x00" * 240, duration_ms=10.0)
+
+    async def reset(self):
+        self.reset_at = time.monotonic()
+
+
+def _use_endless(monkeypatch):
+    EndlessAdapter.instances = []
+    spec = _AdapterSpec(EndlessAdapter, lambda: {"name": "endless"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "endless", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="endless", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=0))
+    monkeypatch.setattr(server, "scheduler", SynthesisScheduler(1))
+    monkeypatch.setattr(server, "admission", AdmissionController(1))
+    monkeypatch.setattr(
+        server, "cancelled_work", {"streams": 0, "seconds": 0.0, "audio_seconds": 0.0}
+    )
+
+
+def test_closing_orchestrator_stream_resets_adapter():
+    adapter = EndlessAdapter("hi")
+
+    async def run():
+        orch = Orchestrator(adapter, PlaybackBuffer(capacity_ms=500), ChunkLadder())
+        stream = orch.stream()
+        await stream.__anext__()
+        await stream.aclose()
+        return orch.timeline[-1]["stage"]
+
+    assert asyncio.run(run()) == "cancel_reset" and adapter.reset_at is not None
+
+
+def test_rest_disconnect_stops_generation(monkeypatch):
+    _use_endless(monkeypatch)
+    body = json.dumps({"input": "Hello there"}).encode()
+    first_audio = asyncio.Event()
+    sent = []
+
+    async def receive():
+        if not sent:
+            sent.append(None)
+            return {"type": "http.request", "body": body, "more_body": False}
+        await first_audio.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and len(message.get("body", b"")) > 44:
+            first_audio.set()
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/v1/audio/speech", "raw_path": b"/v1/audio/speech",
+        "query_string": b"", "headers": [(b"content-type", b"application/json")],
+        "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": "",
+        "http_version": "1.1",
+    }
+
+    async def run():
+        await asyncio.wait_for(server.app(scope, receive, send), 2)
+        disconnected = time.monotonic()
+        await asyncio.sleep(0.05)
+        return disconnected
+
+    disconnected = asyncio.run(run())
+    adapter = EndlessAdapter.instances[0]
+    assert adapter.reset_at is not None and adapter.reset_at <= disconnected
+    assert server.cancelled_work["streams"] == 1 and server.cancelled_work["seconds"] > 0
+    assert server.scheduler.metrics["in_use"] == 0
+    assert server.admission.metrics["active"] == 0
+
+
+def test_websocket_disconnect_stops_generation(monkeypatch):
+    _use_endless(monkeypatch)
+    first_audio = asyncio.Event()
+    frames = []
+
+    async def receive():
+        if not frames:
+            frames.append(None)
+            return {"type": "websocket.connect"}
+        await first_audio.wait()
+        return {"type": "websocket.disconnect", "code": 1001}
+
+    async def send(message):
+        if message.get("bytes") and len(message["bytes"]) > 44:
+            first_audio.set()
+
+    scope = {
+        "type": "websocket", "path": "/ws/tts", "raw_path": b"/ws/tts",
+        "query_string": b"prompt=Hello+there", "headers": [], "scheme": "ws",
+        "server": ("test", 80), "client": ("test", 1), "root_path": "", "subprotocols": [],
+    }
+
+    async def run():
+        await asyncio.wait_for(server.app(scope, receive, send), 2)
+        return time.monotonic()
+
+    disconnected = asyncio.run(run())
+    adapter = EndlessAdapter.instances[0]
+    assert adapter.reset_at is not None and adapter.reset_at <= disconnected
+    assert server.cancelled_work["streams"] == 1
+    assert server.admission.metrics["active"] == 0
+
+
+def test_remote_decoder_closes_token_stream_on_exit(monkeypatch):
+    closed = []
+
+    async def tokens():
+        try:
+            while True:
+                await asyncio.sleep(0)
+                yield "<custom_token_10>"
+        finally:
+            closed.append(True)
+
+    async def decode(token_gen, codes=None):
+        async for token in token_gen:
+            yield token.encode()
+
+    monkeypatch.setattr(speechpipe, "tokens_decoder", decode)
+
+    async def run():
+        stream = speechpipe.tokens_decoder_sync(tokens())
+        await stream.__anext__()
+        await stream.aclose()
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == [] and closed == [True]
@@ -0,0 +1,28 @@
+from Morpheus_Client.orchestrator import PCMQueue
+
+
+def test_takes_slice_across_segments_in_order():
+    queue = PCMQueue()
+    for part in (b"abcd", b"", bytearray(b"efg"), memoryview(b"hijklm")):
+        queue.append(part)
+    assert len(queue) == 13
+    out = [queue.take(n) for n in (3, 3, 5, 10)]
+    assert out == [b"abc", b"def", b"ghijk", b"lm"] and len(queue) == 0
+    assert all(type(part) is bytes for part in out)
+    assert queue.take(4) == b""
+
+
+def test_whole_segments_are_returned_without_copying():
+    queue = PCMQueue()
+    segment = b"\x01\x00" * 240
+    queue.append(segment)
+    assert queue.take(len(segment)) is segment
+
+
+def test_clear_drops_backlog():
+    queue = PCMQueue()
+    queue.append(b"abcdef")
+    queue.take(2)
+    queue.clear()
+    queue.append(b"xy")
+    assert len(queue) == 2 and queue.take(8) == b"xy"
@@ -0,0 +1,143 @@
+import asyncio
+import sqlite3
+
+import httpx
+
+import Morpheus_Client.server as server
+from Morpheus_Client.cluster import Cluster, SessionRegistry
+from Morpheus_Client.config import ConfigStore, SharedConfig
+from Morpheus_Client.tts_engine.adapter_registry import VoiceSchema
+
+
+def _store(path, **values):
+    return ConfigStore(
+        values, voice=VoiceSchema(voice="tara"), shared=SharedConfig(path), voice_type=VoiceSchema
+    )
+
+
+def test_workers_share_versioned_config(tmp_path):
+    path = tmp_path / "config.sqlite3"
+    first = _store(path, ORPHEUS_TOP_P="0.9")
+    second = _store(path, ORPHEUS_TOP_P="0.1")  # seeded already: first one wins
+    assert second.current.values["ORPHEUS_TOP_P"] == "0.9"
+
+    updated = asyncio.run(first.publish({"ORPHEUS_TOP_P": "0.5"}, voice=VoiceSchema(voice="leo")))
+    assert second.current.version == 0  # reading never touches SQLite
+    seen = asyncio.run(second.refresh())
+    assert seen.version == updated.version == 1 and second.current is seen
+    assert seen.values["ORPHEUS_TOP_P"] == "0.5" and seen.voice == VoiceSchema(voice="leo")
+    assert asyncio.run(second.refresh()) is seen  # unchanged record is not re-read
+
+    # Concurrent updates merge instead of overwriting each other
+    second.update({"ORPHEUS_MAX_TOKENS": "100"}, adapter="remote")
+    first.update({"ORPHEUS_TEMPERATURE": "0.7"})
+    final = asyncio.run(second.refresh())
+    assert final.version == 3 and final.adapter == "remote"
+    assert {"ORPHEUS_TOP_P", "ORPHEUS_MAX_TOKENS", "ORPHEUS_TEMPERATURE"} <= set(final.values)
+    # Generation parameters travel with the shared snapshot
+    assert final.generation == first.current.generation == {
+        "temperature": 0.7, "top_p": 0.5, "max_tokens": 100
+    }
+
+
+def test_registry_forgets_exited_workers(tmp_path):
+    registry = SessionRegistry(tmp_path / "sessions.sqlite3")
+    registry.register("gone", "127.0.0.1:1", 2**22 + 12345)
+    registry.claim("s1", "gone")
+    registry.register("me", "127.0.0.1:2", 1)
+    assert registry.workers() == {"me": "127.0.0.1:2"}
+    assert registry.owner("s1") is None
+
+
+def test_barge_in_is_routed_to_the_owning_worker(tmp_path):
+    interrupted = {"a": [], "b": []}
+
+    def interrupt(name, owned):
+        def handle(session):
+            interrupted[name].append(session)
+            return session is None or session in owned
+        return handle
+
+    async def run():
+        a = Cluster(tmp_path, interrupt("a", set()), worker_id="a")
+        b = Cluster(tmp_path, interrupt("b", {"s1"}), worker_id="b")
+        await a.start()
+        await b.start()
+        try:
+            b.claim("s1")
+            await b.flush()
+            await a.refresh()
+            routed = await a.barge_in("s1")
+            unknown = await a.barge_in("nobody")
+            everyone = await a.barge_in()
+            b.release("s1")
+            await b.flush()
+            released = await a.barge_in("s1")
+            return routed, unknown, everyone, released, a.metrics
+        finally:
+            await a.stop()
+            await b.stop()
+
+    routed, unknown, everyone, released, metrics = asyncio.run(run())
+    assert routed and not unknown and everyone and not released
+    assert interrupted["b"] == ["s1", None]
+    assert interrupted["a"] == ["s1", "nobody", None, "s1"]
+    assert metrics["routed"] == 2 and metrics["workers"] == 2 and metrics["sessions"] == 1
+
+
+def test_barge_in_endpoint_targets_session(monkeypatch):
+    hits = []
+    monkeypatch.setattr(server, "local_sessions", {"s1": lambda: hits.append("s1")})
+
+    async def post(path):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path)
+
+    assert asyncio.run(post("/barge-in?session=s1")).status_code == 200
+    assert asyncio.run(post("/barge-in?session=s2")).status_code == 404
+    assert hits == ["s1"]
+
+
+def test_cluster_keeps_sqlite_off_the_event_loop(tmp_path):
+    async def run():
+        cluster = Cluster(tmp_path, lambda session: False, worker_id="a")
+        await cluster.start()
+        store = _store(tmp_path / "config.sqlite3")
+        try:
+            # Another worker holds the write lock of both databases
+            locks = []
+            for name in ("sessions.sqlite3", "config.sqlite3"):
+                db = sqlite3.connect(tmp_path / name, isolation_level=None)
+                db.execute("BEGIN IMMEDIATE")
+                locks.append(db)
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            cluster.claim("s1")
+            publishing = asyncio.create_task(store.publish(adapter="remote"))
+            owner = asyncio.create_task(cluster.barge_in("s1"))
+            await asyncio.sleep(0.2)
+            snapshot = store.current
+            assert ticks >= 10 and not publishing.done() and snapshot.version == 0
+            for db in locks:
+                db.execute("ROLLBACK")
+                db.close()
+            await cluster.flush()
+            published = await publishing
+            await owner
+            ticker.cancel()
+            await cluster.refresh()
+            return published, cluster.metrics
+        finally:
+            await cluster.stop()
+
+    published, metrics = asyncio.run(asyncio.wait_for(run(), 10))
+    assert published.adapter == "remote" and published.version == 1
+    assert metrics["sessions"] == 1 and metrics["registry_errors"] == 0
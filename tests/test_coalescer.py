@@ -0,0 +1,87 @@
+import asyncio
+
+from text_sources.coalescer import CoalescingSource
+
+
+class ScriptedSource:
+    """Yield fragments, sleeping where the script contains a float."""
+
+    def __init__(self, script):
+        self.script = script
+
+    async def stream(self):
+        for item in self.script:
+            if isinstance(item, float):
+                await asyncio.sleep(item)
+            else:
+                yield item
+
+
+def collect(source):
+    async def run():
+        return [text async for text in source.stream()]
+
+    return asyncio.run(run())
+
+
+def test_fragments_merge_until_sentence_boundary():
+    source = CoalescingSource(
+        ScriptedSource(["Hello", "there,", "friend. How", "are", "you?"]),
+        idle_timeout=1.0,
+    )
+    assert collect(source) == ["Hello there, friend.", "How are you?"]
+    metrics = source.metrics
+    assert metrics["fragments_in"] == 5
+    assert metrics["utterances_out"] == 2
+    assert metrics["call_reduction"] == 1.0 - 2 / 5
+    assert metrics["synthesis_calls_per_minute"] < metrics["fragments_per_minute"]
+
+
+def test_idle_timeout_and_size_threshold_flush():
+    source = CoalescingSource(
+        ScriptedSource(["partial", "thought", 0.05, "abcdefghij", "klmnop"]),
+        idle_timeout=0.01,
+        max_chars=17,
+    )
+    assert collect(source) == ["partial thought", "abcdefghij klmnop"]
+    assert source.metrics["flush_idle"] == 1
+    assert source.metrics["flush_size"] == 1
+
+
+def test_size_threshold_counts_text_not_the_trailing_separator():
+    def run(max_chars):
+        source = CoalescingSource(
+            ScriptedSource(["abcdefghij", "klmnop", "q"]), idle_timeout=1.0, max_chars=max_chars
+        )
+        return collect(source)
+
+    # "abcdefghij klmnop" is 17 characters
+    assert run(17) == ["abcdefghij klmnop", "q"]
+    assert run(18) == ["abcdefghij klmnop q"]
+
+
+def test_pending_fragments_are_bounded():
+    read = []
+
+    class EndlessSource:
+        async def stream(self):
+            for i in range(1000):
+                read.append(i)
+                yield f"w{i}"
+
+    async def run():
+        source = CoalescingSource(EndlessSource(), idle_timeout=1.0, max_pending=8)
+        stream = source.stream()
+        await stream.__anext__()  # first size flush
+        await asyncio.sleep(0.05)  # a stalled consumer
+        ahead = len(read) - source.metrics["fragments_in"]
+        await stream.aclose()
+        return ahead
+
+    # the queue plus the fragment the pump holds while blocked
+    assert asyncio.run(run()) <= 8 + 1
+
+
+def test_zero_idle_timeout_forwards_fragments():
+    source = CoalescingSource(ScriptedSource(["a", "b"]), idle_timeout=0)
+    assert collect(source) == ["a", "b"]
@@ -4,7 +4,6 @@ import os
 import httpx
 import Morpheus_Client.server as server
 from Morpheus_Client.tts_engine import inference
-from Morpheus_Client.config import get_current_config
 
 
 def test_generation_param_round_trip():
@@ -29,10 +28,13 @@ def test_generation_param_round_trip():
         assert float(config["ORPHEUS_TEMPERATURE"]) == 0.7
         assert float(config["ORPHEUS_TOP_P"]) == 0.8
         assert int(config["ORPHEUS_MAX_TOKENS"]) == 1234
-        assert inference.TEMPERATURE == 0.7
-        assert inference.TOP_P == 0.8
-        assert inference.MAX_TOKENS == 1234
-        assert get_current_config()["ORPHEUS_TEMPERATURE"] == "0.7"
+        # New sessions read them from the snapshot; engine defaults stay put
+        assert server.config_store.current.generation == {
+            "temperature": 0.7, "top_p": 0.8, "max_tokens": 1234
+        }
+        assert (inference.TEMPERATURE, inference.TOP_P, inference.MAX_TOKENS) == orig_vals
+        # Persisted for the next start; no process-wide environment change
+        assert "ORPHEUS_TEMPERATURE=0.7\n" in open(".env").read()
     finally:
         for key, val in orig_env.items():
             if val is None:
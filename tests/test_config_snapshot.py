@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+
+import Morpheus_Client.server as server
+from Morpheus_Client.config import ConfigStore
+from Morpheus_Client.tts_engine import inference
+from Morpheus_Client.tts_engine.adapter_registry import registry as adapter_registry
+
+
+class RecordingOrchestrator:
+    def __init__(self):
+        self.barge_ins = 0
+
+    def signal_barge_in(self):
+        self.barge_ins += 1
+
+
+def test_store_versions_and_persists_atomically(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    store = ConfigStore({"ORPHEUS_TOP_P": "0.9"}, adapter="llama_cpp")
+    first = store.current
+
+    second = store.update({"ORPHEUS_TOP_P": "0.5"}, adapter="other")
+    assert second.version == first.version + 1
+    assert first.values["ORPHEUS_TOP_P"] == "0.9"  # old snapshot unchanged
+    assert first.generation == {"top_p": 0.9} and second.generation == {"top_p": 0.5}
+    assert first.adapter == "llama_cpp"
+    assert store.current is second
+
+    (tmp_path / ".env").write_text("")
+    (tmp_path / ".env").chmod(0o640)
+    asyncio.run(store.persist())
+    assert (tmp_path / ".env").read_text() == "ORPHEUS_TOP_P=0.5\n"
+    assert (tmp_path / ".env").stat().st_mode & 0o777 == 0o640
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".config-")]
+
+    # Nothing new to write: persist is a no-op
+    (tmp_path / ".env").write_text("sentinel\n")
+    asyncio.run(store.persist())
+    assert (tmp_path / ".env").read_text() == "sentinel\n"
+
+
+def test_only_adapter_swap_triggers_barge_in(monkeypatch):
+    orig_params = (inference.TEMPERATURE, inference.TOP_P, inference.MAX_TOKENS)
+    orch = RecordingOrchestrator()
+    store = ConfigStore(
+        dict(server.config_store.current.values), voice=server.config_store.current.voice
+    )
+    monkeypatch.setattr(store, "persist", _noop_persist)
+    monkeypatch.setattr(server, "config_store", store)
+    monkeypatch.setattr(server, "current_orchestrator", orch)
+    monkeypatch.delenv("ORPHEUS_TOP_P", raising=False)
+    monkeypatch.setitem(adapter_registry._registry, "alt", adapter_registry._registry["llama_cpp"])
+
+    async def run():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.post("/config", json={"ORPHEUS_TOP_P": 0.8, "adapter": "llama_cpp"})
+            tweak_barge_ins = orch.barge_ins
+            await client.post("/config", json={"adapter": "alt"})
+            resp = await client.get("/config")
+            return tweak_barge_ins, resp
+
+    try:
+        tweak_barge_ins, resp = asyncio.run(run())
+    finally:
+        inference.update_generation_params(
+            temperature=orig_params[0], top_p=orig_params[1], max_tokens=orig_params[2]
+        )
+    assert tweak_barge_ins == 0
+    assert orch.barge_ins == 1
+    assert resp.headers["X-Config-Version"] == "2"
+    assert store.current.adapter == "alt"
+
+
+async def _noop_persist():
+    return None
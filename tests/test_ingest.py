@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+import Morpheus_Client.server as server
+from Morpheus_Client.cache import UtteranceCache
+from Morpheus_Client.config import ConfigStore
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.orchestrator.admission import AdmissionController, Overloaded
+from Morpheus_Client.orchestrator.scheduler import SynthesisScheduler
+from Morpheus_Client.tts_engine.adapter_registry import VoiceSchema, _AdapterSpec
+
+
+class PromptAdapter:
+    prompts = []
+
+    def __init__(self, prompt, voice=None, **_):
+        self.prompt = prompt
+        type(self).prompts.append(prompt)
+
+    async def pull(self, _size):
+        await asyncio.sleep(0)
+        return AudioChunk(pcm=b"\x01\x00" * 240, duration_ms=10.0, eos=True)
+
+    async def reset(self):
+        pass
+
+
+def _use_prompt_adapter(monkeypatch):
+    PromptAdapter.prompts = []
+    spec = _AdapterSpec(PromptAdapter, lambda: {"name": "prompt"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "prompt", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="prompt", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=0))
+    monkeypatch.setattr(server, "scheduler", SynthesisScheduler(1))
+    monkeypatch.setattr(server, "admission", AdmissionController(1))
+
+
+def _post(chunks, sent, query=b""):
+    """Run ``POST /v1/audio/speech`` with a text/plain body sent in ``chunks``.
+
+    Each chunk is an ``(awaitable_factory, bytes)`` pair; the factory is
+    awaited before the chunk is delivered.
+    """
+
+    pending = list(chunks)
+
+    async def receive():
+        if pending:
+            wait, body = pending.pop(0)
+            if wait is not None:
+                await wait()
+            return {"type": "http.request", "body": body, "more_body": bool(pending)}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/v1/audio/speech",
+        "raw_path": b"/v1/audio/speech", "query_string": query,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+        "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": "",
+        "http_version": "1.1",
+    }
+    return server.app(scope, receive, send)
+
+
+def test_synthesis_starts_before_upload_finishes(monkeypatch):
+    _use_prompt_adapter(monkeypatch)
+    sent = []
+    audio_before_rest = []
+
+    async def first_audio():
+        while not any(len(m.get("body", b"")) > 44 for m in sent):
+            await asyncio.sleep(0.005)
+        audio_before_rest.append(list(PromptAdapter.prompts))
+
+    first = "The first sentence is complete here. The second one is "
+    rest = "only finished by a later upload chunk."
+    asyncio.run(
+        asyncio.wait_for(_post([(None, first.encode()), (first_audio, rest.encode())], sent), 2)
+    )
+
+    assert audio_before_rest == [["The first sentence is complete here."]]
+    assert PromptAdapter.prompts == [
+        "The first sentence is complete here.",
+        "The second one is only finished by a later upload chunk.",
+    ]
+    assert sent[0]["status"] == 200
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    assert len(body) == 44 + 2 * 480
+
+
+def test_split_multibyte_characters_and_runaway_text(monkeypatch):
+    _use_prompt_adapter(monkeypatch)
+    monkeypatch.setattr(server, "INGEST_MAX_CHARS", 100)
+    sent = []
+    text = "Ünïcödé words without an end " * 20
+    data = text.encode()
+    chunks = [(None, data[i : i + 7]) for i in range(0, len(data), 7)]
+    asyncio.run(asyncio.wait_for(_post(chunks, sent), 2))
+
+    assert " ".join(PromptAdapter.prompts) == text.strip()
+    assert len(PromptAdapter.prompts) > 1
+    # Bounded by the limit plus about one word and one upload chunk
+    assert max(map(len, PromptAdapter.prompts)) <= 100 + len("Ünïcödé ") + 7
+
+
+def test_empty_body_and_bad_priority_are_rejected(monkeypatch):
+    _use_prompt_adapter(monkeypatch)
+    for chunks, query in (([(None, b"   ")], b""), ([(None, b"Hi.")], b"priority=urgent")):
+        sent = []
+        asyncio.run(asyncio.wait_for(_post(chunks, sent, query), 2))
+        assert sent[0]["status"] == 400
+    assert PromptAdapter.prompts == []
+
+
+def test_every_ingested_sentence_is_admitted(monkeypatch):
+    _use_prompt_adapter(monkeypatch)
+    controller = AdmissionController(1, slack_s=0.5, max_queue_s=0.0)
+    controller.observe(audio_s=1.0, busy_s=1.0, chars=15)
+    monkeypatch.setattr(server, "admission", controller)
+    first = "A short first sentence. "
+    long = "Then a sentence that is far too long to fit " + "x" * 150 + ". "
+
+    async def run():
+        busy = await controller.admit("y" * 150)
+        try:
+            body = (first + long + "Never read.").encode()
+            await _post([(None, body)], sent, b"deadline_ms=3000")
+        finally:
+            busy.release()
+
+    sent = []
+    with pytest.raises(Overloaded):
+        asyncio.run(asyncio.wait_for(run(), 2))
+
+    assert PromptAdapter.prompts == ["A short first sentence."]
+    assert sent[0]["status"] == 200
+    assert controller.metrics["accepted"] == 2 and controller.metrics["rejected"] == 1
@@ -6,11 +6,12 @@ import types
 
 def make_dummy(record):
     class Dummy:
-        def __init__(self, *, model_path, n_ctx, n_gpu_layers):
+        def __init__(self, *, model_path, n_ctx, n_gpu_layers, use_mmap):
             record.update(
                 model_path=model_path,
                 n_ctx=n_ctx,
                 n_gpu_layers=n_gpu_layers,
+                use_mmap=use_mmap,
             )
 
         def text_to_speech(self, *_args, **_kwargs):  # pragma: no cover - placeholder
@@ -28,12 +29,12 @@ def test_load_model_sync_uses_env(monkeypatch):
     monkeypatch.setitem(sys.modules, "llama_cpp", dummy_module)
     import Morpheus_Client.tts_engine.llama_local as llama_local
     importlib.reload(llama_local)
-    llama_local._load_model_sync.cache_clear()
     llama_local._load_model_sync()
     assert record == {
         "model_path": "foo.gguf",
         "n_ctx": 1234,
         "n_gpu_layers": 5,
+        "use_mmap": True,
     }
 
 
@@ -46,10 +47,10 @@ def test_load_model_sync_defaults(monkeypatch):
     monkeypatch.setitem(sys.modules, "llama_cpp", dummy_module)
     import Morpheus_Client.tts_engine.llama_local as llama_local
     importlib.reload(llama_local)
-    llama_local._load_model_sync.cache_clear()
     llama_local._load_model_sync()
     assert record == {
         "model_path": "model.gguf",
         "n_ctx": 8192,
         "n_gpu_layers": 0,
+        "use_mmap": True,
     }
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+
+from Morpheus_Client.cache import UtteranceCache, compose_phrases
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.tts_engine import llama_local
+from Morpheus_Client.tts_engine.inference import batch_sentences
+from Morpheus_Client.tts_engine.model_pool import ModelPool
+
+
+class SlowModel:
+    """Model whose generation blocks its thread, like llama_cpp does."""
+
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def text_to_speech(self, prompt, voice):
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.peak = max(cls.peak, cls.running)
+        try:
+            time.sleep(0.05)
+            yield prompt.encode()
+            time.sleep(0.05)
+            yield b"|"
+        finally:
+            with cls.lock:
+                cls.running -= 1
+
+
+def test_batches_respect_the_character_limit():
+    text = "First sentence goes here. " * 10
+    batches = batch_sentences(text, 100)
+    assert all(len(batch) <= 100 for batch in batches) and len(batches) == 4
+    assert " ".join(batches) == text.strip()
+
+
+def test_long_input_is_generated_in_parallel_and_reassembled_in_order(monkeypatch):
+    SlowModel.peak = 0
+    monkeypatch.setattr(llama_local, "model_pool", ModelPool(SlowModel, 3))
+    text = " ".join(f"Sentence number {i} is right here." for i in range(6))
+    batches = batch_sentences(text, 40)
+
+    async def run(use_batching):
+        adapter = llama_local.TTSAdapter(text, "tara", use_batching=use_batching, max_batch_chars=40)
+        out = []
+        while not (chunk := await adapter.pull(1 << 16)).eos:
+            out.append(chunk.pcm)
+        out.append(chunk.pcm)
+        return b"".join(out)
+
+    audio = asyncio.run(run(True))
+    assert audio == b"".join(batch.encode() + b"|" for batch in batches)
+    assert len(batches) == 6 and SlowModel.peak == 3
+
+    SlowModel.peak = 0
+    audio = asyncio.run(run(False))
+    assert audio == text.encode() + b"|" and SlowModel.peak == 1
+
+
+def test_parallel_batches_are_capped_by_max_parallel(monkeypatch):
+    SlowModel.peak = 0
+    monkeypatch.setattr(llama_local, "model_pool", ModelPool(SlowModel, 3))
+    text = " ".join(f"Sentence number {i} is right here." for i in range(6))
+
+    async def run():
+        adapter = llama_local.TTSAdapter(
+            text, "tara", use_batching=True, max_batch_chars=40, max_parallel=2
+        )
+        out = []
+        while not (chunk := await adapter.pull(1 << 16)).eos:
+            out.append(chunk.pcm)
+        out.append(chunk.pcm)
+        return b"".join(out)
+
+    audio = asyncio.run(run())
+    assert audio == b"".join(batch.encode() + b"|" for batch in batch_sentences(text, 40))
+    assert SlowModel.peak == 2
+
+
+def test_lease_wait_counts_only_time_without_a_model(monkeypatch):
+    monkeypatch.setattr(llama_local, "model_pool", ModelPool(SlowModel, 1))
+    text = " ".join(f"Sentence number {i} is right here." for i in range(4))
+
+    async def drain(adapter):
+        while not (await adapter.pull(1 << 16)).eos:
+            pass
+
+    async def run():
+        async def hold():
+            async with llama_local.model_pool.lease():
+                await asyncio.sleep(0.2)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        queued = llama_local.TTSAdapter("Queued behind another request.", "tara")
+        await drain(queued)
+        await holder
+        # Later batches wait for the single model while earlier ones generate
+        batched = llama_local.TTSAdapter(
+            text, "tara", use_batching=True, max_batch_chars=40, max_parallel=2
+        )
+        await drain(batched)
+        return queued.lease_wait_s, batched.lease_wait_s, llama_local.model_pool.metrics
+
+    queued_wait, batched_wait, metrics = asyncio.run(run())
+    assert 0.15 < queued_wait < 0.3
+    assert batched_wait < 0.05 < metrics["wait_seconds"] - queued_wait
+
+
+def test_closing_the_stream_cancels_pending_batches(monkeypatch):
+    monkeypatch.setattr(llama_local, "model_pool", ModelPool(SlowModel, 2))
+    text = " ".join(f"Sentence number {i} is right here." for i in range(6))
+
+    async def run():
+        adapter = llama_local.TTSAdapter(text, "tara", use_batching=True, max_batch_chars=40)
+        await adapter.pull(4)
+        await adapter.reset()
+        await asyncio.sleep(0.2)
+        return llama_local.model_pool.metrics
+
+    metrics = asyncio.run(run())
+    assert metrics["in_use"] == 0 and metrics["leases"] < 6
+
+
+def test_phrases_synthesize_missing_sentences_concurrently():
+    active = []
+    peak = []
+
+    async def synthesize(sentence):
+        active.append(sentence)
+        peak.append(len(active))
+        await asyncio.sleep(0.02 if sentence == "A." else 0)
+        active.remove(sentence)
+        yield AudioChunk(pcm=sentence.encode(), duration_ms=1.0)
+        yield AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+
+    async def run():
+        sentences = ["A.", "B.", "C."]
+        stream = compose_phrases(
+            sentences, ["a", "b", "c"], UtteranceCache(memory_bytes=0), synthesize,
+            sample_rate=24000, parallel=2,
+        )
+        return [chunk.pcm async for chunk in stream]
+
+    assert asyncio.run(run()) == [b"A.", b"B.", b"C.", b""]
+    assert max(peak) == 2
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from contextlib import aclosing
+
+from Morpheus_Client.tts_engine import llama_local
+from Morpheus_Client.tts_engine.llama_local import _stream_from_model
+
+
+class CountingModel:
+    """Endless generator recording the threads it ran on and its state."""
+
+    def __init__(self):
+        self.produced = 0
+        self.threads = set()
+        self.closed = threading.Event()
+        self.running = False
+
+    def text_to_speech(self, prompt, voice):
+        self.running = True
+        try:
+            while True:
+                self.threads.add(threading.get_ident())
+                time.sleep(0.001)
+                self.produced += 1
+                yield b"\x00\x00"
+        finally:
+            self.running = False
+            self.closed.set()
+
+
+def test_generation_runs_on_one_thread_and_is_bounded(monkeypatch):
+    monkeypatch.setattr(llama_local, "STREAM_QUEUE_SIZE", 4)
+    model = CountingModel()
+
+    async def run():
+        stream = _stream_from_model(model, "hi", "tara")
+        for _ in range(10):
+            await stream.__anext__()
+        await asyncio.sleep(0.1)  # a stalled consumer
+        ahead = model.produced - 10
+        await stream.aclose()
+        return ahead
+
+    ahead = asyncio.run(run())
+    assert len(model.threads) == 1 and threading.get_ident() not in model.threads
+    # bounded queue plus the piece the thread holds while blocked
+    assert ahead <= 4 + 1
+
+
+def test_consumer_exit_closes_generator_before_returning():
+    model = CountingModel()
+
+    async def run():
+        stream = _stream_from_model(model, "hi", "tara")
+        await stream.__anext__()
+        await stream.aclose()
+        return model.running, model.closed.is_set()
+
+    assert asyncio.run(run()) == (False, True)
+
+
+def test_cancelled_consumer_waits_for_generation_to_stop():
+    model = CountingModel()
+
+    async def run():
+        async def consume():
+            async with aclosing(_stream_from_model(model, "hi", "tara")) as stream:
+                async for _ in stream:
+                    await asyncio.sleep(0)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.02)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return model.running, task.cancelled()
+
+    assert asyncio.run(run()) == (False, True)
+
+
+def test_generation_errors_reach_the_consumer():
+    class BrokenModel:
+        def text_to_speech(self, prompt, voice):
+            yield b"a"
+            raise RuntimeError("decode failed")
+
+    async def run():
+        out = []
+        try:
+            async for pcm in _stream_from_model(BrokenModel(), "hi", "tara"):
+                out.append(pcm)
+        except RuntimeError as exc:
+            return out, str(exc)
+
+    assert asyncio.run(run()) == ([b"a"], "decode failed")
+
+
+def test_lease_returns_only_after_generation_stopped(monkeypatch):
+    from Morpheus_Client.tts_engine.model_pool import ModelPool
+
+    models = []
+
+    def factory():
+        models.append(CountingModel())
+        return models[-1]
+
+    monkeypatch.setattr(llama_local, "model_pool", ModelPool(factory, 1))
+
+    async def run():
+        adapter = llama_local.TTSAdapter("hi", "tara")
+        await adapter.pull(4)
+        await adapter.reset()
+        return llama_local.model_pool.metrics["in_use"], models[0].running
+
+    assert asyncio.run(run()) == (0, False)
+
+
+def test_barge_in_silences_without_waiting_for_the_model_step(monkeypatch):
+    from Morpheus_Client.orchestrator.buffer import PlaybackBuffer
+    from Morpheus_Client.orchestrator.core import Orchestrator
+    from Morpheus_Client.tts_engine.model_pool import ModelPool
+
+    step_s = 0.5
+
+    class SlowStepModel(CountingModel):
+        def text_to_speech(self, prompt, voice):
+            self.running = True
+            try:
+                yield b"\x00\x00" * 4
+                while True:
+                    time.sleep(step_s)  # one model step, not interruptible
+                    yield b"\x00\x00" * 4
+            finally:
+                self.running = False
+
+    model = SlowStepModel()
+    monkeypatch.setattr(llama_local, "model_pool", ModelPool(lambda: model, 1))
+
+    async def run():
+        adapter = llama_local.TTSAdapter("hi", "tara")
+        orch = Orchestrator(adapter, PlaybackBuffer(capacity_ms=500))
+        async for _ in orch.stream():
+            asyncio.get_running_loop().call_later(0.05, orch.signal_barge_in)
+        silent = time.perf_counter()
+        await orch.settle()
+        settled = time.perf_counter()
+        stages = {evt["stage"]: evt for evt in orch.timeline}
+        return stages, settled - silent, llama_local.model_pool.metrics["in_use"]
+
+    stages, settle_s, in_use = asyncio.run(run())
+    assert stages["barge_in_silence"]["duration_ms"] < step_s * 1000 / 2
+    # the model step finished in the background before the lease returned
+    assert settle_s > step_s / 4
+    assert "barge_in_reset" in stages and in_use == 0 and not model.running
@@ -0,0 +1,104 @@
+import asyncio
+import gc
+
+from Morpheus_Client.tts_engine import llama_local
+from Morpheus_Client.tts_engine.llama_local import VoiceStateCache, _stream_from_model
+
+
+class StatefulModel:
+    def __init__(self, **_kwargs):
+        self.calls = []
+        self.tokens = []
+
+    def tokenize(self, text, add_bos=True, special=False):
+        return list(text)
+
+    def reset(self):
+        self.calls.append("reset")
+        self.tokens = []
+
+    def eval(self, tokens):
+        self.calls.append(("eval", bytes(tokens)))
+        self.tokens += tokens
+
+    def save_state(self):
+        return list(self.tokens)
+
+    def load_state(self, state):
+        self.calls.append("load_state")
+        self.tokens = list(state)
+
+    def text_to_speech(self, prompt, voice=None):
+        self.calls.append(("tts", prompt))
+        return iter([b"pcm", None])
+
+
+def test_prefix_is_evaluated_once_per_voice():
+    cache = VoiceStateCache(maxsize=4)
+    model = StatefulModel()
+    assert cache.prime(model, "tara")
+    assert cache.prime(model, "tara")
+    assert model.calls == ["reset", ("eval", b"<|audio|>tara:"), "load_state"]
+    assert model.tokens == list(b"<|audio|>tara:")
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_cache_is_bounded_and_skips_models_without_state_api():
+    cache = VoiceStateCache(maxsize=2)
+    model = StatefulModel()
+    for voice in ("tara", "leo", "zoe"):
+        cache.prime(model, voice)
+    assert len(cache) == 2
+    model.calls.clear()
+    cache.prime(model, "tara")  # evicted: evaluated again
+    assert ("eval", b"<|audio|>tara:") in model.calls
+    assert not cache.prime(object(), "tara")
+    assert not VoiceStateCache(maxsize=0).prime(model, "tara")
+
+
+def test_stream_primes_model_before_generation(monkeypatch):
+    monkeypatch.setattr(llama_local, "voice_states", VoiceStateCache())
+    model = StatefulModel()
+
+    async def run():
+        return [pcm async for pcm in _stream_from_model(model, "Hello", "tara")]
+
+    assert asyncio.run(run()) == [b"pcm"]
+    assert asyncio.run(run()) == [b"pcm"]
+    assert model.calls[-2:] == ["load_state", ("tts", "Hello")]
+
+
+def test_states_follow_the_model_object_not_its_id():
+    cache = VoiceStateCache(maxsize=4)
+    model = StatefulModel()
+    cache.prime(model, "tara")
+    del model
+    gc.collect()
+    assert len(cache) == 0  # a new model at the same address starts clean
+    other = StatefulModel()
+    cache.prime(other, "tara")
+    assert other.calls[:2] == ["reset", ("eval", b"<|audio|>tara:")]
+
+
+def test_pool_discarding_models_forgets_their_states(monkeypatch):
+    from Morpheus_Client.tts_engine.model_pool import ModelPool
+
+    cache = VoiceStateCache()
+    pool = ModelPool(StatefulModel, 1, on_discard=cache.forget)
+    monkeypatch.setattr(llama_local, "voice_states", cache)
+    monkeypatch.setattr(llama_local, "model_pool", pool)
+
+    async def speak():
+        adapter = llama_local.TTSAdapter("Hello", "tara")
+        while not (await adapter.pull(1024)).eos:
+            pass
+
+    async def run():
+        await speak()
+        assert len(cache) == 1
+        pool.close()  # the models are reloaded on the next lease
+        assert len(cache) == 0
+        await speak()
+        return cache.stats()
+
+    assert asyncio.run(run()) == {"entries": 1, "hits": 0, "misses": 2}
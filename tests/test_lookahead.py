@@ -0,0 +1,103 @@
+import asyncio
+
+from Morpheus_Client.orchestrator.lookahead import LookaheadPipeline
+
+
+async def _texts(*items):
+    for item in items:
+        yield item
+
+
+def test_next_message_synthesizes_while_current_is_emitted():
+    started = []
+
+    async def synthesize(text):
+        started.append(text)
+        for i in range(2):
+            await asyncio.sleep(0)
+            yield f"{text}{i}".encode()
+
+    async def run():
+        out = []
+
+        async def sink(pcm):
+            if pcm == b"a0":
+                # Emission of "a" is held until "b" is already in flight
+                while "b" not in started:
+                    await asyncio.sleep(0)
+            out.append(pcm)
+
+        await LookaheadPipeline(synthesize, depth=1).run(_texts("a", "b", "c"), sink)
+        return out
+
+    assert asyncio.run(run()) == [b"a0", b"a1", b"b0", b"b1", b"c0", b"c1"]
+
+
+def test_lookahead_is_bounded_by_depth():
+    started = []
+    release = None
+
+    async def synthesize(text):
+        started.append(text)
+        yield text.encode()
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+
+        async def sink(pcm):
+            await release.wait()
+
+        pipeline = LookaheadPipeline(synthesize, depth=2)
+        task = asyncio.create_task(pipeline.run(_texts("a", "b", "c", "d", "e"), sink))
+        for _ in range(20):
+            await asyncio.sleep(0)
+        in_flight = list(started)
+        release.set()
+        await task
+        return in_flight
+
+    assert asyncio.run(run()) == ["a", "b", "c"]  # current + 2 ahead
+    assert started == ["a", "b", "c", "d", "e"]
+
+
+def test_barge_in_cancels_current_and_lookahead():
+    cancelled = []
+
+    async def synthesize(text):
+        try:
+            yield f"{text}-start".encode()
+            if text != "c":
+                await asyncio.sleep(10)
+            yield f"{text}-end".encode()
+        finally:
+            cancelled.append(text)
+
+    async def run():
+        out = []
+        later = asyncio.Event()
+
+        async def texts():
+            yield "a"
+            yield "b"
+            await later.wait()
+            yield "c"
+
+        async def sink(pcm):
+            out.append(pcm)
+
+        pipeline = LookaheadPipeline(synthesize, depth=1)
+        task = asyncio.create_task(pipeline.run(texts(), sink))
+        while b"a-start" not in out:
+            await asyncio.sleep(0)
+        pipeline.barge_in()
+        later.set()
+        await asyncio.wait_for(task, 5)
+        return out, pipeline.metrics
+
+    out, metrics = asyncio.run(run())
+    assert out[0] == b"a-start"
+    assert b"a-end" not in out and b"b-end" not in out and b"b-start" not in out
+    assert out[-1] == b"c-end"  # messages after the barge-in still play
+    assert cancelled[:2] == ["a", "b"]
+    assert metrics["cancelled"] == 2 and metrics["barge_ins"] == 1
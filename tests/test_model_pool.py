@@ -0,0 +1,101 @@
+import asyncio
+import itertools
+
+import httpx
+import pytest
+
+import Morpheus_Client.server as server
+from Morpheus_Client.tts_engine.model_pool import ModelPool, PoolTimeout
+
+
+def _factory():
+    counter = itertools.count()
+    return lambda: f"model-{next(counter)}"
+
+
+def test_instances_are_created_lazily_and_leased_exclusively():
+    pool = ModelPool(_factory(), size=2)
+
+    async def run():
+        a = await pool.acquire()
+        b = await pool.acquire()
+        assert a != b
+        assert pool.metrics["loaded"] == 2 and pool.in_use == 2
+        pool.release(a)
+        c = await pool.acquire()
+        assert c == a  # reused, not reloaded
+        pool.release(b)
+        pool.release(c)
+
+    asyncio.run(run())
+    assert pool.metrics["loaded"] == 2
+
+
+def test_waiters_are_served_in_arrival_order():
+    pool = ModelPool(_factory(), size=1)
+    served = []
+
+    async def worker(name):
+        async with pool.lease():
+            served.append(name)
+            await asyncio.sleep(0)
+
+    async def run():
+        first = await pool.acquire()
+        tasks = []
+        for name in "abc":
+            tasks.append(asyncio.create_task(worker(name)))
+            await asyncio.sleep(0)
+        assert pool.metrics["waiting"] == 3
+        pool.release(first)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert served == ["a", "b", "c"]
+    assert pool.metrics["waited"] == 3
+    assert pool.metrics["mean_wait_ms"] > 0
+
+
+def test_acquire_timeout_and_handover():
+    pool = ModelPool(_factory(), size=1, acquire_timeout=0.01)
+
+    async def run():
+        held = await pool.acquire()
+        with pytest.raises(PoolTimeout):
+            await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire(timeout=5))
+        await asyncio.sleep(0)
+        pool.release(held)
+        return held, await waiter
+
+    held, next_lease = asyncio.run(run())
+    assert next_lease == held
+    assert pool.metrics["timeouts"] == 1
+
+
+def test_close_reloads_instances_for_waiters():
+    closed, discarded = [], []
+    pool = ModelPool(
+        _factory(), size=1, on_close=lambda: closed.append(True), on_discard=discarded.append
+    )
+
+    async def run():
+        old = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        pool.close()
+        pool.release(old)
+        return old, await asyncio.wait_for(waiter, 5)
+
+    old, new = asyncio.run(run())
+    assert closed and old != new and discarded == [old]
+
+
+def test_stats_reports_pool_metrics():
+    async def fetch():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/stats")
+
+    pool = asyncio.run(fetch()).json()["model_pool"]
+    assert {"size", "in_use", "waiting", "utilization", "mean_wait_ms"} <= set(pool)
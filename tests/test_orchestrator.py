@@ -51,12 +51,40 @@ def test_barge_in_resets_adapter():
     async def run():
         async for _ in orch.stream():
             orch.signal_barge_in()
+        await orch.settle()
 
     asyncio.run(run())
     assert adapter.reset_called
     assert buffer.depth_ms == 0
 
 
+def test_barge_in_cancels_pending_pull():
+    class SlowAdapter(DummyAdapter):
+        cancelled = False
+
+        async def pull(self, _size):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+
+    adapter = SlowAdapter([])
+    orch = Orchestrator(adapter, PlaybackBuffer(capacity_ms=500), ChunkLadder())
+
+    async def run():
+        asyncio.get_running_loop().call_later(0.01, orch.signal_barge_in)
+        out = [c async for c in orch.stream()]
+        await orch.settle()
+        return out
+
+    assert asyncio.run(asyncio.wait_for(run(), 1)) == []
+    assert adapter.cancelled and adapter.reset_called
+    stages = [evt["stage"] for evt in orch.timeline]
+    assert stages == ["adapter_pull", "barge_in_silence", "barge_in_reset"]
+    assert orch.timeline[0]["result"] == "interrupted"
+
+
 def test_timeline_records_events():
     chunk = AudioChunk(pcm=b"", duration_ms=10, eos=True)
     adapter = DummyAdapter([chunk])
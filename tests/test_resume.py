@@ -0,0 +1,250 @@
+import asyncio
+import json
+
+import pytest
+
+import Morpheus_Client.server as server
+from Morpheus_Client.cache import UtteranceCache
+from Morpheus_Client.config import ConfigStore
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.orchestrator.admission import AdmissionController
+from Morpheus_Client.orchestrator.scheduler import SynthesisScheduler
+from Morpheus_Client.resume import ResumableStreams, SpillBuffer, StreamFailed
+from Morpheus_Client.tts_engine.adapter_registry import VoiceSchema, _AdapterSpec
+
+
+def test_spill_buffer_bounds_memory_and_reads_across_the_spill():
+    buffer = SpillBuffer(memory_bytes=100)
+    data = bytes(range(256)) * 4
+    for start in range(0, len(data), 30):
+        buffer.append(data[start : start + 30])
+        assert buffer.size - buffer.spilled <= 100
+    assert buffer.size == len(data) and buffer.spilled > 0
+
+    for offset in (0, 7, buffer.spilled - 3, buffer.spilled, len(data) - 1):
+        out = b""
+        while len(out) < len(data) - offset:
+            out += buffer.read(offset + len(out), limit=16)
+        assert out == data[offset:]
+    assert buffer.read(len(data)) == b""
+    buffer.close()
+    assert buffer.size == 0
+
+
+def test_spill_file_is_capped():
+    buffer = SpillBuffer(memory_bytes=100, spill_bytes=150)
+    with pytest.raises(BufferError):
+        for _ in range(20):
+            buffer.append(b"x" * 30)
+    assert buffer.spilled <= 150
+    assert buffer.size - buffer.spilled <= 100 + 30  # the refused append is kept
+
+
+async def _counting_source(produced, closed, n=5, delay=0.01):
+    try:
+        for i in range(n):
+            await asyncio.sleep(delay)
+            produced.append(i)
+            yield bytes([i]) * 10
+    finally:
+        closed.append(True)
+
+
+def test_generation_continues_while_detached_and_resumes_at_offset():
+    produced, closed = [], []
+
+    async def run():
+        streams = ResumableStreams(ttl_s=5.0, memory_bytes=16)
+        stream = streams.open("s1", _counting_source(produced, closed), header=b"HDR")
+        reader = stream.read(0)
+        first = await reader.__anext__() + await reader.__anext__()
+        await reader.aclose()  # client gone
+        while not stream.done:
+            await asyncio.sleep(0.01)
+        rest = b""
+        async for data in streams.resume("s1", len(first)).read(len(first)):
+            rest += data
+        return first + rest, streams
+
+    received, streams = asyncio.run(run())
+    assert received == b"HDR" + b"".join(bytes([i]) * 10 for i in range(5))
+    assert produced == [0, 1, 2, 3, 4] and closed == [True]
+    assert "s1" not in streams.streams  # delivered completely
+    assert streams.metrics["completed"] == 1 and streams.metrics["resumed"] == 1
+
+
+def test_detached_stream_expires_and_stops_generation():
+    produced, closed = [], []
+
+    async def run():
+        streams = ResumableStreams(ttl_s=0.03)
+        stream = streams.open("s1", _counting_source(produced, closed, n=100))
+        await asyncio.sleep(0.1)
+        return stream, streams
+
+    stream, streams = asyncio.run(run())
+    assert closed == [True] and len(produced) < 100
+    assert streams.resume("s1", 0) is None and streams.metrics["expired"] == 1
+
+
+def test_failed_generation_is_not_delivered_as_complete():
+    async def failing():
+        yield b"a" * 10
+        raise RuntimeError("model crashed")
+
+    async def run():
+        streams = ResumableStreams(ttl_s=5.0)
+        stream = streams.open("s1", failing())
+        received = b""
+        with pytest.raises(StreamFailed, match="model crashed"):
+            async for data in stream.read(0):
+                received += data
+        again = streams.resume("s1", len(received))
+        with pytest.raises(StreamFailed):
+            async for _ in again.read(len(received)):
+                pass
+        return received, streams
+
+    received, streams = asyncio.run(run())
+    assert received == b"a" * 10
+    assert streams.metrics["failed"] == 1 and streams.metrics["completed"] == 0
+
+
+def test_duplicate_session_id_is_rejected():
+    produced, closed = [], []
+
+    async def run():
+        streams = ResumableStreams(ttl_s=5.0)
+        stream = streams.open("s1", _counting_source(produced, closed))
+        with pytest.raises(KeyError):
+            streams.open("s1", _counting_source([], []))
+        received = b""
+        async for data in stream.read(0):
+            received += data
+        return received, streams
+
+    received, streams = asyncio.run(run())
+    assert len(received) == 50 and closed == [True]
+    assert streams.metrics["rejected"] == 1 and streams.metrics["expired"] == 0
+
+
+class SlowAdapter:
+    instances = []
+
+    def __init__(self, prompt, voice=None, **_):
+        self.left = 6
+        self.resets = 0
+        type(self).instances.append(self)
+
+    async def pull(self, _size):
+        await asyncio.sleep(0.01)
+        self.left -= 1
+        return AudioChunk(pcm=bytes([self.left]) * 480, duration_ms=10.0, eos=not self.left)
+
+    async def reset(self):
+        self.resets += 1
+
+
+def _ws(query, receive, send):
+    scope = {
+        "type": "websocket", "path": "/ws/tts", "raw_path": b"/ws/tts",
+        "query_string": query.encode(), "headers": [], "scheme": "ws",
+        "server": ("test", 80), "client": ("test", 1), "root_path": "", "subprotocols": [],
+    }
+    return server.app(scope, receive, send)
+
+
+def _client(frames, leave_after=None, closes=None):
+    """ASGI receive/send pair that disconnects after ``leave_after`` frames.
+
+    Close codes sent by the server are appended to ``closes``.
+    """
+
+    left = asyncio.Event()
+    state = {"connected": False}
+
+    async def receive():
+        if not state["connected"]:
+            state["connected"] = True
+            return {"type": "websocket.connect"}
+        await left.wait()
+        return {"type": "websocket.disconnect", "code": 1006}
+
+    async def send(message):
+        if message["type"] == "websocket.send":
+            frames.append(message.get("bytes") or message.get("text"))
+            if leave_after is not None and len(frames) >= leave_after:
+                left.set()
+        elif message["type"] == "websocket.close":
+            if closes is not None:
+                closes.append(message.get("code"))
+            left.set()
+
+    return receive, send
+
+
+def _serve(monkeypatch, adapter):
+    spec = _AdapterSpec(adapter, lambda: {"name": "slow"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "slow", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="slow", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=0))
+    monkeypatch.setattr(server, "scheduler", SynthesisScheduler(1))
+    monkeypatch.setattr(server, "admission", AdmissionController(1))
+    monkeypatch.setattr(server, "resumable_streams", ResumableStreams(ttl_s=5.0))
+
+
+def test_ws_reconnect_resumes_without_resynthesis(monkeypatch):
+    SlowAdapter.instances = []
+    _serve(monkeypatch, SlowAdapter)
+
+    async def run():
+        first, second, expired = [], [], []
+        await asyncio.wait_for(_ws("prompt=Hi&session=s1", *_client(first, leave_after=2)), 2)
+        offset = sum(map(len, first))
+        await asyncio.wait_for(_ws(f"prompt=Hi&session=s1&offset={offset}", *_client(second)), 2)
+        await asyncio.wait_for(_ws("session=s1&offset=0", *_client(expired)), 2)
+        return first, second, expired
+
+    first, second, expired = asyncio.run(run())
+    audio = b"".join(first + second)
+    assert audio[:44] == server.riff_header(server.SAMPLE_RATE)
+    assert audio[44:] == b"".join(bytes([i]) * 480 for i in reversed(range(6)))
+    assert len(SlowAdapter.instances) == 1 and SlowAdapter.instances[0].resets == 0
+    assert json.loads(expired[0])["type"] == "error"  # released after full delivery
+
+
+def test_ws_failed_generation_closes_with_error(monkeypatch):
+    class BrokenAdapter(SlowAdapter):
+        async def pull(self, size):
+            if self.left == 4:
+                raise RuntimeError("model crashed")
+            return await super().pull(size)
+
+    _serve(monkeypatch, BrokenAdapter)
+
+    async def run():
+        frames, closes = [], []
+        await asyncio.wait_for(_ws("prompt=Hi&session=s1", *_client(frames, closes=closes)), 2)
+        return frames, closes
+
+    frames, closes = asyncio.run(run())
+    assert json.loads(frames[-1])["type"] == "error" and closes == [1011]
+    assert b"".join(frames[:-1])[44:] == bytes([5]) * 480 + bytes([4]) * 480
+
+
+def test_ws_duplicate_session_is_rejected(monkeypatch):
+    SlowAdapter.instances = []
+    _serve(monkeypatch, SlowAdapter)
+
+    async def run():
+        first, dup, closes = [], [], []
+        owner = asyncio.ensure_future(_ws("prompt=Hi&session=s1", *_client(first)))
+        await asyncio.sleep(0.02)
+        await asyncio.wait_for(_ws("prompt=Other&session=s1", *_client(dup, closes=closes)), 2)
+        await asyncio.wait_for(owner, 2)
+        return first, dup, closes
+
+    first, dup, closes = asyncio.run(run())
+    assert json.loads(dup[0])["type"] == "error" and closes == [1008]
+    assert len(SlowAdapter.instances) == 1
+    assert b"".join(first)[44:] == b"".join(bytes([i]) * 480 for i in reversed(range(6)))
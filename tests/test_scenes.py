@@ -14,6 +14,9 @@ import pytest
 
 from scenes import barge_in, breathing_room, long_read, mid_stream_swap
 
+# Longest acceptable time from barge-in signal to silence
+BARGE_IN_LATENCY_MS = 50.0
+
 
 @pytest.fixture
 def artifact_dir(tmp_path):
@@ -80,3 +83,5 @@ def test_barge_in(artifact_dir):
     assert wav_path.exists()
     assert info["reset_called"]
     assert len(info["timeline"]) < info["planned_chunks"]
+    # The interrupted pull is cancelled, not awaited for its 200 ms step
+    assert info["barge_in_latency_ms"] < BARGE_IN_LATENCY_MS < info["step_ms"]
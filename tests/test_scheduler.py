@@ -0,0 +1,216 @@
+import asyncio
+
+import pytest
+
+import Morpheus_Client.server as server
+from Morpheus_Client.cache import UtteranceCache
+from Morpheus_Client.config import ConfigStore
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.orchestrator.scheduler import SynthesisScheduler
+from Morpheus_Client.tts_engine.adapter_registry import VoiceSchema, _AdapterSpec
+
+
+def test_dispatch_by_class_then_earliest_deadline():
+    async def run():
+        scheduler = SynthesisScheduler(1)
+        order = []
+
+        async def work(name, priority, deadline_ms):
+            async with scheduler.job(priority, deadline_ms).slot():
+                order.append(name)
+                await asyncio.sleep(0)
+
+        holder = scheduler.job("batch")
+        async with holder.slot():
+            tasks = [
+                asyncio.create_task(work("batch", "batch", 10)),
+                asyncio.create_task(work("rest-late", "streaming", 5000)),
+                asyncio.create_task(work("rest-early", "streaming", 100)),
+                asyncio.create_task(work("ws", "interactive", 5000)),
+            ]
+            await asyncio.sleep(0.01)
+            assert scheduler.metrics["classes"]["streaming"]["waiting"] == 2
+        await asyncio.gather(*tasks)
+        return order, scheduler.metrics
+
+    order, metrics = asyncio.run(run())
+    assert order == ["ws", "rest-early", "rest-late", "batch"]
+    streaming = metrics["classes"]["streaming"]
+    assert streaming["dispatched"] == 2 and streaming["mean_wait_ms"] > 0
+    assert metrics["in_use"] == 0
+
+
+def test_cancelled_waiter_frees_its_place():
+    async def run():
+        scheduler = SynthesisScheduler(1)
+        holder = scheduler.job()
+        async with holder.slot():
+            waiter = asyncio.create_task(scheduler.job("interactive").slot().__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        async with scheduler.job("batch").slot():
+            return scheduler.metrics
+
+    metrics = asyncio.run(run())
+    assert metrics["in_use"] == 1 and metrics["classes"]["interactive"]["dispatched"] == 0
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        SynthesisScheduler(1).job("urgent")
+
+
+def test_interactive_request_preempts_batch_at_sentence_boundary(monkeypatch):
+    started = []
+    release = {}
+
+    class GatedAdapter:
+        def __init__(self, prompt, voice=None, **_):
+            started.append(prompt)
+            self.prompt = prompt
+            self.done = False
+
+        async def pull(self, _size):
+            if self.done:
+                return AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+            await release.setdefault(self.prompt, asyncio.Event()).wait()
+            self.done = True
+            return AudioChunk(pcm=b"\x01\x00" * 4, duration_ms=1.0)
+
+        async def reset(self):
+            self.done = True
+
+    spec = _AdapterSpec(GatedAdapter, lambda: {"name": "gated"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "gated", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="gated", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=0))
+    monkeypatch.setattr(server, "scheduler", SynthesisScheduler(1))
+    monkeypatch.delenv("ORPHEUS_CACHE_SENTENCES", raising=False)
+
+    async def drain(stream):
+        async for _ in stream:
+            pass
+
+    async def run():
+        bulk = "The first bulk sentence is here. The second bulk sentence follows."
+        batch = asyncio.create_task(drain(server.orchestrated_pcm_stream(bulk, None, priority="batch")))
+        while not started:
+            await asyncio.sleep(0)
+        live = asyncio.create_task(
+            drain(server.orchestrated_pcm_stream("Hello there.", None, priority="interactive"))
+        )
+        await asyncio.sleep(0.01)
+        for prompt in ("The first bulk sentence is here.", "Hello there.", "The second bulk sentence follows."):
+            release.setdefault(prompt, asyncio.Event()).set()
+        await asyncio.gather(batch, live)
+
+    asyncio.run(run())
+    assert started == [
+        "The first bulk sentence is here.",
+        "Hello there.",
+        "The second bulk sentence follows.",
+    ]
+    classes = server.scheduler.metrics["classes"]
+    assert classes["batch"]["preemptions"] == 1
+    assert classes["interactive"]["dispatched"] == 1
+
+
+def test_long_streaming_prompt_is_preempted_at_a_batch_boundary(monkeypatch):
+    started = []
+    release = {}
+
+    class GatedAdapter:
+        def __init__(self, prompt, voice=None, **_):
+            started.append(prompt)
+            self.prompt = prompt
+            self.done = False
+
+        async def pull(self, _size):
+            if self.done:
+                return AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+            await release.setdefault(self.prompt, asyncio.Event()).wait()
+            self.done = True
+            return AudioChunk(pcm=b"\x01\x00" * 4, duration_ms=1.0)
+
+        async def reset(self):
+            self.done = True
+
+    spec = _AdapterSpec(GatedAdapter, lambda: {"name": "gated"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "gated", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="gated", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=0))
+    monkeypatch.setattr(server, "scheduler", SynthesisScheduler(2))
+    monkeypatch.delenv("ORPHEUS_CACHE_SENTENCES", raising=False)
+    bulk = [f"Bulk sentence number {i} goes right here." for i in range(4)]
+
+    async def drain(stream):
+        async for _ in stream:
+            pass
+
+    async def run():
+        long = asyncio.create_task(
+            drain(
+                server.orchestrated_pcm_stream(
+                    " ".join(bulk), None, use_batching=True, max_batch_chars=40
+                )
+            )
+        )
+        while len(started) < 2:  # the first two batches fill both slots
+            await asyncio.sleep(0)
+        live = asyncio.create_task(
+            drain(server.orchestrated_pcm_stream("Hello there.", None, priority="interactive"))
+        )
+        await asyncio.sleep(0.01)
+        release[bulk[0]].set()
+        while len(started) < 3:
+            await asyncio.sleep(0)
+        for prompt in bulk[1:] + ["Hello there."]:
+            release.setdefault(prompt, asyncio.Event()).set()
+        await asyncio.gather(long, live)
+
+    asyncio.run(asyncio.wait_for(run(), 2))
+    assert started[:3] == [bulk[0], bulk[1], "Hello there."]
+    assert sorted(started[3:]) == bulk[2:]
+    classes = server.scheduler.metrics["classes"]
+    assert classes["streaming"]["preemptions"] >= 1
+    assert server.scheduler.metrics["in_use"] == 0
+
+
+def test_batched_prompt_takes_one_slot_per_batch(monkeypatch):
+    seen = []
+
+    class RecordingAdapter:
+        def __init__(self, prompt, voice=None, **_):
+            seen.append((prompt, server.scheduler.metrics["in_use"]))
+
+        async def pull(self, _size):
+            return AudioChunk(pcm=b"\x01\x00", duration_ms=1.0, eos=True)
+
+        async def reset(self):
+            pass
+
+    spec = _AdapterSpec(RecordingAdapter, lambda: {"name": "rec"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "rec", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="rec", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=0))
+    monkeypatch.setattr(server, "scheduler", SynthesisScheduler(3))
+    monkeypatch.delenv("ORPHEUS_CACHE_SENTENCES", raising=False)
+
+    async def run():
+        text = "A sentence long enough to batch. " * 4
+        async with server.scheduler.job("interactive").slot():  # one slot is busy
+            async for _ in server.orchestrated_pcm_stream(
+                text, None, use_batching=True, max_batch_chars=40
+            ):
+                pass
+            async for _ in server.orchestrated_pcm_stream("Short one.", None, use_batching=True):
+                pass
+
+    asyncio.run(run())
+    assert [prompt for prompt, _ in seen] == ["A sentence long enough to batch."] * 4 + ["Short one."]
+    # Each batch runs under a slot of its own, never more than are free
+    assert all(2 <= in_use <= 3 for _, in_use in seen)
+    assert server.scheduler.metrics["classes"]["streaming"]["dispatched"] == 5
+    assert server.scheduler.metrics["in_use"] == 0
@@ -0,0 +1,71 @@
+import time
+
+from text_sources.segmenter import MAX_CHARS, SentenceSegmenter, split_sentences
+
+TEXT = (
+    'Dr. Smith paid $3.50 for it. Then he left! Was it worth it? '
+    "J. K. Rowling wrote e.g. novels... and more.\n\nA paragraph without a stop"
+)
+EXPECTED = [
+    "Dr. Smith paid $3.50 for it.",
+    "Then he left!",
+    "Was it worth it?",
+    "J. K. Rowling wrote e.g. novels... and more.",
+    "A paragraph without a stop",
+]
+
+
+def test_split_handles_abbreviations_numbers_and_paragraphs():
+    assert split_sentences(TEXT) == EXPECTED
+
+
+def test_streamed_deltas_match_whole_text_and_close_early():
+    for size in (1, 2, 5, 17):
+        segmenter = SentenceSegmenter()
+        out = []
+        for i in range(0, len(TEXT), size):
+            out.extend(segmenter.feed(TEXT[i : i + size]))
+        out.extend(segmenter.flush())
+        assert out == EXPECTED
+
+    segmenter = SentenceSegmenter()
+    assert segmenter.feed("Hello there.") == []  # may still be "there.5"
+    assert segmenter.feed(" Next") == ["Hello there."]
+    assert segmenter.pending_chars == len(" Next")
+    assert segmenter.flush() == ["Next"]
+
+
+def test_min_chars_merges_short_sentences():
+    assert split_sentences("Hi. Hello there my friend. Ok.", min_chars=20) == [
+        "Hi. Hello there my friend.",
+        "Ok.",
+    ]
+
+
+def test_max_chars_cuts_unpunctuated_text_at_word_breaks():
+    seg = SentenceSegmenter(max_chars=30)
+    out = []
+    for word in ("lorem ipsum dolor sit amet " * 6).split(" "):
+        out += seg.feed(word + " ")
+        assert seg.pending_chars <= 30 + 7
+    out += seg.feed("x" * 50)
+    assert seg.pending_chars == 0  # an overlong word is cut as well
+    out += seg.flush()
+    assert all(len(s) <= 30 + 7 for s in out[:-1])
+    assert " ".join(out).split() == ("lorem ipsum dolor sit amet " * 6 + "x" * 50).split()
+
+
+def test_unbroken_text_is_not_rescanned_per_delta():
+    seg = SentenceSegmenter(max_chars=0)
+    start = time.perf_counter()
+    for _ in range(40000):
+        assert seg.feed("x") == []
+    assert seg.feed("!") == [] and seg.feed(" Next") == ["x" * 40000 + "!"]
+    assert time.perf_counter() - start < 2.0  # was quadratic: ~15s
+
+    # Any whitespace can complete a boundary, and the default cap bounds the buffer
+    seg = SentenceSegmenter()
+    assert seg.feed("It ends here.") == [] and seg.feed("\tNext") == ["It ends here."]
+    seg = SentenceSegmenter()
+    out = [s for _ in range(MAX_CHARS + 10) for s in seg.feed("y")]
+    assert seg.pending_chars <= MAX_CHARS and out == ["y" * (MAX_CHARS + 1)]
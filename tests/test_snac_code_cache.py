@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from Morpheus_Client.cache import UtteranceCache, pack_codes, unpack_codes
+from Morpheus_Client.tts_engine import remote_backend, speechpipe
+
+
+def _token(code, index):
+    return f"<custom_token_{code + 10 + (index % 7) * 4096}>"
+
+
+async def _tokens(codes):
+    for index, code in enumerate(codes):
+        yield _token(code, index)
+
+
+async def _finished(tokens, outcome):
+    async for token in tokens:
+        yield token
+    outcome["complete"] = True
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.fixture
+def fake_snac(monkeypatch):
+    monkeypatch.setattr(
+        speechpipe, "convert_to_audio", lambda frames, count: bytes(f % 256 for f in frames)
+    )
+
+
+def test_pack_roundtrip_is_compact():
+    codes = [1, 4096, 17, 2048, 5, 6, 7] * 10
+    data = pack_codes(codes)
+    assert unpack_codes(data) == codes
+    assert len(data) == 4 + 2 * len(codes)
+    with pytest.raises(ValueError):
+        pack_codes([4097])
+    with pytest.raises(ValueError):
+        unpack_codes(b"PCM!" + data[4:])
+
+
+def test_decoding_stored_codes_matches_live_decode(fake_snac):
+    codes = [(i * 37) % 4000 + 1 for i in range(70)]
+    captured = []
+    live = asyncio.run(_collect(speechpipe.tokens_decoder(_tokens(codes), captured)))
+    assert captured == codes
+    assert asyncio.run(_collect(speechpipe.decode_codes(unpack_codes(pack_codes(captured))))) == live
+
+
+def test_remote_prompt_hit_skips_token_generation(fake_snac, monkeypatch):
+    codes = [(i * 11) % 4000 + 1 for i in range(35)]
+    calls = []
+
+    def fake_tokens(**kwargs):
+        calls.append(kwargs["prompt"])
+        return _finished(_tokens(codes), kwargs["outcome"])
+
+    monkeypatch.setattr(remote_backend, "generate_tokens_from_api", fake_tokens)
+    monkeypatch.setattr(remote_backend, "code_cache", UtteranceCache(memory_bytes=4096, suffix=".snac"))
+
+    def speak():
+        return asyncio.run(_collect(remote_backend._decode_prompt("Hello.", "tara", 0.6, 0.9, 100)))
+
+    first = speak()
+    second = speak()
+    assert first == second
+    assert calls == ["Hello."]
+    assert remote_backend.code_cache.stats()["memory"]["bytes"] == 4 + 2 * len(codes)
+
+
+def test_only_clean_single_runs_are_cached(fake_snac, monkeypatch):
+    codes = [(i * 11) % 4000 + 1 for i in range(35)]
+    runs = []
+
+    async def restarted(outcome):
+        # A timeout after 10 tokens: the retry starts generation over
+        async for token in _tokens(codes[:10]):
+            yield token
+        yield speechpipe.STREAM_RESTART
+        async for token in _finished(_tokens(codes), outcome):
+            yield token
+
+    async def truncated(outcome):
+        async for token in _tokens(codes[:21]):
+            yield token  # retries exhausted: ends without completing
+
+    def fake_tokens(**kwargs):
+        return runs.pop(0)(kwargs["outcome"])
+
+    monkeypatch.setattr(remote_backend, "generate_tokens_from_api", fake_tokens)
+    monkeypatch.setattr(remote_backend, "code_cache", UtteranceCache(memory_bytes=4096, suffix=".snac"))
+
+    def speak():
+        asyncio.run(_collect(remote_backend._decode_prompt("Hello.", "tara", 0.6, 0.9, 100)))
+        return asyncio.run(remote_backend.code_cache.get(
+            remote_backend.utterance_key(
+                "Hello.", voice="tara", adapter="remote", temperature=0.6, top_p=0.9, max_tokens=100
+            )
+        ))
+
+    runs.append(truncated)
+    assert speak() is None
+    runs.append(restarted)
+    assert unpack_codes(speak()) == codes
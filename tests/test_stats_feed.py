@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import Morpheus_Client.server as server
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.orchestrator.buffer import PlaybackBuffer
+from Morpheus_Client.orchestrator.chunk_ladder import ChunkLadder
+from Morpheus_Client.orchestrator.core import Orchestrator
+from Morpheus_Client.stats_feed import StatsFeed
+
+
+class OneChunkAdapter:
+    async def pull(self, _size):
+        return AudioChunk(pcm=b"\x00\x00", duration_ms=1.0, eos=True)
+
+    async def reset(self):
+        pass
+
+
+def _event(stage, ms):
+    return {"stage": stage, "duration_ms": ms, "result": "ok"}
+
+
+def test_frames_carry_only_new_events_and_idle_ticks_publish_nothing():
+    feed = StatsFeed(lambda: {"sessions": 0})
+    for ms in range(1, 101):
+        feed.record(_event("adapter_pull", float(ms)))
+    assert feed.publish()
+    frame = json.loads(feed.frame)
+    assert len(frame["events"]) == 100
+    assert frame["percentiles"]["adapter_pull"] == {
+        "p50": 50.0, "p95": 95.0, "p99": 99.0, "count": 100
+    }
+    assert not feed.publish()  # nothing changed since the last frame
+    feed.record(_event("cancel_reset", 2.0))
+    assert feed.publish()
+    frame = json.loads(feed.frame)
+    assert [e["stage"] for e in frame["events"]] == ["cancel_reset"]
+    assert set(frame["percentiles"]) == {"adapter_pull", "cancel_reset"}
+
+
+def test_subscribers_share_one_serialized_frame():
+    serialized = []
+
+    def gauges():
+        serialized.append(None)
+        return {"n": len(serialized)}
+
+    async def run():
+        feed = StatsFeed(gauges, interval_s=0.02)
+        subs = [feed.subscribe() for _ in range(50)]
+        streams = [s.__aiter__() for s in subs]
+        firsts = await asyncio.gather(*(s.__anext__() for s in streams))
+        seconds = await asyncio.gather(*(s.__anext__() for s in streams))
+        for stream in streams:
+            await stream.aclose()
+        await asyncio.sleep(0)
+        return feed, firsts, seconds
+
+    feed, firsts, seconds = asyncio.run(run())
+    assert all(f is firsts[0] for f in firsts) and all(f is seconds[0] for f in seconds)
+    assert len(serialized) == feed.metrics["frames"] == 2
+    assert feed.metrics["subscribers"] == 0 and feed._ticker is None
+
+
+def test_slow_subscriber_receives_latest_frame_only():
+    async def run():
+        ticks = iter(range(1000))
+        feed = StatsFeed(lambda: {"tick": next(ticks)}, interval_s=0.01)
+        stream = feed.subscribe().__aiter__()
+        first = json.loads(await stream.__anext__())
+        await asyncio.sleep(0.1)
+        latest = json.loads(await stream.__anext__())
+        published = feed.seq
+        await stream.aclose()
+        return first, latest, published, feed.metrics
+
+    first, latest, published, metrics = asyncio.run(run())
+    assert latest["seq"] > first["seq"] + 1
+    assert latest["seq"] >= published - 1
+    assert metrics["coalesced_frames"] == latest["seq"] - first["seq"] - 1
+
+
+def test_orchestrator_forwards_timeline_events():
+    feed = StatsFeed()
+
+    async def run():
+        orch = Orchestrator(
+            OneChunkAdapter(), PlaybackBuffer(capacity_ms=500), ChunkLadder(), on_record=feed.record
+        )
+        async for _ in orch.stream():
+            pass
+        return orch.timeline
+
+    timeline = asyncio.run(run())
+    assert feed.metrics["events"] == len(timeline) == 1
+    assert feed.publish()
+    assert json.loads(feed.frame)["events"][0]["stage"] == "adapter_pull"
+
+
+def test_stats_websocket_pushes_frames(monkeypatch):
+    monkeypatch.setattr(server, "stats_feed", StatsFeed(server._stats_gauges, interval_s=0.01))
+    received = []
+    done = asyncio.Event()
+    connected = []
+
+    async def receive():
+        if not connected:
+            connected.append(None)
+            return {"type": "websocket.connect"}
+        await done.wait()
+        return {"type": "websocket.disconnect", "code": 1001}
+
+    async def send(message):
+        if message["type"] == "websocket.send":
+            received.append(json.loads(message["text"]))
+            server.stats_feed.record(_event("adapter_pull", 5.0))
+            if len(received) == 3:
+                done.set()
+
+    scope = {
+        "type": "websocket", "path": "/ws/stats", "raw_path": b"/ws/stats",
+        "query_string": b"", "headers": [], "scheme": "ws",
+        "server": ("test", 80), "client": ("test", 1), "root_path": "", "subprotocols": [],
+    }
+
+    asyncio.run(asyncio.wait_for(server.app(scope, receive, send), 2))
+    assert [f["seq"] for f in received] == [1, 2, 3]
+    assert received[0]["gauges"]["dashboards"] == 1
+    assert received[1]["events"][0]["stage"] == "adapter_pull"
+    assert server.stats_feed.metrics["subscribers"] == 0
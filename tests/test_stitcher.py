@@ -50,3 +50,37 @@ def test_stitch_optional_markers():
     # markers propagated when enabled
     out = asyncio.run(collect_chunks(stitch_chunks(gen(), sample_rate=sample_rate, emit_markers=True)))
     assert [c.markers for c in out] == ["A", "B"]
+
+
+def test_stitch_crossfades_only_at_seams():
+    sample_rate = 1000
+    a = AudioChunk(pcm=pcm_from_ints([0,1,2,3]), duration_ms=4, markers="start")
+    b = AudioChunk(pcm=pcm_from_ints([4,5,6,7]), duration_ms=4)
+    c = AudioChunk(pcm=pcm_from_ints([7,6,5,4]), duration_ms=4, markers="start", eos=True)
+
+    async def gen():
+        yield a
+        yield b
+        yield c
+
+    out = asyncio.run(collect_chunks(stitch_chunks(
+        gen(), sample_rate=sample_rate, overlap_ms=2, seam=lambda ch: ch.markers == "start"
+    )))
+    pcm = np.frombuffer(b''.join(ch.pcm for ch in out), dtype=np.int16)
+    # a|b joined untouched, b|c crossfaded over 2 samples
+    assert list(pcm) == [0,1,2,3,4,5,6,6,5,4]
+
+
+def test_stitch_drops_held_tail_when_interrupted():
+    sample_rate = 1000
+    a = AudioChunk(pcm=pcm_from_ints([0,1,2,3]), duration_ms=4)
+
+    async def gen():
+        yield a  # ends without eos, as after a barge-in
+
+    out = asyncio.run(collect_chunks(stitch_chunks(gen(), sample_rate=sample_rate, overlap_ms=2)))
+    assert b''.join(ch.pcm for ch in out) == pcm_from_ints([0,1,2,3])
+    out = asyncio.run(collect_chunks(stitch_chunks(
+        gen(), sample_rate=sample_rate, overlap_ms=2, drop_partial=True
+    )))
+    assert b''.join(ch.pcm for ch in out) == pcm_from_ints([0,1])
@@ -40,7 +40,7 @@ def test_http_poll_source():
 
     transport = httpx.MockTransport(handler)
     client = httpx.AsyncClient(transport=transport)
-    source = HTTPPollingSource("http://test", client=client)
+    source = HTTPPollingSource("http://test", client=client, min_interval=0, max_idle_polls=1)
 
     async def run():
         out = []
@@ -51,6 +51,73 @@ def test_http_poll_source():
     assert asyncio.run(run()) == ["first", "second"]
 
 
+def test_http_poll_conditional_dedup_and_end_of_feed():
+    seen_headers: list[dict] = []
+    responses = [
+        httpx.Response(200, text="hello", headers={"ETag": '"v1"'}),
+        httpx.Response(304),
+        httpx.Response(200, text="hello"),  # repeated body without validators
+        httpx.Response(200, text="world", headers={"ETag": '"v2"'}),
+        httpx.Response(410),
+    ]
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        return responses.pop(0)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    source = HTTPPollingSource("http://test", client=client, min_interval=0, long_poll=5)
+
+    async def run():
+        return [msg async for msg in source.stream()]
+
+    assert asyncio.run(run()) == ["hello", "world"]
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    assert seen_headers[4]["if-none-match"] == '"v2"'
+    assert seen_headers[0]["prefer"] == "wait=5"
+    assert source.metrics["requests"] == 5
+    assert source.metrics["not_modified"] == 1
+    assert source.metrics["duplicates"] == 1
+    assert source.efficiency == len("helloworld") / 5
+
+
+def test_http_poll_retry_after_is_a_floor(monkeypatch):
+    from text_sources import http_poll
+
+    waits = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(http_poll.asyncio, "sleep", fake_sleep)
+
+    def run():
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(503, headers={"Retry-After": "1"}),
+            httpx.Response(200, text="hello"),
+            httpx.Response(410),
+        ]
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: responses.pop(0)))
+        source = HTTPPollingSource("http://test", client=client, min_interval=0.5, backoff=2.0)
+
+        async def collect():
+            return [msg async for msg in source.stream()]
+
+        waits.clear()
+        assert asyncio.run(collect()) == ["hello"]
+        return list(waits)
+
+    # Never shorter than Retry-After; the jitter scales with the backoff delay
+    monkeypatch.setattr(http_poll.random, "uniform", lambda low, high: low)
+    assert run() == [3.0, 1.0]
+    monkeypatch.setattr(http_poll.random, "uniform", lambda low, high: high)
+    assert run() == [3.0 + 0.5 * 0.5, 1.0 + 0.5 * 1.0]
+
+
 def test_websocket_source():
     async def run():
         async def ws_handler(websocket):
@@ -108,6 +175,31 @@ def test_cli_pipe_feeds_orchestrator():
     assert asyncio.run(run()) == ["a", "b"]
 
 
+def test_cli_pipe_coalesces_when_enabled():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"a\nb.\nc\n")
+        reader.feed_eof()
+        calls: list[str] = []
+
+        async def fake(prompt: str, voice=None, **kwargs):
+            calls.append(prompt)
+            if False:
+                yield b""  # pragma: no cover - generator placeholder
+
+        orig = server.orchestrated_pcm_stream
+        server.orchestrated_pcm_stream = fake
+        try:
+            await server.init_source("cli_pipe", reader=reader, coalesce_idle_ms=1000)
+            await server.current_source_task
+        finally:
+            server.orchestrated_pcm_stream = orig
+            server.current_source_task = None
+        return calls
+
+    assert asyncio.run(run()) == ["a b.", "c"]
+
+
 def test_websocket_feeds_orchestrator():
     async def run():
         calls: list[str] = []
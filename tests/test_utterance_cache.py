@@ -0,0 +1,334 @@
+import asyncio
+
+import httpx
+
+import Morpheus_Client.server as server
+from Morpheus_Client.cache import (
+    DiskTier,
+    MemoryTier,
+    UtteranceCache,
+    compose_phrases,
+    utterance_key,
+)
+from Morpheus_Client.config import ConfigStore
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.tts_engine.adapter_registry import VoiceSchema, _AdapterSpec
+
+
+async def _collect(stream):
+    return b"".join([pcm async for pcm in stream])
+
+
+def test_key_normalizes_text_and_covers_params():
+    params = dict(voice="tara", adapter="llama_cpp", temperature=0.6, top_p=0.9, max_tokens=100)
+    assert utterance_key("Hello   there.\n", **params) == utterance_key("Hello there.", **params)
+    assert utterance_key("Hello", **params) != utterance_key("Hello", **{**params, "voice": "leo"})
+    assert utterance_key("Hello", **params) != utterance_key("Hello", **params, seed=1)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    tier = MemoryTier(max_bytes=8)
+    tier.put("a", b"1234")
+    tier.put("b", b"5678")
+    assert tier.get("a") == b"1234"  # refresh "a"
+    tier.put("c", b"90")
+    assert "b" not in tier and "a" in tier
+    assert tier.bytes <= 8
+    assert tier.stats()["evictions"] == 1
+
+
+def test_disk_tier_mmaps_entries_and_reloads_index(tmp_path):
+    tier = DiskTier(tmp_path, max_bytes=10)
+    tier.put("a", b"aaaa")
+    tier.put("b", b"bbbb")
+    with tier.open("a") as mapped:
+        assert mapped[:] == b"aaaa"
+    tier.put("c", b"cccc")  # over budget: "b" is the stalest
+    assert "b" not in tier
+    assert not (tmp_path / "b.pcm").exists()
+
+    reloaded = DiskTier(tmp_path, max_bytes=10)
+    assert "a" in reloaded and "c" in reloaded
+    assert reloaded.bytes == 8
+
+
+def test_disk_tier_persists_access_times_across_restarts(tmp_path, monkeypatch):
+    tier = DiskTier(tmp_path, max_bytes=10)
+    tier.put("a", b"aaaa")
+    tier.put("b", b"bbbb")
+    monkeypatch.setattr(tier, "INDEX_INTERVAL_S", 0.0)
+    tier.open("a").close()  # "a" is now the most recently used
+
+    reloaded = DiskTier(tmp_path, max_bytes=10)
+    reloaded.put("c", b"cccc")
+    assert "a" in reloaded and "b" not in reloaded
+
+
+def test_cache_reads_disk_off_the_event_loop(tmp_path, monkeypatch):
+    asyncio.run(UtteranceCache(memory_bytes=0, directory=tmp_path).store("k", b"\x00\x01" * 10))
+    cache = UtteranceCache(memory_bytes=0, directory=tmp_path)
+    on_loop = []
+    original = DiskTier.open
+
+    def open_(self, key):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return original(self, key)
+
+    monkeypatch.setattr(DiskTier, "open", open_)
+
+    async def run():
+        replay = await cache.lookup("k")
+        return await _collect(replay), await cache.get("k")
+
+    assert asyncio.run(run()) == (b"\x00\x01" * 10, b"\x00\x01" * 10)
+    assert on_loop == [False, False]
+
+
+def test_cache_replays_from_disk_after_restart(tmp_path):
+    cache = UtteranceCache(memory_bytes=0, directory=tmp_path)
+    pcm = bytes(range(256)) * 300
+    asyncio.run(cache.store("k", pcm))
+
+    fresh = UtteranceCache(memory_bytes=0, directory=tmp_path)
+    replay = asyncio.run(fresh.lookup("k", chunk_bytes=1000))
+    assert asyncio.run(_collect(replay)) == pcm
+    assert asyncio.run(fresh.lookup("missing")) is None
+    stats = fresh.stats()
+    assert (stats["hits"], stats["misses"], stats["disk"]["hits"]) == (1, 1, 1)
+
+
+def test_each_http_worker_gets_its_own_disk_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("ORPHEUS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("ORPHEUS_CACHE_DISK_MB", "4")
+    monkeypatch.setenv("ORPHEUS_HTTP_WORKERS", "2")
+    first = UtteranceCache.from_env()
+    second = UtteranceCache.from_env()  # another worker: the first directory is locked
+    third = UtteranceCache.from_env()
+
+    assert first.disk.directory == tmp_path / "worker-0"
+    assert second.disk.directory == tmp_path / "worker-1"
+    assert first.disk.max_bytes == second.disk.max_bytes == 2 * 1024 * 1024
+    assert third.disk is None
+    asyncio.run(first.store("k", b"pcm"))
+    assert "k" not in second and not (tmp_path / "index.json").exists()
+
+
+class CountingAdapter:
+    created = 0
+
+    def __init__(self, prompt, voice=None, **_):
+        type(self).created += 1
+        self.chunks = [b"\x01\x00" * 4, b"\x02\x00" * 4]
+
+    async def pull(self, _size):
+        if self.chunks:
+            return AudioChunk(pcm=self.chunks.pop(0), duration_ms=1.0)
+        return AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+
+    async def reset(self):
+        self.chunks = []
+
+
+def test_repeated_prompt_skips_synthesis(monkeypatch):
+    CountingAdapter.created = 0
+    spec = _AdapterSpec(CountingAdapter, lambda: {"name": "counting"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "counting", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="counting", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=1024))
+
+    first = asyncio.run(_collect(server.orchestrated_pcm_stream("Hi there.", None)))
+    second = asyncio.run(_collect(server.orchestrated_pcm_stream("Hi  there.", None)))
+    third = asyncio.run(_collect(server.orchestrated_pcm_stream("Hi there.", "leo")))
+    assert first == second == third == b"\x01\x00" * 4 + b"\x02\x00" * 4
+    assert CountingAdapter.created == 2  # the voice change is a miss
+
+    async def fetch():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/stats")
+
+    cache = asyncio.run(fetch()).json()["cache"]
+    assert (cache["hits"], cache["misses"], cache["stores"]) == (1, 2, 2)
+
+
+def test_interrupted_stream_is_not_cached(monkeypatch):
+    spec = _AdapterSpec(CountingAdapter, lambda: {"name": "counting"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "counting", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="counting", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=1024))
+
+    async def interrupt():
+        stream = server.orchestrated_pcm_stream("Stop me.", None)
+        async for _ in stream:
+            server.current_orchestrator.signal_barge_in()
+        await stream.aclose()
+
+    asyncio.run(interrupt())
+    assert server.utterance_cache.stats()["stores"] == 0
+
+
+def _chunks(pcm):
+    async def gen():
+        yield AudioChunk(pcm=pcm, duration_ms=1.0)
+        yield AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+
+    return gen()
+
+
+def test_phrases_serve_cached_and_synthesize_missing_ahead():
+    cache = UtteranceCache(memory_bytes=1024)
+    asyncio.run(cache.store("k0", b"\x00\x01"))
+    asyncio.run(cache.store("k2", b"\x00\x03"))
+    started = []
+
+    def synthesize(sentence):
+        started.append(sentence)
+        return _chunks(b"\x00\x02")
+
+    async def run():
+        composed = compose_phrases(
+            ["One.", "Two.", "Three."], ["k0", "k1", "k2"], cache, synthesize, sample_rate=1000
+        )
+        first = await composed.__anext__()
+        await asyncio.sleep(0)
+        ahead = list(started)  # missing sentence already in flight
+        rest = [chunk async for chunk in composed]
+        return [first, *rest], ahead
+
+    chunks, ahead = asyncio.run(run())
+    assert ahead == ["Two."]
+    assert started == ["Two."]
+    assert b"".join(c.pcm for c in chunks) == b"\x00\x01\x00\x02\x00\x03"
+    assert [c.markers for c in chunks if c.pcm] == [{"sentence": i} for i in range(3)]
+    assert chunks[-1].eos
+    assert asyncio.run(cache.get("k1")) == b"\x00\x02"
+
+
+def test_phrases_stop_when_live_sentence_is_interrupted():
+    cache = UtteranceCache(memory_bytes=1024)
+    asyncio.run(cache.store("k1", b"\x00\x01"))
+
+    async def barged(_sentence):
+        yield AudioChunk(pcm=b"\x00\x02", duration_ms=1.0)  # no EOS: barge-in
+
+    async def run():
+        composed = compose_phrases(["A.", "B."], ["k0", "k1"], cache, barged, sample_rate=1000)
+        return [chunk async for chunk in composed]
+
+    chunks = asyncio.run(run())
+    assert chunks == []  # buffered live audio is dropped, cached "B." never plays
+    assert asyncio.run(cache.get("k0")) is None
+
+
+def test_phrases_read_cached_sentences_when_emitted():
+    cache = UtteranceCache(memory_bytes=1024)
+    for key in ("k0", "k1", "k2"):
+        asyncio.run(cache.store(key, b"\x00\x01"))
+    read = []
+    get = cache.get
+
+    async def tracked(key):
+        read.append(key)
+        return await get(key)
+
+    cache.get = tracked
+
+    def synthesize(sentence):
+        return _chunks(b"\x00\x09")
+
+    async def run():
+        composed = compose_phrases(
+            ["A.", "B.", "C."], ["k0", "k1", "k2"], cache, synthesize, sample_rate=1000
+        )
+        await composed.__anext__()
+        first = list(read)
+        cache.memory.bytes -= len(cache.memory._entries.pop("k2"))  # evicted before it is reached
+        rest = [chunk async for chunk in composed]
+        await composed.aclose()
+        return first, rest
+
+    first, rest = asyncio.run(run())
+    assert first == ["k0"]
+    assert b"".join(c.pcm for c in rest) == b"\x00\x01\x00\x09"
+    assert [c.markers for c in rest if c.pcm] == [{"sentence": 1}, {"sentence": 2}]
+    assert asyncio.run(get("k2")) == b"\x00\x09"
+
+
+def test_prompt_sharing_sentences_only_synthesizes_the_changed_one(monkeypatch):
+    spawned = []
+
+    class SentenceAdapter(CountingAdapter):
+        def __init__(self, prompt, voice=None, **_):
+            super().__init__(prompt, voice)
+            spawned.append(prompt)
+
+    spec = _AdapterSpec(SentenceAdapter, lambda: {"name": "sentences"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "sentences", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="sentences", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=4096))
+    monkeypatch.setenv("ORPHEUS_CACHE_SENTENCES", "1")
+
+    greeting = "Hello and welcome to the service. "
+    closing = " Thank you for calling us today."
+    asyncio.run(_collect(server.orchestrated_pcm_stream(greeting + "Your balance is ten dollars." + closing, None)))
+    spawned.clear()
+    audio = asyncio.run(_collect(server.orchestrated_pcm_stream(greeting + "Your balance is five dollars." + closing, None)))
+    assert spawned == ["Your balance is five dollars."]
+    assert audio
+
+
+def test_phrase_lookahead_and_buffers_are_bounded():
+    started, emitted = [], []
+
+    def synthesize(sentence):
+        async def gen():
+            started.append((sentence, len(emitted)))
+            for _ in range(10):
+                yield AudioChunk(pcm=b"\x00\x01", duration_ms=1.0)
+            yield AudioChunk(pcm=b"", duration_ms=0.0, eos=True)
+
+        return gen()
+
+    async def run():
+        sentences = [f"S{i}." for i in range(6)]
+        composed = compose_phrases(
+            sentences, [f"k{i}" for i in range(6)], UtteranceCache(memory_bytes=0), synthesize,
+            sample_rate=1000, parallel=2, lookahead=2, queue_chunks=4,
+        )
+        async for chunk in composed:
+            if chunk.markers:
+                emitted.append(chunk.markers["sentence"])
+            await asyncio.sleep(0)
+
+    asyncio.run(run())
+    # Sentence i starts only once sentence i - 2 is being emitted
+    assert [s for s, _ in started] == [f"S{i}." for i in range(6)]
+    assert all(index - emitted_at <= 2 for index, (_, emitted_at) in enumerate(started))
+    assert started[-1][1] >= 3
+
+
+def test_prompts_split_only_when_a_sentence_is_cached(monkeypatch):
+    spawned = []
+
+    class SentenceAdapter(CountingAdapter):
+        def __init__(self, prompt, voice=None, **_):
+            super().__init__(prompt, voice)
+            spawned.append(prompt)
+
+    spec = _AdapterSpec(SentenceAdapter, lambda: {"name": "sentences"}, lambda schema: {})
+    monkeypatch.setitem(server.adapter_registry._registry, "sentences", spec)
+    monkeypatch.setattr(server, "config_store", ConfigStore(adapter="sentences", voice=VoiceSchema()))
+    monkeypatch.setattr(server, "utterance_cache", UtteranceCache(memory_bytes=4096))
+    monkeypatch.delenv("ORPHEUS_CACHE_SENTENCES", raising=False)
+
+    prompt = "Hello and welcome to the service. Your balance is ten dollars."
+    asyncio.run(_collect(server.orchestrated_pcm_stream(prompt, None)))
+    assert spawned == [prompt]  # nothing cached: one run keeps prosody
+    asyncio.run(_collect(server.orchestrated_pcm_stream("Hello and welcome to the service.", None)))
+    spawned.clear()
+    asyncio.run(_collect(server.orchestrated_pcm_stream(prompt, None)))
+    assert spawned == ["Your balance is ten dollars."]
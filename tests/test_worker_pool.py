@@ -0,0 +1,115 @@
+import asyncio
+import os
+
+import pytest
+
+from Morpheus_Client.orchestrator.adapter import AudioChunk
+from Morpheus_Client.workers import ProcessAdapter, ShmRing, WorkerError, WorkerPool
+
+
+class ToneAdapter:
+    """Deterministic adapter importable inside worker processes."""
+
+    def __init__(self, prompt, voice="tara", **_):
+        if prompt == "boom":
+            raise ValueError("bad prompt")
+        self.data = (prompt + voice).encode() * 500
+        self.pos = 0
+
+    async def pull(self, chunk_size):
+        if self.data.startswith(b"crash"):
+            os._exit(3)
+        pcm = self.data[self.pos : self.pos + chunk_size]
+        self.pos += len(pcm)
+        eos = self.pos >= len(self.data)
+        return AudioChunk(pcm=pcm, duration_ms=len(pcm) / 48.0, eos=eos)
+
+    async def reset(self):
+        self.pos = len(self.data)
+
+
+def test_ring_wraps_and_preserves_order():
+    ring = ShmRing.create(10)
+    try:
+        assert ring.write(b"abcdefgh") == 8
+        assert ring.read(5) == b"abcde"
+        assert ring.write(b"ijklmnop") == 7  # only 7 bytes free
+        assert ring.read(100) == b"fghijklmno"
+        assert ring.available == 0
+        ring.fail("boom")
+        assert ring.finished and ring.error == "boom"
+    finally:
+        ring.close()
+
+
+def test_ring_shared_between_handles():
+    ring = ShmRing.create(64)
+    peer = ShmRing.attach(ring.name)
+    try:
+        peer.write(b"pcm")
+        peer.finish()
+        assert ring.read(10) == b"pcm" and ring.finished
+        ring.cancel()
+        assert peer.cancelled and peer.finished  # separate flag words
+    finally:
+        peer.close()
+        ring.close()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = WorkerPool(2, adapter="test_worker_pool:ToneAdapter", ring_bytes=4096, chunk_bytes=1000)
+    yield pool.start()
+    pool.close()
+
+
+async def _collect(adapter, chunk_size=700):
+    out = []
+    while True:
+        chunk = await asyncio.wait_for(adapter.pull(chunk_size), 30)
+        out.append(chunk.pcm)
+        if chunk.eos:
+            return b"".join(out)
+
+
+def test_process_adapter_streams_from_workers(pool):
+    async def run():
+        adapters = [ProcessAdapter(p, voice="leo", pool=pool) for p in ("one", "two", "three")]
+        return await asyncio.gather(*(_collect(a) for a in adapters))
+
+    results = asyncio.run(run())
+    # Larger than the ring: the worker waited for the reader to catch up
+    assert results == [(p + "leo").encode() * 500 for p in ("one", "two", "three")]
+    assert pool.metrics["submitted"] >= 3 and pool.metrics["alive"] == 2
+
+
+def test_worker_errors_and_reset(pool):
+    async def run():
+        with pytest.raises(WorkerError, match="bad prompt"):
+            await _collect(ProcessAdapter("boom", pool=pool))
+
+        adapter = ProcessAdapter("cancel me", pool=pool)
+        first = await asyncio.wait_for(adapter.pull(100), 30)
+        assert first.pcm and not first.eos
+        await adapter.reset()
+        # The worker notices the cancellation and takes the next job
+        return await _collect(ProcessAdapter("after", pool=pool))
+
+    assert asyncio.run(run()) == b"aftertara" * 500
+
+
+def test_dead_worker_fails_the_job():
+    pool = WorkerPool(1, adapter="test_worker_pool:ToneAdapter", ring_bytes=4096).start()
+    try:
+
+        async def run():
+            adapter = ProcessAdapter("crash", pool=pool, liveness_interval=0.01)
+            with pytest.raises(WorkerError, match="exited with code 3"):
+                await asyncio.wait_for(adapter.pull(100), 30)
+            # Nobody is left to take a queued job either
+            with pytest.raises(WorkerError, match="no worker"):
+                await asyncio.wait_for(ProcessAdapter("next", pool=pool).pull(100), 30)
+
+        asyncio.run(run())
+    finally:
+        pool.close()
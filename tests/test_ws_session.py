@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+from starlette.testclient import TestClient
+
+import Morpheus_Client.server as server
+from Morpheus_Client.orchestrator.admission import AdmissionController
+
+
+def _receive_until(ws, kind):
+    """Collect frames until a JSON event of ``kind`` arrives."""
+
+    frames = []
+    while True:
+        message = ws.receive()
+        if message.get("text") is not None:
+            event = json.loads(message["text"])
+            frames.append(event)
+            if event["type"] == kind:
+                return frames
+        else:
+            frames.append(message["bytes"])
+
+
+def test_session_streams_audio_per_sentence(monkeypatch):
+    calls = []
+
+    async def fake(prompt, voice=None, **kwargs):
+        calls.append((prompt, voice))
+        yield prompt.encode()
+
+    monkeypatch.setattr(server, "orchestrated_pcm_stream", fake)
+    with TestClient(server.app) as client:
+        with client.websocket_connect("/ws/tts?voice=tara") as ws:
+            assert ws.receive_bytes() == server.riff_header(server.SAMPLE_RATE)
+            ws.send_text(json.dumps({"type": "text", "text": "Hello there. How"}))
+            frames = _receive_until(ws, "done")
+            assert frames == [
+                {"type": "sentence", "index": 0, "text": "Hello there."},
+                b"Hello there.",
+                {"type": "done", "index": 0},
+            ]
+            ws.send_text(json.dumps({"type": "voice", "voice": "leo"}))
+            ws.send_text(" are you")  # plain text frames are deltas too
+            ws.send_text(json.dumps({"type": "end"}))
+            frames = _receive_until(ws, "end")
+            assert b"How are you" in frames
+    assert calls == [("Hello there.", "tara"), ("How are you", "leo")]
+
+
+def test_session_barge_in_stops_current_sentence(monkeypatch):
+    started = []
+
+    async def slow(prompt, voice=None, **kwargs):
+        started.append(prompt)
+        yield b"first"
+        await asyncio.sleep(10)
+        yield b"never"
+
+    monkeypatch.setattr(server, "orchestrated_pcm_stream", slow)
+    with TestClient(server.app) as client:
+        with client.websocket_connect("/ws/tts") as ws:
+            ws.receive_bytes()
+            ws.send_text(json.dumps({"type": "text", "text": "One. Two. "}))
+            assert ws.receive_json() == {"type": "sentence", "index": 0, "text": "One."}
+            assert ws.receive_bytes() == b"first"
+            ws.send_text(json.dumps({"type": "barge_in"}))
+            assert ws.receive_json() == {"type": "barge_in"}
+            ws.send_text(json.dumps({"type": "end"}))
+            assert _receive_until(ws, "end") == [{"type": "end"}]
+    assert started == ["One."]
+
+
+def test_session_answers_binary_frames_with_error(monkeypatch):
+    async def fake(prompt, voice=None, **kwargs):
+        yield prompt.encode()
+
+    monkeypatch.setattr(server, "orchestrated_pcm_stream", fake)
+    with TestClient(server.app) as client:
+        with client.websocket_connect("/ws/tts") as ws:
+            ws.receive_bytes()
+            ws.send_bytes(b"\x00\x01")
+            assert ws.receive_json()["type"] == "error"
+            ws.send_text(json.dumps({"type": "text", "text": "Still here. And"}))
+            assert b"Still here." in _receive_until(ws, "done")
+            ws.send_text(json.dumps({"type": "end"}))
+            _receive_until(ws, "end")
+
+
+def test_session_closes_with_error_when_synthesis_fails(monkeypatch):
+    async def broken(prompt, voice=None, **kwargs):
+        yield b"partial"
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(server, "orchestrated_pcm_stream", broken)
+    with TestClient(server.app) as client:
+        with client.websocket_connect("/ws/tts") as ws:
+            ws.receive_bytes()
+            # No further client frames: the failure alone must end the session
+            ws.send_text(json.dumps({"type": "text", "text": "One. "}))
+            frames = _receive_until(ws, "error")
+            assert frames[-1]["detail"] == "synthesis failed: model crashed"
+            assert ws.receive() == {"type": "websocket.close", "code": 1011, "reason": ""}
+
+
+def test_session_sentences_go_through_admission(monkeypatch):
+    calls = []
+
+    async def fake(prompt, voice=None, **kwargs):
+        calls.append(prompt)
+        yield prompt.encode()
+
+    controller = AdmissionController(1, slack_s=0.5, max_queue_s=0.0)
+    controller.observe(audio_s=1.0, busy_s=1.0, chars=15)
+    monkeypatch.setattr(server, "admission", controller)
+    monkeypatch.setattr(server, "orchestrated_pcm_stream", fake)
+    busy = asyncio.run(controller.admit("x" * 150))  # ten seconds of work
+    with TestClient(server.app) as client:
+        with client.websocket_connect("/ws/tts") as ws:
+            ws.receive_bytes()
+            ws.send_text(json.dumps({"type": "text", "text": "Hi. " + "y" * 150 + ". "}))
+            assert _receive_until(ws, "done")[-1] == {"type": "done", "index": 0}
+            assert ws.receive_json()["type"] == "overloaded"
+            assert ws.receive() == {"type": "websocket.close", "code": 1013, "reason": ""}
+    busy.release()
+    assert calls == ["Hi."]
+    assert controller.metrics["active"] == 0 and controller.metrics["rejected"] == 1
@@ -1,28 +1,215 @@
-"""Text source adapter that polls an HTTP endpoint."""
+"""Text source adapter that polls an HTTP endpoint.
+
+Polling is made cheap for both sides:
+
+* conditional requests reuse the ``ETag``/``Last-Modified`` validators of
+  the previous response so unchanged feeds answer ``304`` with no body;
+* optional long-polling asks the server to hold idle requests open
+  (``Prefer: wait=<seconds>``, RFC 7240) instead of answering immediately;
+* idle or failed polls back off exponentially with jitter and reset as soon
+  as new text arrives;
+* bodies identical to recently yielded ones are dropped;
+* a single pooled keep-alive connection is reused for every request.
+
+``404``/``410`` responses end the stream; after a ``429``/``503`` the next
+poll waits at least the ``Retry-After`` the server asked for, with the
+jitter added on top.  Counters in :attr:`metrics`
+report how much of the polling traffic carried useful text.
+"""
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
 from typing import AsyncGenerator, Dict, Any
 
 import httpx
 
 from . import TextSource
 
+_END_OF_FEED = {404, 410}
+_RETRY_LATER = {429, 503}
+
 
 class HTTPPollingSource(TextSource):
-    """Retrieve text by repeatedly GETting an HTTP endpoint."""
+    """Retrieve text by repeatedly GETting an HTTP endpoint.
+
+    Parameters
+    ----------
+    url:
+        Endpoint returning the next text message as the response body.
+    client:
+        Optional preconfigured client.  When omitted the source owns a
+        client limited to one keep-alive connection and closes it when the
+        stream ends.
+    min_interval, max_interval:
+        Bounds in seconds for the idle backoff delay.
+    backoff:
+        Multiplier applied to the delay after each idle or failed poll.
+    long_poll:
+        Seconds the server may hold an idle request open.  ``None``
+        disables long-polling.
+    max_idle_polls:
+        Stop after this many consecutive idle polls.  ``None`` polls until
+        the server signals end of feed or the consumer stops.
+    dedup_window:
+        Number of recent body digests remembered for duplicate detection.
+    """
 
-    def __init__(self, url: str, client: httpx.AsyncClient | None = None) -> None:
+    def __init__(
+        self,
+        url: str,
+        client: httpx.AsyncClient | None = None,
+        *,
+        min_interval: float = 0.5,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        long_poll: float | None = None,
+        max_idle_polls: int | None = None,
+        dedup_window: int = 32,
+    ) -> None:
         self.url = url
-        self._client = client or httpx.AsyncClient()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.long_poll = long_poll
+        self.max_idle_polls = max_idle_polls
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+            timeout=httpx.Timeout(10.0 + (long_poll or 0.0)),
+        )
+        self._validators: Dict[str, str] = {}
+        self._recent: deque[bytes] = deque(maxlen=dedup_window)
+        self._counters: Dict[str, int] = {
+            "requests": 0,
+            "useful_requests": 0,
+            "not_modified": 0,
+            "duplicates": 0,
+            "errors": 0,
+            "bytes_received": 0,
+            "useful_bytes": 0,
+        }
+
+    @property
+    def efficiency(self) -> float:
+        """Useful body bytes delivered per HTTP request issued."""
+
+        requests = self._counters["requests"]
+        return self._counters["useful_bytes"] / requests if requests else 0.0
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """Polling counters plus the derived :attr:`efficiency`."""
+
+        return {**self._counters, "efficiency": self.efficiency}
+
+    def _headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if "etag" in self._validators:
+            headers["If-None-Match"] = self._validators["etag"]
+        if "last-modified" in self._validators:
+            headers["If-Modified-Since"] = self._validators["last-modified"]
+        if self.long_poll:
+            headers["Prefer"] = f"wait={int(self.long_poll)}"
+        return headers
+
+    def _is_duplicate(self, text: str) -> bool:
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        if digest in self._recent:
+            return True
+        self._recent.append(digest)
+        return False
+
+    async def _poll(self, client: httpx.AsyncClient) -> str | None:
+        """Issue one request; return new text, ``""`` when idle, ``None`` at end."""
+
+        self._counters["requests"] += 1
+        resp = await client.get(self.url, headers=self._headers())
+        self._counters["bytes_received"] += len(resp.content)
+        if resp.status_code in _END_OF_FEED:
+            return None
+        if resp.status_code == 304:
+            self._counters["not_modified"] += 1
+            return ""
+        if resp.status_code in _RETRY_LATER:
+            raise _RetryLater(_retry_after(resp))
+        resp.raise_for_status()
+        for header in ("etag", "last-modified"):
+            if header in resp.headers:
+                self._validators[header] = resp.headers[header]
+        text = resp.text.strip()
+        if not text:
+            return ""
+        if self._is_duplicate(text):
+            self._counters["duplicates"] += 1
+            return ""
+        self._counters["useful_requests"] += 1
+        self._counters["useful_bytes"] += len(resp.content)
+        return text
 
     async def stream(self) -> AsyncGenerator[str, None]:
-        async with self._client as client:
+        delay = self.min_interval
+        idle_polls = 0
+        try:
             while True:
-                resp = await client.get(self.url)
-                text = resp.text.strip()
-                if not text:
+                started = time.monotonic()
+                retry_after = 0.0
+                try:
+                    text = await self._poll(self._client)
+                except _RetryLater as exc:
+                    self._counters["errors"] += 1
+                    text, retry_after = "", exc.delay
+                except httpx.HTTPError:
+                    self._counters["errors"] += 1
+                    text = ""
+                if text is None:
                     break
-                yield text
+                if text:
+                    idle_polls = 0
+                    delay = self.min_interval
+                    yield text
+                    continue
+                idle_polls += 1
+                if self.max_idle_polls is not None and idle_polls >= self.max_idle_polls:
+                    break
+                held = time.monotonic() - started
+                if self.long_poll and held >= self.long_poll / 2:
+                    # The server honoured the long-poll; re-poll right away.
+                    continue
+                if retry_after > 0:
+                    # The server's Retry-After is a floor; jitter goes on top
+                    await asyncio.sleep(retry_after + delay * random.uniform(0.0, 0.5))
+                else:
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(self.max_interval, delay * self.backoff)
+        finally:
+            if self._owns_client:
+                await self._client.aclose()
+
+
+class _RetryLater(Exception):
+    def __init__(self, delay: float) -> None:
+        super().__init__(delay)
+        self.delay = delay
+
+
+def _retry_after(resp: httpx.Response) -> float:
+    """Seconds to wait from ``Retry-After`` (delta-seconds or HTTP date)."""
+
+    value = resp.headers.get("retry-after", "").strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return max(0.0, when.timestamp() - time.time())
 
 
 def describe() -> Dict[str, Any]:
@@ -32,4 +219,5 @@ def describe() -> Dict[str, Any]:
         "unit": "msgs",
         "granularity": ["line"],
         "stateful_context": "none",
+        "features": ["conditional", "long_poll", "backoff", "dedup"],
     }
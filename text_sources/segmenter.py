@@ -0,0 +1,237 @@
+"""Incremental sentence segmentation for streamed text.
+
+:class:`SentenceSegmenter` accepts text deltas as an LLM streams them and
+returns sentences as soon as they are closed.  A sentence is closed by
+terminal punctuation (optionally followed by closing quotes or brackets)
+and then whitespace, or by a blank line.  Abbreviations (``Dr.``, ``e.g.``),
+initials (``J. K.``), decimals (``3.14``) and ellipses do not close a
+sentence.
+
+Each delta is scanned once with a compiled pattern that only stops at
+candidate boundaries, and pending text is kept as a list of pieces joined
+only when a sentence is emitted, so total work is linear in the input
+length regardless of delta size.  Deltas without whitespace cannot close
+a sentence and are only appended; the next scan resumes where a boundary
+can still start.  Text without any boundary is cut at a word break after
+``max_chars`` (:data:`MAX_CHARS` by default), which bounds the buffer.
+"""
+from __future__ import annotations
+
+import re
+from typing import AsyncIterable, AsyncIterator, FrozenSet, Iterable, Iterator, List
+
+ABBREVIATIONS: FrozenSet[str] = frozenset(
+    {
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "ft", "vs",
+        "no", "vol", "fig", "approx", "dept", "inc", "ltd", "co", "corp",
+        "gen", "col", "lt", "sgt", "capt", "rev", "hon", "jan", "feb", "mar",
+        "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+    }
+)
+
+# Terminal punctuation (plus closers) followed by whitespace, or a blank line
+_CANDIDATE = re.compile(r"[.!?][\"')\]}»”’]*(?=\s)|\n[^\S\n]*\n")
+_MAX_WORD = 64
+_SPACE = re.compile(r"\s")
+# Default cap on text pending without a sentence boundary
+MAX_CHARS = 2000
+_DOTTED = re.compile(r"(?:[^\W\d_]\.)+[^\W\d_]")
+_CLOSERS = "\"')]}»”’"
+_OPENERS = "\"'([{«“‘"
+
+
+class SentenceSegmenter:
+    """Split streamed text into sentences as soon as they are complete.
+
+    Parameters
+    ----------
+    abbreviations:
+        Lower-case words that never end a sentence when followed by ``.``.
+    min_chars:
+        Sentences shorter than this are held back and prefixed to the next
+        one, mirroring the short-segment merging of
+        :func:`Morpheus_Client.tts_engine.inference.split_text_into_sentences`.
+    max_chars:
+        Text without a boundary is emitted at the last word break once more
+        than ``max_chars`` are pending, which bounds the buffer for
+        unpunctuated input; ``0`` disables the cap.
+    """
+
+    def __init__(
+        self,
+        *,
+        abbreviations: FrozenSet[str] = ABBREVIATIONS,
+        min_chars: int = 0,
+        max_chars: int = MAX_CHARS,
+    ) -> None:
+        self.abbreviations = abbreviations
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._pieces: List[str] = []
+        self._pending = 0
+        # Unsplit last word, kept as parts while it grows without whitespace
+        self._tail: List[str] = []
+        self._tail_len = 0
+        self._scan_from = 0
+        self._held = ""
+
+    @property
+    def pending_chars(self) -> int:
+        """Number of buffered characters not yet emitted."""
+
+        return self._pending + self._tail_len + len(self._held)
+
+    def _closes(self, word: str) -> bool:
+        core = word.rstrip(_CLOSERS)
+        if not core:
+            return False
+        last = core[-1]
+        if last in "!?":
+            return True
+        if last != "." or core.endswith(".."):
+            return False
+        stem = core[:-1].lstrip(_OPENERS)
+        if len(stem) == 1 and stem.isupper():
+            return False  # initial such as "J."
+        stem = stem.lower()
+        if not stem or stem in self.abbreviations:
+            return False
+        return _DOTTED.fullmatch(stem) is None
+
+    def _emit(self, sentence: str, out: List[str]) -> None:
+        sentence = sentence.strip()
+        if not sentence:
+            return
+        if self._held:
+            sentence = f"{self._held} {sentence}"
+            self._held = ""
+        if len(sentence) < self.min_chars:
+            self._held = sentence
+            return
+        out.append(sentence)
+
+    def feed(self, delta: str) -> List[str]:
+        """Consume ``delta`` and return any sentences it completed."""
+
+        out: List[str] = []
+        if not delta:
+            return out
+        if _SPACE.search(delta) is None:
+            return self._extend_word(delta, out)
+        buf = "".join(self._tail) + delta
+        seg_start = 0
+        for match in _CANDIDATE.finditer(buf, self._scan_from):
+            if match.group().startswith("\n"):
+                end = match.start()
+            else:
+                end = match.end()
+                if end <= seg_start or not self._closes(buf[_word_start(buf, end) : end]):
+                    continue
+            self._pieces.append(buf[seg_start:end])
+            self._emit("".join(self._pieces), out)
+            self._pieces = []
+            self._pending = 0
+            seg_start = max(end, match.end())
+        remaining = buf[seg_start:]
+        # Keep the last word (plus trailing whitespace) unsplit so a boundary
+        # straddling two deltas is seen whole on the next call.
+        cut = _word_start(remaining, len(remaining.rstrip()))
+        if cut:
+            self._pieces.append(remaining[:cut])
+            self._pending += cut
+        tail = remaining[cut:]
+        self._tail = [tail] if tail else []
+        self._tail_len = len(tail)
+        self._scan_from = 0
+        return self._cap(out)
+
+    def _extend_word(self, delta: str, out: List[str]) -> List[str]:
+        # Without whitespace nothing can close; a boundary can only start
+        # at the trailing run of terminal punctuation and closers.
+        stripped = delta.rstrip(".!?" + _CLOSERS)
+        if stripped:
+            self._scan_from = self._tail_len + len(stripped)
+        self._tail.append(delta)
+        self._tail_len += len(delta)
+        if self.max_chars and self._tail_len > self.max_chars:
+            self._pieces.append("".join(self._tail))  # a "word" this long is cut anyway
+            self._pending += self._tail_len
+            self._tail = []
+            self._tail_len = 0
+            self._scan_from = 0
+        return self._cap(out)
+
+    def _cap(self, out: List[str]) -> List[str]:
+        if self.max_chars and self._pending > self.max_chars:
+            self._emit("".join(self._pieces), out)
+            self._pieces = []
+            self._pending = 0
+        return out
+
+    def flush(self) -> List[str]:
+        """Return whatever text remains, closed or not, and reset."""
+
+        out: List[str] = []
+        self._pieces.extend(self._tail)
+        self._emit("".join(self._pieces), out)
+        if self._held:
+            out.append(self._held)
+            self._held = ""
+        self._pieces = []
+        self._pending = 0
+        self._tail = []
+        self._tail_len = 0
+        self._scan_from = 0
+        return out
+
+
+def _word_start(text: str, end: int) -> int:
+    """Return where the whitespace-delimited word ending at ``end`` starts.
+
+    The backwards search is capped at ``_MAX_WORD`` characters so each call
+    is constant time; longer "words" are truncated, which only affects the
+    abbreviation check.
+    """
+
+    lo = max(0, end - _MAX_WORD)
+    return max(
+        text.rfind(" ", lo, end), text.rfind("\n", lo, end), text.rfind("\t", lo, end), lo - 1
+    ) + 1
+
+
+def iter_sentences(deltas: Iterable[str], **options) -> Iterator[str]:
+    """Yield sentences from an iterable of text deltas."""
+
+    segmenter = SentenceSegmenter(**options)
+    for delta in deltas:
+        yield from segmenter.feed(delta)
+    yield from segmenter.flush()
+
+
+async def aiter_sentences(
+    deltas: AsyncIterable[str], **options
+) -> AsyncIterator[str]:
+    """Yield sentences from an asynchronous stream of text deltas."""
+
+    segmenter = SentenceSegmenter(**options)
+    async for delta in deltas:
+        for sentence in segmenter.feed(delta):
+            yield sentence
+    for sentence in segmenter.flush():
+        yield sentence
+
+
+def split_sentences(text: str, **options) -> List[str]:
+    """Split a complete ``text`` into sentences."""
+
+    return list(iter_sentences([text], **options))
+
+
+__all__ = [
+    "ABBREVIATIONS",
+    "MAX_CHARS",
+    "SentenceSegmenter",
+    "aiter_sentences",
+    "iter_sentences",
+    "split_sentences",
+]